@@ -0,0 +1,152 @@
+# PacMath - Perguntas adaptativas
+# Autor: Luiz - Mais perguntas das contas que cada jogador erra ou demora para responder
+"""
+Escolha adaptativa das contas (a, b) de cada pergunta.
+
+Cada jogador tem, para cada conta, uma média móvel da taxa de erro e do tempo
+de resposta na primeira tentativa. O peso da conta cresce com os dois, e a
+conta da próxima pergunta é sorteada proporcionalmente ao peso.
+
+Os pesos ficam em uma árvore de Fenwick: mudar o peso de uma conta e sortear
+uma conta custam O(log n), mesmo com tabuadas muito maiores que 9 × 9. As
+médias são gravadas em JSON e continuam de uma sessão para a outra.
+
+Uso: regras.JogoPacMath(seletor=SeletorAdaptativo("pacmath_pesos.json")).
+"""
+
+import json
+import os
+
+TAXA_ERRO_INICIAL = 0.5      # taxa de erro assumida para contas nunca respondidas
+TEMPO_REFERENCIA_MS = 5000   # tempo de resposta considerado normal
+PESO_MINIMO = 0.05           # contas já dominadas ainda aparecem de vez em quando
+PESO_TEMPO = 0.5             # importância do tempo de resposta em relação aos erros
+TEMPO_MAXIMO_RELATIVO = 3.0  # respostas muito demoradas não pesam mais que 3× a referência
+
+
+class ArvoreFenwick:
+    """Somas de prefixo de pesos, com atualização e busca em O(log n)"""
+
+    def __init__(self, pesos):
+        self.n = len(pesos)
+        self.pesos = list(pesos)
+        self.arvore = [0.0] * (self.n + 1)  # índices a partir de 1
+        for i, peso in enumerate(self.pesos, 1):
+            self.arvore[i] += peso
+            pai = i + (i & -i)
+            if pai <= self.n:
+                self.arvore[pai] += self.arvore[i]
+        self.maior_passo = 1 << (self.n.bit_length() - 1) if self.n else 0
+
+    def definir(self, indice, peso):
+        """Troca o peso do índice (a partir de 0)"""
+        delta = peso - self.pesos[indice]
+        self.pesos[indice] = peso
+        i = indice + 1
+        while i <= self.n:
+            self.arvore[i] += delta
+            i += i & -i
+
+    def total(self):
+        """Soma de todos os pesos"""
+        soma = 0.0
+        i = self.n
+        while i > 0:
+            soma += self.arvore[i]
+            i -= i & -i
+        return soma
+
+    def buscar(self, alvo):
+        """Primeiro índice cuja soma de prefixo passa de alvo (0 <= alvo < total)"""
+        posicao = 0
+        passo = self.maior_passo
+        while passo:
+            if posicao + passo <= self.n and self.arvore[posicao + passo] <= alvo:
+                posicao += passo
+                alvo -= self.arvore[posicao]
+            passo >>= 1
+        return min(posicao, self.n - 1)  # arredondamentos não saem do fim da árvore
+
+
+class SeletorAdaptativo:
+    """Sorteia as contas de cada jogador pelo peso dos erros e do tempo de resposta"""
+
+    def __init__(self, caminho=None, alfa=0.3):
+        self.caminho = caminho  # arquivo JSON com as médias (None não grava)
+        self.alfa = alfa        # peso da resposta mais recente nas médias móveis
+        self.medias = {}        # jogador -> {(a, b): [taxa de erro, tempo em ms]}
+        self.arvores = {}       # (jogador, fatores) -> (contas, índice de cada conta, ArvoreFenwick)
+        if caminho:
+            self.carregar()
+
+    def peso(self, media):
+        """Peso de uma conta a partir de [taxa de erro, tempo em ms]"""
+        taxa_erro, tempo_ms = media
+        return PESO_MINIMO + taxa_erro + PESO_TEMPO * min(tempo_ms / TEMPO_REFERENCIA_MS, TEMPO_MAXIMO_RELATIVO)
+
+    def _media(self, jogador, conta):
+        """Médias do jogador para a conta, ou os valores iniciais"""
+        return self.medias.get(jogador, {}).get(conta, [TAXA_ERRO_INICIAL, TEMPO_REFERENCIA_MS])
+
+    def _arvore(self, jogador, fatores):
+        """Árvore de pesos das contas possíveis com os fatores (montada na primeira vez)"""
+        chave = (jogador, tuple(fatores))
+        entrada = self.arvores.get(chave)
+        if entrada is None:
+            contas = [(a, b) for a in fatores for b in fatores]
+            indices = {conta: i for i, conta in enumerate(contas)}
+            arvore = ArvoreFenwick([self.peso(self._media(jogador, conta)) for conta in contas])
+            entrada = self.arvores[chave] = (contas, indices, arvore)
+        return entrada
+
+    def sortear(self, jogador, fatores, rng):
+        """Sorteia a conta (a, b) da próxima pergunta usando um único rng.random()"""
+        contas, _, arvore = self._arvore(jogador, fatores)
+        return contas[arvore.buscar(rng.random() * arvore.total())]
+
+    def registrar(self, jogador, numero_a, numero_b, correta, latencia_ms):
+        """Atualiza as médias da conta com uma resposta na primeira tentativa"""
+        conta = (numero_a, numero_b)
+        media = self.medias.setdefault(jogador, {}).setdefault(conta, list(self._media(jogador, conta)))
+        media[0] += self.alfa * ((0.0 if correta else 1.0) - media[0])
+        media[1] += self.alfa * (latencia_ms - media[1])
+        peso = self.peso(media)
+        for (dono, _), (_, indices, arvore) in self.arvores.items():
+            if dono == jogador and conta in indices:
+                arvore.definir(indices[conta], peso)
+
+    def carregar(self):
+        """Lê as médias gravadas; um arquivo ausente ou inválido começa do zero"""
+        try:
+            with open(self.caminho, encoding="utf-8") as arquivo:
+                dados = json.load(arquivo)
+            self.medias = {
+                jogador: {tuple(int(n) for n in conta.split("x")): list(media) for conta, media in contas.items()}
+                for jogador, contas in dados.items()
+            }
+        except (OSError, ValueError, AttributeError):
+            self.medias = {}
+        self.arvores = {}
+
+    def salvar(self):
+        """Grava as médias no arquivo (contas como "7x8")"""
+        if not self.caminho:
+            return
+        dados = {jogador: {f"{a}x{b}": media for (a, b), media in contas.items()}
+                 for jogador, contas in self.medias.items()}
+        temporario = self.caminho + ".tmp"
+        with open(temporario, "w", encoding="utf-8") as arquivo:
+            json.dump(dados, arquivo, ensure_ascii=False, indent=1)
+        os.replace(temporario, self.caminho)
+
+
+class SeletorGravado:
+    """Devolve as contas gravadas em ordem (reprodução de partidas adaptativas)"""
+
+    def __init__(self, contas):
+        self.contas = iter(contas)
+
+    def sortear(self, jogador, fatores, rng):
+        """Consome o mesmo rng.random() que o SeletorAdaptativo e devolve a próxima conta"""
+        rng.random()
+        return next(self.contas, (fatores[0], fatores[0]))
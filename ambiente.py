@@ -0,0 +1,32 @@
+# PacMath - Ambiente das execuções automáticas
+# Autor: Luiz - Variáveis de ambiente do benchmark, dos robôs e da reprodução
+"""
+Prepara as variáveis de ambiente para rodar o pacmathv3 sem uma criança na
+frente: sem janela (driver dummy do SDL, opcional) e sem gravações, histórico
+dos alunos ou latências medidas. Precisa ser chamado antes de importar o
+pygame e o pacmathv3, que leem essas variáveis na importação ou ao iniciar.
+"""
+
+import os
+
+# Registros do quiosque que as execuções automáticas não devem alimentar
+REGISTROS = ("PACMATH_GRAVACOES", "PACMATH_HISTORICO", "PACMATH_LATENCIA")
+
+
+def preparar_execucao_automatica(sem_tela=True, escala_tempo=None, forcar=False):
+    """Desliga os registros do quiosque e, com sem_tela, escolhe o driver dummy do SDL
+
+    escala_tempo: valor de PACMATH_ESCALA_TEMPO (None mantém o atual).
+    forcar: desliga os registros mesmo que já estejam configurados (por padrão
+        quem chama pode ligá-los pelo ambiente, para medir algo de propósito).
+    """
+    if sem_tela:
+        os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+        os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    for variavel in REGISTROS:
+        if forcar:
+            os.environ[variavel] = "0"
+        else:
+            os.environ.setdefault(variavel, "0")
+    if escala_tempo is not None:
+        os.environ["PACMATH_ESCALA_TEMPO"] = str(escala_tempo)
@@ -0,0 +1,111 @@
+# PacMath - Agendador de animações
+# Autor: Luiz - Animações por tempo, avançadas pelo loop principal
+"""
+Animações sem bloquear o loop do jogo.
+
+Cada Tarefa tem uma duração em milissegundos e recebe o progresso (0 a 1)
+a cada quadro. O Agendador avança as tarefas com o tempo passado pelo loop
+principal, em filas que rodam uma tarefa após a outra. Como nada aqui chama
+pygame.time.delay, os eventos continuam sendo processados durante a animação.
+
+O PassoFixo separa o tempo de jogo do desenho: o tempo real de cada quadro,
+multiplicado pela escala de tempo, vira um número inteiro de passos fixos da
+simulação. Com escala 100 uma partida inteira passa em segundos; os estados
+intermediários de um quadro simplesmente não são desenhados.
+"""
+
+from collections import deque
+
+
+class Tarefa:
+    """Animação com duração fixa, avançada pelo tempo do jogo"""
+
+    def __init__(self, duracao, ao_atualizar=None, ao_iniciar=None, ao_terminar=None):
+        self.duracao = duracao          # duração em milissegundos
+        self.ao_atualizar = ao_atualizar  # chamada com o progresso de 0 a 1
+        self.ao_iniciar = ao_iniciar    # chamada no primeiro avanço
+        self.ao_terminar = ao_terminar  # chamada quando o progresso chega a 1
+        self.decorrido = 0.0            # tempo já avançado
+        self.iniciada = False
+        self.terminada = False
+
+    def avancar(self, dt):
+        """Avança a tarefa em dt milissegundos e retorna o tempo que sobrou"""
+        if not self.iniciada:
+            self.iniciada = True
+            if self.ao_iniciar:
+                self.ao_iniciar()
+
+        self.decorrido += dt
+        progresso = 1.0 if self.duracao <= 0 else min(1.0, self.decorrido / self.duracao)
+        if self.ao_atualizar:
+            self.ao_atualizar(progresso)
+
+        if progresso < 1.0:
+            return 0.0
+        self.terminada = True
+        if self.ao_terminar:
+            self.ao_terminar()
+        return max(0.0, self.decorrido - self.duracao)
+
+
+class Agendador:
+    """Avança filas de tarefas com o tempo de jogo do loop principal"""
+
+    def __init__(self):
+        self.filas = []  # cada fila roda suas tarefas em sequência
+
+    def agendar(self, *tarefas):
+        """Agenda tarefas para rodar uma após a outra, em paralelo às outras filas"""
+        self.filas.append(deque(tarefas))
+
+    def ativo(self):
+        """Indica se ainda há alguma animação em andamento"""
+        return bool(self.filas)
+
+    def limpar(self):
+        """Cancela todas as animações sem chamar ao_terminar"""
+        for fila in self.filas:
+            fila.clear()
+        self.filas = []
+
+    def atualizar(self, dt):
+        """Avança todas as filas em dt milissegundos de tempo de jogo (a escala fica no PassoFixo)"""
+        # Tarefas agendadas durante a atualização começam no próximo quadro
+        for fila in list(self.filas):
+            restante = dt
+            while fila:
+                tarefa = fila[0]
+                restante = tarefa.avancar(restante)
+                if not tarefa.terminada:
+                    break
+                if fila:  # a fila pode ter sido cancelada em ao_terminar
+                    fila.popleft()
+        self.filas = [fila for fila in self.filas if fila]
+
+
+class PassoFixo:
+    """Converte o tempo real de cada quadro em passos de simulação de duração fixa"""
+
+    def __init__(self, passo_ms=5, escala_tempo=1.0, max_passos=2000):
+        self.passo_ms = passo_ms          # duração de cada passo em tempo de jogo
+        self.escala_tempo = escala_tempo  # 100.0 roda cem vezes mais rápido que o tempo real
+        self.max_passos = max_passos      # limite por quadro (uma travada longa não vira avanço rápido)
+        self.acumulado = 0.0              # tempo de jogo ainda não simulado
+        self.tempo_ms = 0.0               # tempo de jogo desde o início
+
+    def avancar(self, dt):
+        """Soma dt milissegundos de tempo real e retorna quantos passos simular agora"""
+        self.acumulado += dt * self.escala_tempo
+        passos = int(self.acumulado // self.passo_ms)
+        if passos > self.max_passos:
+            passos = self.max_passos
+            self.acumulado = 0.0  # descarta o atraso em vez de tentar alcançá-lo
+        else:
+            self.acumulado -= passos * self.passo_ms
+        self.tempo_ms += passos * self.passo_ms
+        return passos
+
+    def esperar(self, dt):
+        """Soma dt milissegundos de tempo real sem simular (o jogo estava parado)"""
+        self.tempo_ms += dt * self.escala_tempo
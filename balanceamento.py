@@ -0,0 +1,171 @@
+# PacMath - Análise de balanceamento
+# Autor: Luiz - Simulação Monte Carlo dos níveis de dificuldade
+"""
+Simula muitas partidas de cada nível de NIVEIS_DIFICULDADE e mostra:
+    - a taxa de vitória de cada jogador (e a diferença entre eles);
+    - a distribuição do tamanho das partidas, em respostas;
+    - quantas partidas terminam pelos acertos consecutivos e quantas pela
+      borda do tabuleiro.
+
+Cada jogador é um robos.JogadorRobo: acerta cada tentativa com a precisão
+indicada, ou com a taxa de erro própria das contas de --erros. As partidas são
+divididas em blocos com sementes próprias e distribuídas entre processos, de
+modo que o resultado é o mesmo com qualquer número de processos.
+
+Execução:
+    python balanceamento.py --partidas 1000000 --precisao 0.8 0.7
+    python balanceamento.py --niveis 3 4 --passos 6 --saida balanceamento.json
+    python balanceamento.py --niveis 4 --erros 7x8=0.6 6x9=0.5
+"""
+
+import argparse
+import json
+import os
+import random
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+from regras import ACERTOS_PARA_VENCER, JOGADORES, LARGURA_TABULEIRO, NIVEIS_DIFICULDADE, JogoPacMath
+from robos import JogadorRobo, jogar_sem_tela, ler_erros
+
+PARTIDAS_POR_BLOCO = 20000  # partidas simuladas por tarefa do pool
+
+
+def simular_bloco(nivel, partidas, precisao, passos, semente, max_respostas, erros=None):
+    """Simula um bloco de partidas com um gerador próprio e retorna as contagens"""
+    rng = random.Random(semente)
+    jogo = JogoPacMath(rng=rng, passos_por_acerto=passos)
+    robos = [JogadorRobo(precisao_jogador, erros, dispersao_tempo=0, rng=rng) for precisao_jogador in precisao]
+    ultima_casa = jogo.largura_tabuleiro - 1
+
+    vitorias = [0, 0]
+    tamanhos = Counter()  # respostas por partida -> quantidade de partidas
+    causas = Counter()    # consecutivos, borda, ambos, sem_vencedor
+
+    for _ in range(partidas):
+        jogo.reiniciar()
+        jogo.escolher_dificuldade(nivel)
+        partida = jogar_sem_tela(jogo, robos, max_respostas)
+
+        tamanhos[partida.respostas] += 1
+        if jogo.estado != "fim_jogo":
+            causas["sem_vencedor"] += 1
+            continue
+
+        # Descobre qual regra encerrou a partida
+        resultado = partida.ultimo_resultado
+        vitorias[resultado.jogador] += 1
+        por_acertos = jogo.acertos_consecutivos[resultado.jogador] >= ACERTOS_PARA_VENCER
+        por_borda = resultado.posicao_final <= 0 or resultado.posicao_final >= ultima_casa
+        if por_acertos and por_borda:
+            causas["ambos"] += 1
+        elif por_acertos:
+            causas["consecutivos"] += 1
+        else:
+            causas["borda"] += 1
+
+    return nivel, vitorias, tamanhos, causas
+
+
+def percentil(tamanhos, fracao):
+    """Percentil de uma distribuição guardada como Counter de valores"""
+    total = sum(tamanhos.values())
+    limite = fracao * total
+    acumulado = 0
+    for valor in sorted(tamanhos):
+        acumulado += tamanhos[valor]
+        if acumulado >= limite:
+            return valor
+    return 0
+
+
+def resumir(nivel, vitorias, tamanhos, causas):
+    """Transforma as contagens de um nível em um dicionário de estatísticas"""
+    total = sum(tamanhos.values())
+    media = sum(valor * quantidade for valor, quantidade in tamanhos.items()) / total
+    taxas = [v / total for v in vitorias]
+    return {
+        "nivel": nivel,
+        "partidas": total,
+        "vitorias": dict(zip(JOGADORES, vitorias)),
+        "taxa_vitoria": dict(zip(JOGADORES, taxas)),
+        "diferenca_taxa": taxas[0] - taxas[1],
+        "respostas": {
+            "media": media,
+            "p10": percentil(tamanhos, 0.10),
+            "p50": percentil(tamanhos, 0.50),
+            "p90": percentil(tamanhos, 0.90),
+            "p99": percentil(tamanhos, 0.99),
+            "maximo": max(tamanhos),
+        },
+        "fim_por": {causa: causas[causa] / total for causa in ("consecutivos", "borda", "ambos", "sem_vencedor")},
+        "distribuicao_respostas": {str(valor): tamanhos[valor] for valor in sorted(tamanhos)},
+    }
+
+
+def imprimir_resumo(resumo):
+    """Mostra o resumo de um nível no terminal"""
+    print(f"\nNível {resumo['nivel']} ({NIVEIS_DIFICULDADE[resumo['nivel']]}) - {resumo['partidas']} partidas")
+    for nome, taxa in resumo["taxa_vitoria"].items():
+        print(f"  {nome:>10}: {100 * taxa:6.2f}% de vitórias")
+    print(f"  Diferença: {100 * resumo['diferenca_taxa']:+.2f} pontos percentuais")
+    respostas = resumo["respostas"]
+    print(f"  Respostas por partida: média {respostas['media']:.1f}, p10 {respostas['p10']}, "
+          f"p50 {respostas['p50']}, p90 {respostas['p90']}, p99 {respostas['p99']}, máximo {respostas['maximo']}")
+    fim = resumo["fim_por"]
+    print(f"  Fim por {ACERTOS_PARA_VENCER} consecutivos: {100 * fim['consecutivos']:.2f}%, "
+          f"pela borda: {100 * fim['borda']:.2f}%, ambos: {100 * fim['ambos']:.2f}%, "
+          f"sem vencedor: {100 * fim['sem_vencedor']:.2f}%")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulação Monte Carlo do balanceamento do PacMath")
+    parser.add_argument("--partidas", type=int, default=1000000, help="partidas simuladas por nível")
+    parser.add_argument("--niveis", nargs="+", default=sorted(NIVEIS_DIFICULDADE), choices=sorted(NIVEIS_DIFICULDADE))
+    parser.add_argument("--precisao", type=float, nargs=2, default=[0.75, 0.75], metavar=("J1", "J2"),
+                        help="probabilidade de acerto de cada jogador em cada tentativa")
+    parser.add_argument("--erros", nargs="*", default=[], metavar="AxB=TAXA",
+                        help="taxa de erro própria de algumas contas, para os dois jogadores")
+    parser.add_argument("--passos", type=int, default=(LARGURA_TABULEIRO // 2) // 4,
+                        help="células andadas por acerto")
+    parser.add_argument("--semente", type=int, default=0, help="semente base (resultados reproduzíveis)")
+    parser.add_argument("--processos", type=int, default=os.cpu_count(), help="processos do pool")
+    parser.add_argument("--max-respostas", type=int, default=10000, help="limite de respostas por partida")
+    parser.add_argument("--saida", help="arquivo JSON para gravar os resultados")
+    args = parser.parse_args()
+
+    # Blocos fixos com sementes derivadas da semente base, do nível e do índice do bloco
+    erros = ler_erros(args.erros)
+    tarefas = []
+    for nivel in args.niveis:
+        for indice, inicio in enumerate(range(0, args.partidas, PARTIDAS_POR_BLOCO)):
+            partidas = min(PARTIDAS_POR_BLOCO, args.partidas - inicio)
+            semente = f"{args.semente}-{nivel}-{indice}"
+            tarefas.append((nivel, partidas, args.precisao, args.passos, semente, args.max_respostas, erros))
+
+    inicio = time.perf_counter()
+    totais = {nivel: ([0, 0], Counter(), Counter()) for nivel in args.niveis}
+    with ProcessPoolExecutor(max_workers=args.processos) as executor:
+        for nivel, vitorias, tamanhos, causas in executor.map(simular_bloco, *zip(*tarefas)):
+            vitorias_total, tamanhos_total, causas_total = totais[nivel]
+            vitorias_total[0] += vitorias[0]
+            vitorias_total[1] += vitorias[1]
+            tamanhos_total.update(tamanhos)
+            causas_total.update(causas)
+    duracao = time.perf_counter() - inicio
+
+    print(f"Precisão: {JOGADORES[0]} {args.precisao[0]:.2f}, {JOGADORES[1]} {args.precisao[1]:.2f}; "
+          f"passos por acerto: {args.passos}")
+    resumos = [resumir(nivel, *totais[nivel]) for nivel in args.niveis]
+    for resumo in resumos:
+        imprimir_resumo(resumo)
+    print(f"\n{len(args.niveis) * args.partidas} partidas em {duracao:.1f} s com {args.processos} processos")
+
+    if args.saida:
+        with open(args.saida, "w", encoding="utf-8") as arquivo:
+            json.dump({"parametros": vars(args), "niveis": resumos}, arquivo, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+# PacMath - Benchmark de renderização
+# Autor: Luiz - Mede o tempo de desenho de cada tela sem abrir janela
+"""
+Roda o pacmathv3 com SDL_VIDEODRIVER=dummy e passa por todas as telas:
+    dificuldade, jogando, jogando com a tabuada aberta, segunda chance,
+    animações e fim de jogo.
+
+Em cada cenário a tela inteira é redesenhada a cada quadro, e o tempo de cada
+função desenhar_* (e do quadro completo) é registrado. O resultado vai para um
+arquivo JSON com percentis por função, para comparar commits.
+
+Execução:
+    python benchmark_telas.py --quadros 300 --saida benchmark_telas.json
+"""
+
+import argparse
+import os
+import platform
+import subprocess
+import sys
+
+from ambiente import preparar_execucao_automatica
+
+# O driver precisa ser escolhido antes de importar o pygame
+preparar_execucao_automatica()
+
+import pygame
+
+import pacmathv3
+from perfil import Perfilador
+
+
+def clicar(retangulo):
+    """Posta um clique no centro do retângulo"""
+    pygame.event.post(pygame.event.Event(pygame.MOUSEBUTTONDOWN, pos=retangulo.center, button=1))
+
+
+class RoteiroBenchmark:
+    """Controlador que leva o jogo por cada cenário e mede um número fixo de quadros"""
+
+    def __init__(self, perfilador, quadros_por_cenario):
+        self.perfilador = perfilador
+        self.quadros_por_cenario = quadros_por_cenario
+        self.etapa = 0           # índice da etapa atual do roteiro
+        self.quadros_medidos = 0 # quadros medidos no cenário atual
+
+    def medir(self, cenario):
+        """Mede mais um quadro do cenário; retorna True quando o cenário termina"""
+        self.perfilador.cenario = cenario
+        self.quadros_medidos += 1
+        if self.quadros_medidos < self.quadros_por_cenario:
+            return False
+        self.quadros_medidos = 0
+        self.etapa += 1
+        return True
+
+    def quadro(self, jogo, sessao):
+        """Chamado pelo jogo a cada volta do loop"""
+        sessao.redesenhar_tudo()  # mede sempre o quadro completo
+        layout = sessao.layout
+
+        # Enquanto algo anima, os quadros contam como "animacao"
+        if sessao.animando:
+            self.perfilador.cenario = "animacao"
+            return
+
+        if self.etapa == 0:
+            if self.medir("dificuldade"):
+                clicar(layout.botoes_dificuldade[2][0])  # Difícil (1 a 9)
+        elif self.etapa == 1:
+            if sessao.estado_jogo == "jogando" and self.medir("jogando"):
+                clicar(layout.botao_tabuada)
+        elif self.etapa == 2:
+            if sessao.tabuada_expandida and self.medir("jogando_tabuada"):
+                clicar(layout.botao_tabuada)
+        elif self.etapa == 3:
+            # Responde errado uma vez para chegar à segunda chance
+            if not sessao.tabuada_expandida and not jogo.segunda_chance:
+                errada = next(i for i, a in enumerate(jogo.alternativas) if a != jogo.resposta_correta)
+                clicar(layout.botoes_alternativas[errada])
+                self.perfilador.cenario = "animacao"
+            elif jogo.segunda_chance and self.medir("segunda_chance"):
+                pass
+        elif self.etapa == 4:
+            # Responde certo até alguém vencer
+            if sessao.estado_jogo == "jogando":
+                clicar(layout.botoes_alternativas[jogo.alternativas.index(jogo.resposta_correta)])
+                self.perfilador.cenario = "animacao"
+            elif sessao.estado_jogo == "fim_jogo" and self.medir("fim_jogo"):
+                pygame.event.post(pygame.event.Event(pygame.QUIT))
+
+
+def versao_codigo():
+    """Commit atual do repositório, se disponível"""
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__)), check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de renderização das telas do PacMath")
+    parser.add_argument("--quadros", type=int, default=120, help="quadros medidos em cada cenário")
+    parser.add_argument("--saida", default="benchmark_telas.json", help="arquivo JSON com os resultados")
+    args = parser.parse_args()
+
+    perfilador = Perfilador()
+    pacmathv3.executar_jogo_pacmath(controlador=RoteiroBenchmark(perfilador, args.quadros), perfilador=perfilador)
+
+    perfilador.salvar_json(args.saida, commit=versao_codigo(), python=platform.python_version(),
+                           pygame=pygame.version.ver, driver=os.environ["SDL_VIDEODRIVER"],
+                           quadros_por_cenario=args.quadros)
+
+    # Resumo no terminal
+    for cenario, secoes in perfilador.resumo().items():
+        print(f"\n{cenario}")
+        for secao, estatistica in secoes.items():
+            print(f"  {secao:<28} n={estatistica['amostras']:<5} média {estatistica['media_ms']:7.3f} ms  "
+                  f"p50 {estatistica['p50_ms']:7.3f}  p95 {estatistica['p95_ms']:7.3f}  p99 {estatistica['p99_ms']:7.3f}")
+    print(f"\nResultados gravados em {args.saida}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
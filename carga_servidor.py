@@ -0,0 +1,138 @@
+# PacMath - Teste de carga do servidor
+# Autor: Luiz - Muitos jogadores virtuais conectados ao servidor.py
+"""
+Abre muitas conexões simultâneas com o servidor.py, cada uma jogando partidas
+completas (escolhe a dificuldade, responde com a precisão indicada e reinicia
+ao fim), e mostra mensagens por segundo e a latência de cada ida e volta.
+
+Com --pausa, cada jogador espera entre as respostas como uma criança pensando,
+o que mede quantas sessões ociosas o servidor aguenta; sem pausa, mede a vazão.
+
+Execução (no loopback):
+    python carga_servidor.py --iniciar-servidor --sessoes 500 --duracao 10
+    python carga_servidor.py --endereco 127.0.0.1:8765 --sessoes 2000 --pausa 2000
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import socket
+import subprocess
+import sys
+import time
+
+from perfil import estatisticas
+from protocolo import analisar_endereco, codificar, decodificar
+from regras import NIVEIS_DIFICULDADE
+
+
+class Totais:
+    """Contagens somadas de todos os jogadores virtuais"""
+
+    def __init__(self):
+        self.latencias = []  # segundos de cada ida e volta
+        self.partidas = 0
+        self.erros = 0
+
+
+async def jogador_virtual(endereco, fim, precisao, pausa, rng, totais):
+    """Joga partidas seguidas até o instante fim"""
+    familia, destino = analisar_endereco(endereco)
+    if familia == "unix":
+        leitor, escritor = await asyncio.open_unix_connection(destino)
+    else:
+        leitor, escritor = await asyncio.open_connection(*destino)
+
+    async def pedir(mensagem):
+        inicio = time.perf_counter()
+        escritor.write(codificar(mensagem))
+        await escritor.drain()
+        resposta = decodificar(await leitor.readline())
+        totais.latencias.append(time.perf_counter() - inicio)
+        if resposta["tipo"] == "erro":
+            totais.erros += 1
+        return resposta
+
+    try:
+        while time.perf_counter() < fim:
+            estado = (await pedir({"tipo": "dificuldade", "nivel": rng.choice(sorted(NIVEIS_DIFICULDADE))}))["estado"]
+            while estado["estado"] == "jogando" and time.perf_counter() < fim:
+                if pausa:
+                    await asyncio.sleep(rng.uniform(0.5, 1.5) * pausa)
+                correta = estado["resposta_correta"]
+                if rng.random() < precisao:
+                    valor = correta
+                else:
+                    valor = next(a for a in estado["alternativas"] if a != correta)
+                estado = (await pedir({"tipo": "resposta", "valor": valor}))["estado"]
+            if estado["estado"] == "fim_jogo":
+                totais.partidas += 1
+            await pedir({"tipo": "reiniciar"})
+    finally:
+        escritor.close()
+
+
+async def executar_carga(endereco, sessoes, duracao, precisao, pausa, semente):
+    """Roda os jogadores virtuais e retorna os totais e o tempo gasto"""
+    totais = Totais()
+    inicio = time.perf_counter()
+    fim = inicio + duracao
+    jogadores = [jogador_virtual(endereco, fim, precisao, pausa, random.Random(f"{semente}-{i}"), totais)
+                 for i in range(sessoes)]
+    resultados = await asyncio.gather(*jogadores, return_exceptions=True)
+    totais.erros += sum(isinstance(r, Exception) for r in resultados)
+    return totais, time.perf_counter() - inicio
+
+
+def esperar_servidor(endereco, tempo_limite=10.0):
+    """Espera o servidor aceitar conexões"""
+    familia, destino = analisar_endereco(endereco)
+    limite = time.perf_counter() + tempo_limite
+    while True:
+        try:
+            if familia == "unix":
+                with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as soquete:
+                    soquete.connect(destino)
+            else:
+                socket.create_connection(destino, timeout=1).close()
+            return
+        except OSError:
+            if time.perf_counter() > limite:
+                raise
+            time.sleep(0.05)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Teste de carga do servidor de partidas do PacMath")
+    parser.add_argument("--endereco", default="127.0.0.1:8765", help="host:porta ou unix:/caminho")
+    parser.add_argument("--sessoes", type=int, default=500, help="jogadores virtuais simultâneos")
+    parser.add_argument("--duracao", type=float, default=10, help="segundos de teste")
+    parser.add_argument("--precisao", type=float, default=0.75, help="probabilidade de acerto")
+    parser.add_argument("--pausa", type=float, default=0, help="milissegundos médios entre respostas")
+    parser.add_argument("--semente", type=int, default=0, help="semente dos jogadores virtuais")
+    parser.add_argument("--iniciar-servidor", action="store_true", help="inicia um servidor.py local para o teste")
+    args = parser.parse_args()
+
+    servidor = None
+    if args.iniciar_servidor:
+        servidor = subprocess.Popen([sys.executable, os.path.join(os.path.dirname(os.path.abspath(__file__)), "servidor.py"),
+                                     "--endereco", args.endereco])
+        esperar_servidor(args.endereco)
+    try:
+        totais, duracao = asyncio.run(executar_carga(args.endereco, args.sessoes, args.duracao,
+                                                     args.precisao, args.pausa / 1000, args.semente))
+    finally:
+        if servidor is not None:
+            servidor.terminate()
+            servidor.wait()
+
+    latencia = estatisticas(totais.latencias)
+    print(f"{args.sessoes} sessões por {duracao:.1f} s: {len(totais.latencias)} mensagens "
+          f"({len(totais.latencias) / duracao:.0f}/s), {totais.partidas} partidas, {totais.erros} erros")
+    print(f"Latência: média {latencia['media_ms']:.2f} ms, p50 {latencia['p50_ms']:.2f}, "
+          f"p95 {latencia['p95_ms']:.2f}, p99 {latencia['p99_ms']:.2f}, máximo {latencia['max_ms']:.2f}")
+
+
+if __name__ == "__main__":
+    main()
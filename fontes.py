@@ -0,0 +1,106 @@
+# PacMath - Fontes
+# Autor: Luiz - Fontes carregadas no primeiro uso, com o caminho guardado em disco
+"""
+Carregamento rápido das fontes do jogo.
+
+pygame.font.SysFont varre todas as fontes do sistema (fc-list no Linux) na
+primeira chamada, o que pode levar mais de um segundo. Aqui:
+    - FonteTardia só cria a pygame.font.Font quando ela é usada pela primeira vez;
+    - o arquivo escolhido para cada (nome, negrito) fica guardado em
+      ~/.cache/pacmath/fontes.json, e nas próximas execuções a varredura não
+      acontece (apague o arquivo para varrer de novo depois de instalar fontes);
+    - se existir fontes/PacMath.ttf ao lado do jogo (ou PACMATH_FONTE apontar
+      para um .ttf), essa fonte é usada para todos os textos, sem consultar o
+      sistema.
+"""
+
+import json
+import os
+
+import pygame
+
+# Fonte distribuída junto com o jogo (opcional)
+FONTE_EMBUTIDA = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fontes", "PacMath.ttf")
+
+# Arquivo com os caminhos já resolvidos das fontes do sistema
+ARQUIVO_CACHE = os.path.join(os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache"),
+                             "pacmath", "fontes.json")
+
+
+def fonte_embutida():
+    """Caminho da fonte embutida (PACMATH_FONTE ou fontes/PacMath.ttf), ou None"""
+    caminho = os.environ.get("PACMATH_FONTE") or FONTE_EMBUTIDA
+    return caminho if os.path.isfile(caminho) else None
+
+
+class CacheCaminhosFonte:
+    """Guarda em disco o arquivo que o SysFont escolheria para cada fonte"""
+
+    def __init__(self, arquivo=ARQUIVO_CACHE):
+        self.arquivo = arquivo
+        self.caminhos = None  # "nome|negrito" -> [caminho ou None, negrito sintético]
+
+    def _carregar(self):
+        """Lê o arquivo do cache; um arquivo ausente ou inválido vale como cache vazio"""
+        try:
+            with open(self.arquivo, encoding="utf-8") as arquivo:
+                self.caminhos = json.load(arquivo)
+        except (OSError, ValueError):
+            self.caminhos = {}
+
+    def _salvar(self):
+        """Grava o cache; se não for possível gravar, o jogo segue sem ele"""
+        try:
+            os.makedirs(os.path.dirname(self.arquivo), exist_ok=True)
+            temporario = self.arquivo + ".tmp"
+            with open(temporario, "w", encoding="utf-8") as arquivo:
+                json.dump(self.caminhos, arquivo, ensure_ascii=False, indent=2)
+            os.replace(temporario, self.arquivo)
+        except OSError:
+            pass
+
+    def resolver(self, nome, negrito=False):
+        """Retorna (caminho, negrito_sintetico) como o SysFont faria, varrendo o sistema só se preciso"""
+        if self.caminhos is None:
+            self._carregar()
+        chave = f"{nome}|{int(negrito)}"
+        guardado = self.caminhos.get(chave)
+        if guardado is not None and (guardado[0] is None or os.path.isfile(guardado[0])):
+            return guardado[0], guardado[1]
+
+        # O construtor recebe o arquivo e os estilos que o SysFont escolheu, sem criar a fonte
+        caminho, negrito_sintetico = pygame.font.SysFont(
+            nome, 1, bold=negrito, constructor=lambda caminho, tamanho, b, i: (caminho, b))
+        self.caminhos[chave] = [caminho, negrito_sintetico]
+        self._salvar()
+        return caminho, negrito_sintetico
+
+
+cache_caminhos = CacheCaminhosFonte()  # compartilhado por todas as fontes do processo
+
+
+class FonteTardia:
+    """Fonte criada no primeiro uso; repassa render, size etc. para a pygame.font.Font"""
+
+    def __init__(self, nome, tamanho, negrito=False, cache=None):
+        self.nome = nome
+        self.tamanho = tamanho
+        self.negrito = negrito
+        self.cache = cache or cache_caminhos
+        self.fonte = None  # pygame.font.Font, criada em carregar()
+
+    def carregar(self):
+        """Cria a fonte se ainda não existir e a retorna"""
+        if self.fonte is None:
+            caminho = fonte_embutida()
+            if caminho is not None:
+                negrito_sintetico = self.negrito  # a fonte embutida só tem o estilo normal
+            else:
+                caminho, negrito_sintetico = self.cache.resolver(self.nome, self.negrito)
+            self.fonte = pygame.font.Font(caminho, self.tamanho)
+            if negrito_sintetico:
+                self.fonte.set_bold(True)
+        return self.fonte
+
+    def __getattr__(self, atributo):
+        return getattr(self.carregar(), atributo)
@@ -0,0 +1,246 @@
+# PacMath - Gravação e reprodução de partidas
+# Autor: Luiz - Registro binário compacto das partidas, refeitas a partir da semente
+"""
+Grava cada partida como uma sequência binária de registros e refaz a partida
+exatamente a partir deles.
+
+Como as perguntas vêm de um gerador semeado no início da partida (veja
+regras.JogoPacMath.escolher_dificuldade), basta guardar a semente, o nível e
+as respostas dadas; as perguntas e a posição do Pacman são recalculadas.
+Cada resposta leva também a conta (a, b) da pergunta: nas partidas
+adaptativas, as contas não dependem só da semente e são refeitas a partir dela.
+
+Formato (inteiros little-endian):
+    cabeçalho:  "PMRP" + versão (1 byte)
+    partida:    tipo 1, semente (8), início em segundos desde 1970 (double),
+                nível (1 caractere), largura do tabuleiro (2), passos por acerto (2),
+                opções (1 byte; bit 0 = perguntas adaptativas)
+    resposta:   tipo 2 (primeira tentativa) ou 3 (segunda chance),
+                milissegundos desde o início da partida (4), resposta (4),
+                conta a (2), conta b (2)
+
+Execução:
+    python gravacao.py gravacoes/pacmath-20260101-120000.pmr           (refaz todas, sem tela)
+    python gravacao.py gravacoes/pacmath-20260101-120000.pmr --tela 2  (partida 2 em tempo real)
+    python gravacao.py gravacoes/pacmath-20260101-120000.pmr --tela 2 --escala 10  (dez vezes mais rápido)
+"""
+
+import argparse
+import os
+import struct
+import time
+from collections import namedtuple
+
+from adaptativo import SeletorGravado
+from ambiente import preparar_execucao_automatica
+from regras import JogoPacMath
+
+ASSINATURA = b"PMRP"
+VERSAO = 1
+CABECALHO = struct.Struct("<4sB")
+REGISTRO_PARTIDA = struct.Struct("<BQd1sHHB")
+REGISTRO_RESPOSTA = struct.Struct("<BIiHH")
+OPCAO_ADAPTATIVA = 1
+LARGURA_MAXIMA = 0xFFFF  # maior tabuleiro que cabe no registro da partida
+
+# Tipos de registro
+PARTIDA = 1
+RESPOSTA_PRIMEIRA = 2
+RESPOSTA_SEGUNDA_CHANCE = 3
+
+# Uma partida lida do arquivo; respostas é uma lista de
+# (milissegundos, resposta, segunda_chance, numero_a, numero_b)
+PartidaGravada = namedtuple("PartidaGravada",
+                            ["semente", "inicio", "nivel", "largura", "passos", "adaptativa", "respostas"])
+
+
+class GravadorPartidas:
+    """Acrescenta as partidas de uma sessão do jogo a um arquivo de gravação"""
+
+    def __init__(self, caminho):
+        self.caminho = caminho
+        self.arquivo = None         # aberto só quando a primeira partida começa
+        self.inicio_partida = None  # perf_counter do início da partida atual
+
+    @classmethod
+    def na_pasta(cls, pasta):
+        """Gravador com um arquivo novo na pasta, nomeado pela data e pelo processo"""
+        nome = time.strftime("pacmath-%Y%m%d-%H%M%S") + f"-{os.getpid()}.pmr"
+        return cls(os.path.join(pasta, nome))
+
+    def _escrever(self, dados):
+        """Escreve um registro e o envia ao disco (partidas contestadas não podem se perder)"""
+        if self.arquivo is None:
+            os.makedirs(os.path.dirname(self.caminho) or ".", exist_ok=True)
+            self.arquivo = open(self.caminho, "wb")
+            self.arquivo.write(CABECALHO.pack(ASSINATURA, VERSAO))
+        self.arquivo.write(dados)
+        self.arquivo.flush()
+
+    def iniciar_partida(self, jogo):
+        """Registra a semente e o nível da partida que acabou de começar"""
+        self.inicio_partida = time.perf_counter()
+        opcoes = OPCAO_ADAPTATIVA if getattr(jogo, "seletor", None) is not None else 0
+        self._escrever(REGISTRO_PARTIDA.pack(PARTIDA, jogo.semente, time.time(), jogo.nivel.encode("ascii"),
+                                             jogo.largura_tabuleiro, jogo.passos_por_acerto, opcoes))
+
+    def registrar_resposta(self, resposta, segunda_chance, numero_a, numero_b):
+        """Registra uma resposta à conta numero_a × numero_b (antes de ela ser aplicada às regras)"""
+        if self.inicio_partida is None:
+            return
+        tipo = RESPOSTA_SEGUNDA_CHANCE if segunda_chance else RESPOSTA_PRIMEIRA
+        milissegundos = int(1000 * (time.perf_counter() - self.inicio_partida))
+        self._escrever(REGISTRO_RESPOSTA.pack(tipo, milissegundos, resposta, numero_a, numero_b))
+
+    def fechar(self):
+        """Fecha o arquivo, se algum foi aberto"""
+        if self.arquivo is not None:
+            self.arquivo.close()
+            self.arquivo = None
+
+
+def ler_gravacao(caminho):
+    """Lê um arquivo de gravação e retorna a lista de PartidaGravada"""
+    with open(caminho, "rb") as arquivo:
+        dados = arquivo.read()
+    if len(dados) < CABECALHO.size:
+        raise ValueError(f"{caminho}: arquivo de gravação vazio ou truncado")
+    assinatura, versao = CABECALHO.unpack_from(dados)
+    if assinatura != ASSINATURA or versao != VERSAO:
+        raise ValueError(f"{caminho}: não é uma gravação do PacMath (versão {VERSAO})")
+
+    partidas = []
+    deslocamento = CABECALHO.size
+    while deslocamento < len(dados):
+        tipo = dados[deslocamento]
+        if tipo == PARTIDA:
+            registro = REGISTRO_PARTIDA
+            if deslocamento + registro.size > len(dados):
+                break  # último registro cortado (o jogo foi encerrado à força)
+            _, semente, inicio, nivel, largura, passos, opcoes = registro.unpack_from(dados, deslocamento)
+            adaptativa = bool(opcoes & OPCAO_ADAPTATIVA)
+            partidas.append(PartidaGravada(semente, inicio, nivel.decode("ascii"), largura, passos, adaptativa, []))
+        elif tipo in (RESPOSTA_PRIMEIRA, RESPOSTA_SEGUNDA_CHANCE):
+            registro = REGISTRO_RESPOSTA
+            if deslocamento + registro.size > len(dados) or not partidas:
+                break
+            _, milissegundos, resposta, numero_a, numero_b = registro.unpack_from(dados, deslocamento)
+            partidas[-1].respostas.append((milissegundos, resposta, tipo == RESPOSTA_SEGUNDA_CHANCE, numero_a, numero_b))
+        else:
+            raise ValueError(f"{caminho}: registro desconhecido {tipo} na posição {deslocamento}")
+        deslocamento += registro.size
+    return partidas
+
+
+def seletor_gravado(partida):
+    """SeletorGravado com as contas das perguntas de uma partida adaptativa, ou None"""
+    if not partida.adaptativa:
+        return None
+    return SeletorGravado([(a, b) for _, _, segunda_chance, a, b in partida.respostas if not segunda_chance])
+
+
+def refazer_partida(partida):
+    """Refaz a partida sem interface e retorna o JogoPacMath no estado final
+
+    Levanta RuntimeError se a gravação não bater com as regras (por exemplo,
+    uma resposta gravada como segunda chance que agora seria a primeira).
+    """
+    jogo = JogoPacMath(largura_tabuleiro=partida.largura, passos_por_acerto=partida.passos)
+    jogo.seletor = seletor_gravado(partida)  # só depois da pergunta criada pelo construtor
+    jogo.escolher_dificuldade(partida.nivel, partida.semente)
+    for indice, (_, resposta, segunda_chance, numero_a, numero_b) in enumerate(partida.respostas):
+        if (jogo.estado != "jogando" or jogo.segunda_chance != segunda_chance
+                or (jogo.numero_a, jogo.numero_b) != (numero_a, numero_b)):
+            raise RuntimeError(f"A gravação diverge das regras na resposta {indice + 1}")
+        jogo.passo(resposta)
+    return jogo
+
+
+class JogoReproduzido(JogoPacMath):
+    """JogoPacMath que começa a partida com a semente gravada"""
+
+    def __init__(self, partida):
+        super().__init__(largura_tabuleiro=partida.largura, passos_por_acerto=partida.passos)
+        self.partida = partida
+        self.seletor = seletor_gravado(partida)
+
+    def escolher_dificuldade(self, nivel, semente=None):
+        super().escolher_dificuldade(nivel, self.partida.semente)
+
+
+class ControladorReproducao:
+    """Controlador do pacmathv3 que digita as respostas gravadas nos mesmos instantes"""
+
+    def __init__(self, partida, espera_final=3.0):
+        self.partida = partida
+        self.espera_final = espera_final  # segundos mostrando o fim antes de fechar
+        self.proxima = 0                  # índice da próxima resposta
+        self.inicio = None                # tempo de jogo (ms) do clique na dificuldade
+        self.fim = None                   # tempo de jogo (ms) de quando acabaram as respostas
+
+    def quadro(self, jogo, sessao):
+        """Chamado pelo jogo a cada volta do loop"""
+        import pygame
+
+        agora = sessao.tempo_jogo_ms  # segue a escala de tempo, como as animações
+        if self.inicio is None:
+            # Um temporizador acorda o loop mesmo no modo ocioso, para respeitar os instantes
+            pygame.time.set_timer(pygame.USEREVENT, 20)
+            if sessao.estado_jogo == "dificuldade":
+                retangulo = next(r for r, nivel, _ in sessao.layout.botoes_dificuldade if nivel == self.partida.nivel)
+                pygame.event.post(pygame.event.Event(pygame.MOUSEBUTTONDOWN, pos=retangulo.center, button=1))
+                self.inicio = agora
+            return
+
+        if self.proxima < len(self.partida.respostas):
+            milissegundos, resposta = self.partida.respostas[self.proxima][:2]
+            # Se a animação atrasou, a resposta espera ela terminar (como o jogador esperou)
+            if sessao.animando or sessao.estado_jogo != "jogando" or agora - self.inicio < milissegundos:
+                return
+            for digito in str(resposta):
+                pygame.event.post(pygame.event.Event(pygame.KEYDOWN, key=ord(digito), unicode=digito, mod=0))
+            pygame.event.post(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_RETURN, unicode="\r", mod=0))
+            self.proxima += 1
+        elif not sessao.animando:
+            if self.fim is None:
+                self.fim = agora
+            elif agora - self.fim >= 1000 * self.espera_final:
+                pygame.event.post(pygame.event.Event(pygame.QUIT))
+
+
+def reproduzir_na_tela(partida, escala=1.0):
+    """Mostra a partida no pacmathv3, com as respostas nos instantes gravados (divididos pela escala)"""
+    # A reprodução não gera outra gravação, não entra no histórico dos alunos e os
+    # eventos postados não medem a latência do quiosque
+    preparar_execucao_automatica(sem_tela=False, escala_tempo=escala, forcar=True)
+    import pacmathv3  # só a reprodução com tela precisa do pygame
+
+    pacmathv3.executar_jogo_pacmath(controlador=ControladorReproducao(partida), jogo=JogoReproduzido(partida))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Reprodução das partidas gravadas do PacMath")
+    parser.add_argument("arquivo", help="arquivo .pmr gravado pelo pacmathv3")
+    parser.add_argument("--tela", type=int, metavar="N", help="mostra a partida N em tempo real")
+    parser.add_argument("--escala", type=float, default=1.0, help="acelera a partida mostrada com --tela")
+    args = parser.parse_args()
+
+    partidas = ler_gravacao(args.arquivo)
+    if args.tela:
+        reproduzir_na_tela(partidas[args.tela - 1], args.escala)
+        return
+
+    inicio = time.perf_counter()
+    for numero, partida in enumerate(partidas, 1):
+        jogo = refazer_partida(partida)
+        tempos = [0] + [resposta[0] for resposta in partida.respostas]
+        maior_intervalo = max(b - a for a, b in zip(tempos, tempos[1:])) if partida.respostas else 0
+        print(f"Partida {numero}: {time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(partida.inicio))}, "
+              f"nível {partida.nivel}{' adaptativo' if partida.adaptativa else ''}, semente {partida.semente}, {len(partida.respostas)} respostas "
+              f"em {tempos[-1] / 1000:.1f} s (maior intervalo {maior_intervalo / 1000:.1f} s), "
+              f"vencedor: {jogo.vencedor or 'nenhum'}")
+    print(f"{len(partidas)} partidas refeitas em {1000 * (time.perf_counter() - inicio):.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
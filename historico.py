@@ -0,0 +1,135 @@
+# PacMath - Histórico de respostas
+# Autor: Luiz - Respostas de cada aluno guardadas em SQLite, sem travar o jogo
+"""
+Guarda cada resposta dada no jogo em um banco SQLite local, para os
+professores acompanharem os alunos.
+
+O jogo só coloca a resposta em uma fila (HistoricoRespostas.registrar); uma
+thread separada tira as respostas da fila e grava em lotes, numa transação
+por lote, com o banco em modo WAL. Assim o loop de desenho nunca espera o
+disco.
+
+Relatório por aluno:
+    python historico.py pacmath_respostas.db
+"""
+
+import argparse
+import queue
+import sqlite3
+import sys
+import threading
+import time
+
+CRIAR_TABELA = """
+CREATE TABLE IF NOT EXISTS respostas (
+    id INTEGER PRIMARY KEY,
+    instante REAL NOT NULL,          -- segundos desde 1970
+    jogador TEXT NOT NULL,
+    numero_a INTEGER NOT NULL,
+    numero_b INTEGER NOT NULL,
+    resposta INTEGER NOT NULL,       -- alternativa escolhida ou número digitado
+    correta INTEGER NOT NULL,        -- 1 se a resposta estava certa
+    segunda_chance INTEGER NOT NULL, -- 1 se foi a segunda tentativa
+    latencia_ms REAL NOT NULL        -- tempo entre a pergunta aparecer e a resposta
+);
+CREATE INDEX IF NOT EXISTS respostas_jogador ON respostas (jogador, numero_a, numero_b);
+"""
+
+INSERIR = ("INSERT INTO respostas (instante, jogador, numero_a, numero_b, resposta, correta, segunda_chance, latencia_ms) "
+           "VALUES (?, ?, ?, ?, ?, ?, ?, ?)")
+
+_FIM = object()  # marca na fila para a thread terminar
+
+
+class HistoricoRespostas:
+    """Fila de respostas gravada no SQLite por uma thread em segundo plano"""
+
+    def __init__(self, caminho, tamanho_lote=200, espera_lote=0.5):
+        self.caminho = caminho
+        self.tamanho_lote = tamanho_lote  # respostas gravadas por transação, no máximo
+        self.espera_lote = espera_lote    # segundos esperando mais respostas antes de gravar
+        self.fila = queue.SimpleQueue()
+        self.gravadas = 0
+        self.thread = threading.Thread(target=self._gravar, name="historico-respostas", daemon=True)
+        self.thread.start()
+
+    def registrar(self, jogador, numero_a, numero_b, resposta, correta, segunda_chance, latencia_ms):
+        """Coloca uma resposta na fila de gravação (não bloqueia)"""
+        self.fila.put((time.time(), jogador, numero_a, numero_b, resposta, int(correta), int(segunda_chance), latencia_ms))
+
+    def _proximo_lote(self):
+        """Espera uma resposta e junta as que chegarem logo depois; None quando termina"""
+        item = self.fila.get()
+        if item is _FIM:
+            return None
+        lote = [item]
+        limite = time.monotonic() + self.espera_lote
+        while len(lote) < self.tamanho_lote:
+            restante = limite - time.monotonic()
+            try:
+                item = self.fila.get(timeout=restante) if restante > 0 else self.fila.get_nowait()
+            except queue.Empty:
+                break
+            if item is _FIM:
+                self.fila.put(_FIM)  # termina depois de gravar este lote
+                break
+            lote.append(item)
+        return lote
+
+    def _gravar(self):
+        """Loop da thread: grava os lotes até receber o fim"""
+        try:
+            conexao = sqlite3.connect(self.caminho)
+            conexao.execute("PRAGMA journal_mode=WAL")
+            conexao.execute("PRAGMA synchronous=NORMAL")
+            conexao.executescript(CRIAR_TABELA)
+        except sqlite3.Error as erro:
+            print(f"Histórico de respostas desativado: {erro}", file=sys.stderr)
+            while self.fila.get() is not _FIM:
+                pass  # descarta as respostas para a fila não crescer
+            return
+
+        while True:
+            lote = self._proximo_lote()
+            if lote is None:
+                break
+            try:
+                with conexao:
+                    conexao.executemany(INSERIR, lote)
+                self.gravadas += len(lote)
+            except sqlite3.Error as erro:
+                print(f"Falha ao gravar {len(lote)} respostas: {erro}", file=sys.stderr)
+        conexao.close()
+
+    def fechar(self):
+        """Grava o que ainda está na fila e encerra a thread"""
+        self.fila.put(_FIM)
+        self.thread.join()
+
+
+def relatorio(caminho):
+    """Mostra, para cada aluno, acertos, tempo de resposta e as contas mais difíceis"""
+    conexao = sqlite3.connect(caminho)
+    alunos = conexao.execute(
+        "SELECT jogador, COUNT(*), AVG(correta), AVG(latencia_ms) FROM respostas GROUP BY jogador ORDER BY jogador"
+    ).fetchall()
+    for jogador, total, taxa, latencia in alunos:
+        print(f"\n{jogador}: {total} respostas, {100 * taxa:.1f}% corretas, {latencia / 1000:.1f} s em média")
+        dificeis = conexao.execute(
+            "SELECT numero_a, numero_b, COUNT(*), AVG(correta) FROM respostas WHERE jogador = ? "
+            "GROUP BY numero_a, numero_b HAVING COUNT(*) >= 2 ORDER BY AVG(correta), COUNT(*) DESC LIMIT 5",
+            (jogador,)).fetchall()
+        for numero_a, numero_b, vezes, taxa_conta in dificeis:
+            print(f"  {numero_a} × {numero_b}: {100 * taxa_conta:.0f}% corretas em {vezes} respostas")
+    conexao.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Relatório do histórico de respostas do PacMath")
+    parser.add_argument("banco", nargs="?", default="pacmath_respostas.db", help="arquivo SQLite do histórico")
+    args = parser.parse_args()
+    relatorio(args.banco)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+# PacMath - Partida remota
+# Autor: Luiz - Regras rodando no servidor, interface rodando no cliente
+"""
+JogoRemoto tem a mesma interface do regras.JogoPacMath, mas cada jogada é
+enviada ao servidor.py e o estado vem na resposta. Assim o pacmathv3 pode ser
+um cliente fino do servidor:
+
+    python pacmathv3.py --servidor 127.0.0.1:8765
+
+As chamadas são bloqueantes (uma ida e volta por jogada), o que combina com o
+loop síncrono do pygame.
+"""
+
+import socket
+
+from protocolo import analisar_endereco, codificar, decodificar
+from regras import Resultado
+
+
+class ErroServidor(RuntimeError):
+    """O servidor recusou a mensagem (servidor cheio, jogada fora de hora, mensagem inválida)"""
+
+
+class JogoRemoto:
+    """Partida hospedada no servidor, com os atributos do JogoPacMath"""
+
+    def __init__(self, endereco, tempo_limite=5.0):
+        familia, destino = analisar_endereco(endereco)
+        if familia == "unix":
+            self.soquete = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self.soquete.settimeout(tempo_limite)
+            self.soquete.connect(destino)
+        else:
+            self.soquete = socket.create_connection(destino, timeout=tempo_limite)
+            self.soquete.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.arquivo = self.soquete.makefile("rb")
+        self._enviar({"tipo": "estado"})
+
+    def _enviar(self, mensagem):
+        """Envia uma mensagem, espera a resposta e atualiza os atributos com o estado"""
+        try:
+            self.soquete.sendall(codificar(mensagem))
+            linha = self.arquivo.readline()
+        except OSError as erro:  # tempo esgotado ou rede fora do ar
+            raise ConnectionError(f"Falha na comunicação com o servidor: {erro}") from erro
+        if not linha:
+            raise ConnectionError("O servidor fechou a conexão")
+        resposta = decodificar(linha)
+        if resposta["tipo"] == "erro":
+            raise ErroServidor(resposta["mensagem"])
+        for campo, valor in resposta["estado"].items():
+            setattr(self, campo, valor)
+        return resposta
+
+    def reiniciar(self):
+        """Volta ao estado inicial, na escolha de dificuldade"""
+        self._enviar({"tipo": "reiniciar"})
+
+    def escolher_dificuldade(self, nivel, semente=None):
+        """Começa a partida com os fatores do nível escolhido"""
+        self._enviar({"tipo": "dificuldade", "nivel": nivel, "semente": semente})
+
+    def passo(self, resposta):
+        """Envia a resposta do jogador da vez e retorna o Resultado"""
+        return Resultado(**self._enviar({"tipo": "resposta", "valor": resposta})["resultado"])
+
+    def fechar(self):
+        """Encerra a conexão (a partida é descartada no servidor)"""
+        self.arquivo.close()
+        self.soquete.close()
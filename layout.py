@@ -0,0 +1,90 @@
+# PacMath - Layout da tela
+# Autor: Luiz - Retângulos de botões, painéis e textos calculados uma vez
+"""
+Posições de todos os botões, painéis e regiões da tela do PacMath.
+
+O Layout é calculado uma vez para cada tamanho de janela e guardado em cache
+por obter_layout. Os cliques são resolvidos com esses retângulos, sem precisar
+desenhar a tela para descobrir onde estão os botões.
+
+Os retângulos são compartilhados entre as chamadas: não devem ser alterados.
+"""
+
+from functools import lru_cache
+
+import pygame
+
+# Opções da tela de dificuldade: (texto do botão, nível)
+OPCOES_DIFICULDADE = [
+    ("1 - Fácil (1, 2, 3)", "1"),
+    ("2 - Médio (1 a 6)", "2"),
+    ("3 - Difícil (1 a 9)", "3"),
+    ("4 - Especial (7, 8, 9)", "4"),
+]
+
+
+class Layout:
+    """Retângulos da tela para um tamanho de janela"""
+
+    def __init__(self, largura_tela, altura, largura_jogo, quantidade_alternativas=3):
+        self.largura_tela = largura_tela
+        self.altura = altura
+        self.largura_jogo = largura_jogo
+
+        # Botão "?" que abre e fecha a tabuada, e o painel da tabuada à direita do jogo
+        self.botao_tabuada = pygame.Rect(largura_jogo - 80, 20, 60, 30)
+        self.painel_tabuada = pygame.Rect(largura_jogo, 0, max(0, largura_tela - largura_jogo), altura)
+
+        # Botões da tela de dificuldade
+        self.botoes_dificuldade = []
+        for i, (texto, nivel) in enumerate(OPCOES_DIFICULDADE):
+            y = 150 + i * 60  # posição vertical de cada botão
+            self.botoes_dificuldade.append((pygame.Rect(largura_jogo//2 - 200, y, 400, 50), nivel, texto))
+
+        # Botões de alternativas, centralizados
+        largura_botao = 120
+        altura_botao = 40
+        espaco_botao = 20
+        y_botao = altura - 200
+        largura_total = quantidade_alternativas * largura_botao + (quantidade_alternativas - 1) * espaco_botao
+        self.botoes_alternativas = [
+            pygame.Rect(largura_jogo//2 - largura_total//2 + idx * (largura_botao + espaco_botao), y_botao, largura_botao, altura_botao)
+            for idx in range(quantidade_alternativas)
+        ]
+
+        # Posições dos textos (x, y) da tela do jogo
+        self.nome_jogador = [(20, 20), (largura_jogo - 220, 20)]
+        self.acertos_jogador = [(20, 50), (largura_jogo - 320, 50)]
+        self.y_segunda_chance = 80
+        self.y_equacao = altura - 150
+        self.y_mensagem = altura - 40
+
+        # Regiões da tela do jogo que podem mudar independentemente
+        self.regiao_topo = pygame.Rect(0, 0, largura_jogo, 110)                        # nomes, contadores e botão "?"
+        self.regiao_alternativas = pygame.Rect(0, altura - 200, largura_jogo, 40)      # botões de alternativas
+        self.regiao_equacao = pygame.Rect(0, altura - 150, largura_jogo, 60)           # faixa da equação
+        self.regiao_mensagem = pygame.Rect(0, altura - 90, largura_jogo, 90)           # linha de mensagem
+
+    def clique_botao_tabuada(self, posicao):
+        """Indica se o clique foi no botão da tabuada"""
+        return self.botao_tabuada.collidepoint(posicao)
+
+    def clique_dificuldade(self, posicao):
+        """Retorna o nível do botão de dificuldade clicado, ou None"""
+        for retangulo, nivel, _ in self.botoes_dificuldade:
+            if retangulo.collidepoint(posicao):
+                return nivel
+        return None
+
+    def clique_alternativa(self, posicao):
+        """Retorna o índice da alternativa clicada, ou None"""
+        for idx, retangulo in enumerate(self.botoes_alternativas):
+            if retangulo.collidepoint(posicao):
+                return idx
+        return None
+
+
+@lru_cache(maxsize=8)
+def obter_layout(largura_tela, altura, largura_jogo, quantidade_alternativas=3):
+    """Retorna o Layout do tamanho de janela indicado, calculando só na primeira vez"""
+    return Layout(largura_tela, altura, largura_jogo, quantidade_alternativas)
@@ -8,10 +8,14 @@ Execução:
     python pacmath_v3.py
 """
 
+import os
 import random
 import pygame
 import time
 
+from fontes import FonteTardia
+from renderizacao import AtlasPacman, CacheTexto
+
 # ======= Parâmetros do jogo =======
 LARGURA_TABULEIRO = 61           # largura do tabuleiro em células
 CENTRO = LARGURA_TABULEIRO // 2  # posição central do tabuleiro
@@ -28,6 +32,7 @@ NIVEIS_DIFICULDADE = {
 # ======= Interface gráfica Pygame =======
 def executar_jogo_pacmath():
     """Função principal que executa o jogo PacMath"""
+    inicio_execucao = time.perf_counter()  # para medir o tempo até o primeiro quadro
     pygame.init()
     
     # Configurações da tela
@@ -37,12 +42,15 @@ def executar_jogo_pacmath():
     tela = pygame.display.set_mode((LARGURA_PIXELS, ALTURA_PIXELS))
     pygame.display.set_caption("PacMath - Edição Pacman")
     
-    # Configuração de fontes para diferentes tamanhos de texto
-    fonte_normal = pygame.font.SysFont("Arial", 28)
-    fonte_pequena = pygame.font.SysFont("Arial", 20)
-    fonte_grande = pygame.font.SysFont("Arial", 36, bold=True)
+    # Configuração de fontes para diferentes tamanhos de texto (carregadas no primeiro uso)
+    fonte_normal = FonteTardia("Arial", 28)
+    fonte_pequena = FonteTardia("Arial", 20)
+    fonte_grande = FonteTardia("Arial", 36, negrito=True)
     relogio = pygame.time.Clock()
 
+    # Textos renderizados são reaproveitados entre quadros e telas
+    cache_texto = CacheTexto()
+
     # Definição de cores usando RGB
     COR_FUNDO = (30, 30, 40)          # azul escuro
     COR_COMIDA = (255, 200, 0)        # amarelo dourado
@@ -58,6 +66,7 @@ def executar_jogo_pacmath():
     # Configurações visuais do Pacman e comida
     RAIO_COMIDA = 6         # raio dos pontinhos de comida
     RAIO_PACMAN = 18        # raio do Pacman
+    atlas_pacman = AtlasPacman(RAIO_PACMAN, COR_PACMAN)  # quadros da boca, desenhados no primeiro uso
     POSICAO_Y_COMIDA = ALTURA_PIXELS // 2  # posição vertical da comida
     POSICOES_COMIDA = [i for i in range(1, LARGURA_TABULEIRO-1)]  # posições horizontais da comida
     comida_consumida = set()  # conjunto de posições onde a comida foi consumida
@@ -88,7 +97,7 @@ def executar_jogo_pacmath():
         tela.fill(COR_FUNDO)
         
         # Desenha o título
-        titulo = fonte_grande.render("PacMath - Escolha a Dificuldade", True, COR_TEXTO)
+        titulo = cache_texto.renderizar(fonte_grande, "PacMath - Escolha a Dificuldade", True, COR_TEXTO)
         tela.blit(titulo, (LARGURA_PIXELS//2 - titulo.get_width()//2, 50))
         
         # Lista de opções de dificuldade
@@ -111,23 +120,14 @@ def executar_jogo_pacmath():
             pygame.draw.rect(tela, COR_BORDA_BOTAO, retangulo, 2)
             
             # Desenha o texto do botão
-            texto = fonte_normal.render(opcao, True, COR_BORDA_BOTAO)
+            texto = cache_texto.renderizar(fonte_normal, opcao, True, COR_BORDA_BOTAO)
             tela.blit(texto, (retangulo.x + 10, retangulo.y + 15))
         
         return botoes
 
-    def desenhar_pacman(superficie, x, y, raio, virado_esquerda):
-        """Desenha o Pacman na posição especificada"""
-        # Desenha o corpo circular do Pacman
-        pygame.draw.circle(superficie, COR_PACMAN, (x, y), raio)
-        
-        # Desenha a boca do Pacman (triângulo)
-        pontos_boca = [
-            (x, y),  # centro
-            (x + (raio if not virado_esquerda else -raio), y - int(raio * 0.5)),  # ponto superior
-            (x + (raio if not virado_esquerda else -raio), y + int(raio * 0.5))   # ponto inferior
-        ]
-        pygame.draw.polygon(superficie, COR_FUNDO, pontos_boca)
+    def desenhar_pacman(superficie, x, y, raio, virado_esquerda, quadro=None):
+        """Desenha o Pacman na posição especificada (quadro: abertura da boca, None = toda aberta)"""
+        atlas_pacman.desenhar(superficie, x, y, virado_esquerda, quadro)
 
     def desenhar_tela_jogo(mostrar_equacao=True, destacar_errado=False, valor_correto=None):
         """Desenha a tela principal do jogo"""
@@ -149,26 +149,26 @@ def executar_jogo_pacmath():
         desenhar_pacman(tela, pacman_x, POSICAO_Y_COMIDA, RAIO_PACMAN, virado_esquerda)
         
         # Desenha os nomes dos jogadores
-        nome1 = fonte_normal.render("Larissa", True, COR_TEXTO)
-        nome2 = fonte_normal.render("Leticia", True, COR_TEXTO)
+        nome1 = cache_texto.renderizar(fonte_normal, "Larissa", True, COR_TEXTO)
+        nome2 = cache_texto.renderizar(fonte_normal, "Leticia", True, COR_TEXTO)
         tela.blit(nome1, (20, 20))
         tela.blit(nome2, (LARGURA_PIXELS-120, 20))
         
         # Desenha os contadores de acertos
-        acertos1 = fonte_pequena.render(f"Acertos seguidos: {acertos_consecutivos[0]}", True, COR_TEXTO)
-        acertos2 = fonte_pequena.render(f"Acertos seguidos: {acertos_consecutivos[1]}", True, COR_TEXTO)
+        acertos1 = cache_texto.renderizar(fonte_pequena, f"Acertos seguidos: {acertos_consecutivos[0]}", True, COR_TEXTO)
+        acertos2 = cache_texto.renderizar(fonte_pequena, f"Acertos seguidos: {acertos_consecutivos[1]}", True, COR_TEXTO)
         tela.blit(acertos1, (20, 50))
         tela.blit(acertos2, (LARGURA_PIXELS-220, 50))
         
         # NOVA FUNCIONALIDADE: Indica se está na segunda chance
         if segunda_chance:
-            indica_segunda_chance = fonte_pequena.render("SEGUNDA CHANCE", True, COR_SEGUNDA_CHANCE)
+            indica_segunda_chance = cache_texto.renderizar(fonte_pequena, "SEGUNDA CHANCE", True, COR_SEGUNDA_CHANCE)
             tela.blit(indica_segunda_chance, (LARGURA_PIXELS//2 - indica_segunda_chance.get_width()//2, 80))
         
         # Desenha a mensagem atual
         if mensagem:
             cor_msg = COR_SEGUNDA_CHANCE if segunda_chance else COR_MENSAGEM
-            msg = fonte_pequena.render(mensagem, True, cor_msg)
+            msg = cache_texto.renderizar(fonte_pequena, mensagem, True, cor_msg)
             tela.blit(msg, (LARGURA_PIXELS//2 - msg.get_width()//2, ALTURA_PIXELS-40))
 
         # Desenha a equação matemática
@@ -177,7 +177,7 @@ def executar_jogo_pacmath():
             if segunda_chance and not destacar_errado:
                 cor_equacao = COR_SEGUNDA_CHANCE  # Cor diferente para segunda chance
             texto_equacao = f"{numero_a} × {numero_b} = ?" if not destacar_errado else f"{numero_a} × {numero_b} = {valor_correto}"
-            superficie_equacao = fonte_grande.render(texto_equacao, True, cor_equacao)
+            superficie_equacao = cache_texto.renderizar(fonte_grande, texto_equacao, True, cor_equacao)
             tela.blit(superficie_equacao, (LARGURA_PIXELS//2 - superficie_equacao.get_width()//2, ALTURA_PIXELS-150))
 
         # Desenha os botões de alternativas
@@ -203,7 +203,7 @@ def executar_jogo_pacmath():
             pygame.draw.rect(tela, COR_BORDA_BOTAO, retangulo, 2)
             
             # Desenha o texto do botão
-            texto = fonte_normal.render(str(alternativa), True, COR_BORDA_BOTAO)
+            texto = cache_texto.renderizar(fonte_normal, str(alternativa), True, COR_BORDA_BOTAO)
             tela.blit(texto, (x_botao + largura_botao//2 - texto.get_width()//2, y_botao + altura_botao//2 - texto.get_height()//2))
         
         return botoes
@@ -213,11 +213,11 @@ def executar_jogo_pacmath():
         tela.fill(COR_FUNDO)
         
         # Desenha o título de vitória
-        titulo = fonte_grande.render(f"{vencedor} Venceu!", True, COR_TEXTO)
+        titulo = cache_texto.renderizar(fonte_grande, f"{vencedor} Venceu!", True, COR_TEXTO)
         tela.blit(titulo, (LARGURA_PIXELS//2 - titulo.get_width()//2, ALTURA_PIXELS//2 - 100))
         
         # Desenha a mensagem para reiniciar
-        msg_reiniciar = fonte_normal.render("Pressione ESPAÇO para jogar novamente ou ESC para sair", True, COR_TEXTO)
+        msg_reiniciar = cache_texto.renderizar(fonte_normal, "Pressione ESPAÇO para jogar novamente ou ESC para sair", True, COR_TEXTO)
         tela.blit(msg_reiniciar, (LARGURA_PIXELS//2 - msg_reiniciar.get_width()//2, ALTURA_PIXELS//2 - 50))
 
     def nova_pergunta():
@@ -265,23 +265,24 @@ def executar_jogo_pacmath():
             
             # Redesenha o Pacman na nova posição
             pacman_x = posicao_intermediaria * LARGURA_CELULA + LARGURA_CELULA // 2
-            desenhar_pacman(tela, pacman_x, POSICAO_Y_COMIDA, RAIO_PACMAN, virado_esquerda)
+            desenhar_pacman(tela, pacman_x, POSICAO_Y_COMIDA, RAIO_PACMAN, virado_esquerda,
+                            atlas_pacman.quadro_mastigando(passo))
             
             # Redesenha os nomes dos jogadores
-            nome1 = fonte_normal.render("Larissa", True, COR_TEXTO)
-            nome2 = fonte_normal.render("Leticia", True, COR_TEXTO)
+            nome1 = cache_texto.renderizar(fonte_normal, "Larissa", True, COR_TEXTO)
+            nome2 = cache_texto.renderizar(fonte_normal, "Leticia", True, COR_TEXTO)
             tela.blit(nome1, (20, 20))
             tela.blit(nome2, (LARGURA_PIXELS-120, 20))
             
             # Redesenha os contadores
-            acertos1 = fonte_pequena.render(f"Acertos seguidos: {acertos_consecutivos[0]}", True, COR_TEXTO)
-            acertos2 = fonte_pequena.render(f"Acertos seguidos: {acertos_consecutivos[1]}", True, COR_TEXTO)
+            acertos1 = cache_texto.renderizar(fonte_pequena, f"Acertos seguidos: {acertos_consecutivos[0]}", True, COR_TEXTO)
+            acertos2 = cache_texto.renderizar(fonte_pequena, f"Acertos seguidos: {acertos_consecutivos[1]}", True, COR_TEXTO)
             tela.blit(acertos1, (20, 50))
             tela.blit(acertos2, (LARGURA_PIXELS-220, 50))
             
             # Redesenha a mensagem
             if mensagem:
-                msg = fonte_pequena.render(mensagem, True, COR_MENSAGEM)
+                msg = cache_texto.renderizar(fonte_pequena, mensagem, True, COR_MENSAGEM)
                 tela.blit(msg, (LARGURA_PIXELS//2 - msg.get_width()//2, ALTURA_PIXELS-40))
             
             pygame.display.flip()
@@ -292,7 +293,7 @@ def executar_jogo_pacmath():
         for _ in range(12):
             numero_aleatorio_a = random.randint(1, 9)
             numero_aleatorio_b = random.randint(1, 9)
-            superficie_equacao = fonte_grande.render(f"{numero_aleatorio_a} × {numero_aleatorio_b} = ?", True, (180, 180, 180))
+            superficie_equacao = cache_texto.renderizar(fonte_grande, f"{numero_aleatorio_a} × {numero_aleatorio_b} = ?", True, (180, 180, 180))
             
             # Limpa apenas a área da equação
             tela.fill(COR_FUNDO, (0, ALTURA_PIXELS-90, LARGURA_PIXELS, 90))
@@ -451,8 +452,13 @@ def executar_jogo_pacmath():
         
         # Atualiza a tela
         pygame.display.flip()
+        if inicio_execucao is not None:
+            print(f"Primeiro quadro em {1000 * (time.perf_counter() - inicio_execucao):.0f} ms")
+            inicio_execucao = None
         relogio.tick(60)  # limita a 60 FPS
 
+    if os.environ.get("PACMATH_CACHE_TEXTO") == "1":
+        print(cache_texto.relatorio())
     pygame.quit()
 
 if __name__ == "__main__":
@@ -9,52 +9,117 @@ Execução:
     python pacmath_v3.py
 """
 
+import json
+import os
+import platform
 import random
 import pygame
+import sys
 import time
+from types import SimpleNamespace
 
-# ======= Parâmetros do jogo =======
-LARGURA_TABULEIRO = 61           # largura do tabuleiro em células
-CENTRO = LARGURA_TABULEIRO // 2  # posição central do tabuleiro
-JOGADORES = ["Larissa", "Leticia"]
-
-# Níveis de dificuldade com diferentes fatores para multiplicação
-NIVEIS_DIFICULDADE = {
-    "1": [1, 2, 3],                    # Fácil - números pequenos
-    "2": [1, 2, 3, 4, 5, 6],          # Médio - números médios
-    "3": [1, 2, 3, 4, 5, 6, 7, 8, 9], # Difícil - todos os números
-    "4": [7, 8, 9]                     # Especial - apenas números altos
-}
+from adaptativo import SeletorAdaptativo
+from animacao import Agendador, PassoFixo, Tarefa
+from layout import obter_layout
+from fontes import FonteTardia
+from gravacao import LARGURA_MAXIMA, GravadorPartidas
+from historico import HistoricoRespostas
+from jogo_remoto import ErroServidor, JogoRemoto
+from perfil import HistogramaLatencia, Perfilador
+from renderizacao import (RenderizadorSujo, ContadorTempoQuadro, TabuadaEmCache, CacheTexto,
+                          SobreposicaoPerfil, CamadaComida, FundoEmCache, AtlasPacman)
+from regras import JOGADORES, LARGURA_TABULEIRO, ACERTO, ACERTO_SEGUNDA_CHANCE, ERRO, JogoPacMath
 
 # ======= Interface gráfica Pygame =======
-def executar_jogo_pacmath():
-    """Função principal que executa o jogo PacMath"""
+def executar_jogo_pacmath(controlador=None, perfilador=None, jogo=None):
+    """Função principal que executa o jogo PacMath
+
+    controlador: objeto opcional com o método quadro(jogo, sessao), chamado a cada
+        volta do loop antes dos eventos; pode postar eventos com pygame.event.post.
+    perfilador: Perfilador opcional (perfil.py) que mede as funções de desenho.
+    jogo: regras da partida; por padrão um regras.JogoPacMath local, ou um
+        jogo_remoto.JogoRemoto para jogar em um servidor.py.
+    """
+    inicio_execucao = time.perf_counter()  # para medir o tempo até o primeiro quadro
+    primeiro_quadro_ms = None
     pygame.init()
     
     # Configurações da tela
     LARGURA_JOGO = 1400        # largura da área do jogo
     LARGURA_TABUADA = 400      # largura da tabuada quando expandida
     ALTURA_PIXELS = 500        # altura da tela
-    LARGURA_CELULA = LARGURA_JOGO // LARGURA_TABULEIRO  # largura de cada célula
     
     # Variável para controlar se a tabuada está expandida
     tabuada_expandida = False
     
+    # A janela já nasce com o espaço do painel da tabuada: abrir ou fechar o painel
+    # é só desenhar outra camada, sem recriar o display com set_mode
+    janela = pygame.display.set_mode((LARGURA_JOGO + LARGURA_TABUADA, ALTURA_PIXELS), pygame.RESIZABLE)
+    pygame.display.set_caption("PacMath - Edição Pacman")
+    tela = None  # camada do jogo: subsuperfície da janela com a área do jogo
+    
+    def criar_camadas():
+        """Cria a camada do jogo sobre a janela atual (de novo após um VIDEORESIZE)"""
+        nonlocal tela
+        tela = janela.subsurface(pygame.Rect(0, 0, LARGURA_JOGO, ALTURA_PIXELS).clip(janela.get_rect()))
+    
+    criar_camadas()
+    
     # Função para obter largura atual da tela
     def obter_largura_tela():
-        return LARGURA_JOGO + (LARGURA_TABUADA if tabuada_expandida else 0)
+        return janela.get_width()
     
-    tela = pygame.display.set_mode((obter_largura_tela(), ALTURA_PIXELS))
-    pygame.display.set_caption("PacMath - Edição Pacman")
-    
-    # Configuração de fontes para diferentes tamanhos de texto
-    fonte_normal = pygame.font.SysFont("Arial", 28)
-    fonte_pequena = pygame.font.SysFont("Arial", 20)
-    fonte_grande = pygame.font.SysFont("Arial", 36, bold=True)
-    fonte_mini = pygame.font.SysFont("Arial", 14)
-    fonte_tabuada = pygame.font.SysFont("Arial", 16, bold=True)
+    # Configuração de fontes para diferentes tamanhos de texto (carregadas no primeiro uso)
+    fonte_normal = FonteTardia("Arial", 28)
+    fonte_pequena = FonteTardia("Arial", 20)
+    fonte_grande = FonteTardia("Arial", 36, negrito=True)
+    fonte_mini = FonteTardia("Arial", 14)
+    fonte_tabuada = FonteTardia("Arial", 16, negrito=True)
     relogio = pygame.time.Clock()
 
+    # Renderização por regiões: só o que mudou vai para o display
+    renderizador = RenderizadorSujo()
+    contador_quadros = ContadorTempoQuadro()
+    MOSTRAR_TEMPO_QUADRO = os.environ.get("PACMATH_TEMPO_QUADRO") == "1"
+
+    # Textos renderizados são reaproveitados entre quadros e telas
+    cache_texto = CacheTexto()
+
+    # Instrumentação opcional (PACMATH_PERFIL=1 ou =arquivo.json, ou --perfil na linha de comando):
+    # mede as seções de cada quadro, mostra um gráfico por cima do jogo e grava um resumo ao sair
+    ARQUIVO_PERFIL = os.environ.get("PACMATH_PERFIL")
+    if ARQUIVO_PERFIL == "1":
+        ARQUIVO_PERFIL = "pacmath_perfil.json"
+    sobreposicao_perfil = None
+    if ARQUIVO_PERFIL:
+        if perfilador is None:
+            perfilador = Perfilador(limite_amostras=10000)  # sessões longas não crescem sem limite
+        secoes_perfil = ["quadro", "eventos", "display", "desenhar_tela_jogo",
+                         "desenhar_tabuada", "desenhar_botao_tabuada", "desenhar_pacman"]
+        sobreposicao_perfil = SobreposicaoPerfil(perfilador, fonte_mini, (12, 112, 300, 126), secoes_perfil)
+    inicio_sessao = time.perf_counter()
+
+    # Latência percebida: do clique numa alternativa (ou do ENTER) até o primeiro quadro com o
+    # retorno da resposta ("Correto!" ou o destaque em vermelho) chegar ao display; as duas
+    # entradas param no mesmo evento. PACMATH_LATENCIA escolhe o arquivo JSON e "0" desliga
+    ARQUIVO_LATENCIA = os.environ.get("PACMATH_LATENCIA", "pacmath_latencia.json")
+    latencias = None
+    if ARQUIVO_LATENCIA != "0":
+        latencias = {"clique": HistogramaLatencia(), "teclado": HistogramaLatencia()}
+    entrada_pendente = None  # (tipo de entrada, instante) da resposta que ainda não apareceu na tela
+    retorno_visivel = False  # o retorno da resposta pendente já está no estado da tela
+
+    # Cada partida é gravada (semente, nível e respostas) para ser refeita com gravacao.py;
+    # PACMATH_GRAVACOES escolhe a pasta ("gravacoes" por padrão) e "0" desliga a gravação
+    PASTA_GRAVACOES = os.environ.get("PACMATH_GRAVACOES", "gravacoes")
+    gravador = GravadorPartidas.na_pasta(PASTA_GRAVACOES) if PASTA_GRAVACOES != "0" else None
+
+    # Histórico das respostas de cada aluno para os professores (gravado em outra thread);
+    # PACMATH_HISTORICO escolhe o banco SQLite e "0" desliga
+    BANCO_HISTORICO = os.environ.get("PACMATH_HISTORICO", "pacmath_respostas.db")
+    historico = HistoricoRespostas(BANCO_HISTORICO) if BANCO_HISTORICO != "0" else None
+    inicio_pergunta = time.perf_counter()  # quando a pergunta atual apareceu (para a latência)
+
     # Definição de cores usando RGB
     COR_FUNDO = (30, 30, 40)          # azul escuro
     COR_COMIDA = (255, 200, 0)        # amarelo dourado
@@ -70,20 +135,80 @@ def executar_jogo_pacmath():
     COR_TABUADA_HEADER = (100, 100, 120)  # cor dos cabeçalhos
     COR_TABUADA_DESTAQUE = (255, 255, 100)  # amarelo para destacar
 
-    # Configurações visuais do Pacman e comida
+    # Tabuada pré-renderizada (reconstruída só se fontes, cores ou tamanho mudarem)
+    CORES_TABUADA = {
+        "fundo": COR_TABUADA_FUNDO,
+        "cabecalho": COR_TABUADA_HEADER,
+        "texto": COR_TEXTO,
+        "borda": COR_BORDA_BOTAO,
+        "destaque": COR_TABUADA_DESTAQUE,
+    }
+    tabuada_cache = TabuadaEmCache(LARGURA_TABUADA, ALTURA_PIXELS)
+
+    # Modo adaptativo (PACMATH_ADAPTATIVO=1): mais perguntas das contas que cada jogador
+    # erra ou demora; as médias ficam em PACMATH_PESOS entre uma sessão e outra
+    seletor = None
+    if os.environ.get("PACMATH_ADAPTATIVO") == "1":
+        seletor = SeletorAdaptativo(os.environ.get("PACMATH_PESOS", "pacmath_pesos.json"))
+    # PACMATH_TABULEIRO muda o número de células do tabuleiro (partidas mais longas) e
+    # PACMATH_JOGADORES os nomes dos dois jogadores ("Ana,Bruno", partidas do torneio.py)
+    LARGURA_MINIMA_TABULEIRO = 8  # pelo menos uma célula andada por acerto
+    if jogo is None:
+        opcoes_jogo = {}
+        if os.environ.get("PACMATH_TABULEIRO"):
+            largura = int(os.environ["PACMATH_TABULEIRO"])
+            if LARGURA_MINIMA_TABULEIRO <= largura <= LARGURA_MAXIMA:
+                opcoes_jogo["largura_tabuleiro"] = largura
+            else:
+                print(f"PACMATH_TABULEIRO precisa estar entre {LARGURA_MINIMA_TABULEIRO} e {LARGURA_MAXIMA}; "
+                      f"usando {LARGURA_TABULEIRO}")
+        if os.environ.get("PACMATH_JOGADORES"):
+            nomes = [nome.strip() for nome in os.environ["PACMATH_JOGADORES"].split(",")]
+            if len(nomes) == 2 and all(nomes):
+                opcoes_jogo["jogadores"] = nomes
+            else:
+                print(f"PACMATH_JOGADORES precisa de dois nomes separados por vírgula; usando {', '.join(JOGADORES)}")
+        jogo = JogoPacMath(seletor=seletor, **opcoes_jogo)
+
+    # Configurações visuais do Pacman e comida. As células têm uma largura mínima;
+    # tabuleiros que não cabem na tela são vistos por uma câmera que segue o Pacman
+    LARGURA_MINIMA_CELULA = 22
+    LARGURA_CELULA = max(LARGURA_MINIMA_CELULA, LARGURA_JOGO // jogo.largura_tabuleiro)  # largura de cada célula
+    LARGURA_MUNDO = max(LARGURA_JOGO, jogo.largura_tabuleiro * LARGURA_CELULA)  # tabuleiro inteiro em pixels
     RAIO_COMIDA = 6         # raio dos pontinhos de comida
     RAIO_PACMAN = 18        # raio do Pacman
+    DURACAO_MAXIMA_MOVIMENTO_MS = 1200  # duração máxima do movimento após um acerto
+    atlas_pacman = AtlasPacman(RAIO_PACMAN, COR_PACMAN)  # quadros da boca, desenhados no primeiro uso
     POSICAO_Y_COMIDA = ALTURA_PIXELS // 2  # posição vertical da comida
-    POSICOES_COMIDA = [i for i in range(1, LARGURA_TABULEIRO-1)]  # posições horizontais da comida
-    comida_consumida = set()  # conjunto de posições onde a comida foi consumida
+    # Comida pré-desenhada em blocos; só os blocos dentro da câmera são copiados
+    camada_comida = CamadaComida(LARGURA_CELULA, RAIO_COMIDA, COR_COMIDA, COR_FUNDO,
+                                 range(1, jogo.largura_tabuleiro - 1))
+    # Fundo da tela do jogo montado uma vez por partida; só os contadores são repintados nele
+    fundo_jogo = FundoEmCache((LARGURA_JOGO, ALTURA_PIXELS), COR_FUNDO)
+
+    def obter_layout_atual():
+        """Retorna os retângulos da tela para o tamanho atual da janela (em cache)"""
+        return obter_layout(obter_largura_tela(), ALTURA_PIXELS, LARGURA_JOGO)
+
+    def camera_x(posicao):
+        """Deslocamento da câmera com o Pacman na posição (0 se o tabuleiro cabe na tela)"""
+        x = posicao * LARGURA_CELULA + LARGURA_CELULA // 2
+        return max(0, min(LARGURA_MUNDO - LARGURA_JOGO, x - LARGURA_JOGO // 2))
+
+    def retangulo_pacman(posicao):
+        """Retorna a área da tela ocupada pelo Pacman na posição indicada"""
+        x = posicao * LARGURA_CELULA + LARGURA_CELULA // 2 - camera_x(posicao)
+        return pygame.Rect(x - RAIO_PACMAN - 1, POSICAO_Y_COMIDA - RAIO_PACMAN - 1, 2 * RAIO_PACMAN + 2, 2 * RAIO_PACMAN + 2)
+
+    # As regras ficam no JogoPacMath; as variáveis abaixo guardam o que está na tela,
+    # que durante as animações pode estar atrasado em relação às regras
 
     # Variáveis de estado do jogo
-    posicao_bola = CENTRO          # posição atual do Pacman
+    posicao_bola = jogo.centro     # posição atual do Pacman
     executando = True              # controla se o jogo está rodando
     estado_jogo = "dificuldade"    # estados: dificuldade, jogando, fim_jogo
     jogador_atual = 0              # índice do jogador atual (0 ou 1)
     acertos_consecutivos = [0, 0]  # contador de acertos consecutivos para cada jogador
-    fatores = []                   # lista de números para multiplicação
     
     # Variáveis da pergunta atual
     pergunta = ""           # texto da pergunta
@@ -98,9 +223,18 @@ def executar_jogo_pacmath():
     # NOVA VARIÁVEL: Controla se o jogador está na segunda chance
     segunda_chance = False
 
+    # Animações avançadas em passos fixos de tempo de jogo, separados do desenho;
+    # PACMATH_ESCALA_TEMPO acelera (100 em demonstrações, reproduções e testes) ou desacelera
+    passo_fixo = PassoFixo(escala_tempo=float(os.environ.get("PACMATH_ESCALA_TEMPO", "1")))
+    agendador = Agendador()
+    posicao_animada = None            # posição do Pacman durante o movimento (None = parado)
+    pacman_virado_esquerda = False    # direção do Pacman durante o movimento
+    equacao_transicao = None          # (quadro, a, b) mostrados durante a transição
+    destacar_resposta_errada = False  # mostra a resposta correta em vermelho
+
     def obter_botao_tabuada():
         """Retorna o retângulo do botão de tabuada"""
-        return pygame.Rect(LARGURA_JOGO - 80, 20, 60, 30)
+        return obter_layout_atual().botao_tabuada
 
     def desenhar_botao_tabuada():
         """Desenha o botão para expandir/recolher a tabuada"""
@@ -110,168 +244,107 @@ def executar_jogo_pacmath():
         pygame.draw.rect(tela, COR_BORDA_BOTAO, botao, 2)
         
         texto = "<<" if tabuada_expandida else "?"
-        superficie_texto = fonte_normal.render(texto, True, COR_BORDA_BOTAO)
+        superficie_texto = cache_texto.renderizar(fonte_normal, texto, True, COR_BORDA_BOTAO)
         tela.blit(superficie_texto, (botao.x + botao.width//2 - superficie_texto.get_width()//2, 
                                    botao.y + botao.height//2 - superficie_texto.get_height()//2))
 
     def desenhar_tabuada():
-        """Desenha a tabuada de Pitágoras na área expandida"""
+        """Desenha a camada do painel: a tabuada de Pitágoras, ou o fundo se recolhida"""
         if not tabuada_expandida:
+            janela.fill(COR_FUNDO, obter_layout_atual().painel_tabuada)
             return
         
-        # Área da tabuada
-        x_inicio = LARGURA_JOGO
-        largura_tabuada = LARGURA_TABUADA
-        
-        # Fundo da tabuada
-        pygame.draw.rect(tela, COR_TABUADA_FUNDO, (x_inicio, 0, largura_tabuada, ALTURA_PIXELS))
-        
-        # Título
-        titulo = fonte_normal.render("Tabuada de Pitágoras", True, COR_TEXTO)
-        tela.blit(titulo, (x_inicio + 10, 10))
-        
-        # Configurações da tabela
-        margem_x = x_inicio + 20
-        margem_y = 50
-        tamanho_celula = 35
-        
-        # Desenha a tabela 10x10 (0-9)
-        for i in range(10):
-            for j in range(10):
-                x = margem_x + j * tamanho_celula
-                y = margem_y + i * tamanho_celula
-                
-                # Retângulo da célula
-                retangulo = pygame.Rect(x, y, tamanho_celula, tamanho_celula)
-                
-                # Cor da célula
-                if i == 0 or j == 0:
-                    # Cabeçalho
-                    cor_celula = COR_TABUADA_HEADER
-                    cor_texto = COR_TEXTO
-                    if i == 0 and j == 0:
-                        texto = "×"
-                    elif i == 0:
-                        texto = str(j)
-                    else:
-                        texto = str(i)
-                else:
-                    # Célula de resultado
-                    resultado = i * j
-                    cor_celula = COR_TABUADA_FUNDO
-                    cor_texto = COR_TEXTO
-                    
-                    # Destaca se for a multiplicação atual
-                    if estado_jogo == "jogando" and ((i == numero_a and j == numero_b) or (i == numero_b and j == numero_a)):
-                        cor_celula = COR_TABUADA_DESTAQUE
-                        cor_texto = COR_BORDA_BOTAO
-                    
-                    texto = str(resultado)
-                
-                # Desenha a célula
-                pygame.draw.rect(tela, cor_celula, retangulo)
-                pygame.draw.rect(tela, COR_BORDA_BOTAO, retangulo, 1)
-                
-                # Desenha o texto
-                superficie_texto = fonte_tabuada.render(texto, True, cor_texto)
-                texto_x = x + tamanho_celula//2 - superficie_texto.get_width()//2
-                texto_y = y + tamanho_celula//2 - superficie_texto.get_height()//2
-                tela.blit(superficie_texto, (texto_x, texto_y))
+        # A tabela vem pronta do cache; só as células da conta atual são destacadas
+        destaque = (numero_a, numero_b) if estado_jogo == "jogando" else None
+        tabuada_cache.desenhar(janela, LARGURA_JOGO, fonte_normal, fonte_tabuada, CORES_TABUADA, destaque)
 
     def tela_escolher_dificuldade():
         """Desenha a tela de seleção de dificuldade e retorna os botões"""
         tela.fill(COR_FUNDO)
         
         # Desenha o título
-        titulo = fonte_grande.render("PacMath - Escolha a Dificuldade", True, COR_TEXTO)
+        titulo = cache_texto.renderizar(fonte_grande, "PacMath - Escolha a Dificuldade", True, COR_TEXTO)
         tela.blit(titulo, (LARGURA_JOGO//2 - titulo.get_width()//2, 50))
         
-        # Lista de opções de dificuldade
-        opcoes = [
-            "1 - Fácil (1, 2, 3)",
-            "2 - Médio (1 a 6)", 
-            "3 - Difícil (1 a 9)",
-            "4 - Especial (7, 8, 9)"
-        ]
-        
-        # Cria os botões para cada opção
+        # Desenha os botões de cada opção nas posições do layout
         botoes = []
-        for i, opcao in enumerate(opcoes):
-            y = 150 + i * 60  # posição vertical de cada botão
-            retangulo = pygame.Rect(LARGURA_JOGO//2 - 200, y, 400, 50)
-            botoes.append((retangulo, str(i+1)))
+        for retangulo, nivel, opcao in obter_layout_atual().botoes_dificuldade:
+            botoes.append((retangulo, nivel))
             
             # Desenha o botão
             pygame.draw.rect(tela, COR_BOTAO, retangulo)
             pygame.draw.rect(tela, COR_BORDA_BOTAO, retangulo, 2)
             
             # Desenha o texto do botão
-            texto = fonte_normal.render(opcao, True, COR_BORDA_BOTAO)
+            texto = cache_texto.renderizar(fonte_normal, opcao, True, COR_BORDA_BOTAO)
             tela.blit(texto, (retangulo.x + 10, retangulo.y + 15))
         
         # Desenha o botão da tabuada mesmo na tela de dificuldade
         desenhar_botao_tabuada()
-        desenhar_tabuada()
         
         return botoes
 
-    def desenhar_pacman(superficie, x, y, raio, virado_esquerda):
-        """Desenha o Pacman na posição especificada"""
-        # Desenha o corpo circular do Pacman
-        pygame.draw.circle(superficie, COR_PACMAN, (x, y), raio)
+    def desenhar_pacman(superficie, x, y, raio, virado_esquerda, quadro=None):
+        """Desenha o Pacman na posição especificada (quadro: abertura da boca, None = toda aberta)"""
+        atlas_pacman.desenhar(superficie, x, y, virado_esquerda, quadro)
+
+    def desenhar_partes_fixas(superficie):
+        """Desenha no fundo o que não muda durante a partida: nomes e paredes"""
+        for nome, posicao in zip(jogo.jogadores, obter_layout_atual().nome_jogador):
+            superficie.blit(cache_texto.renderizar(fonte_normal, nome, True, COR_TEXTO), posicao)
+        
+        # Com o tabuleiro inteiro na tela as paredes não se movem
+        if LARGURA_MUNDO == LARGURA_JOGO:
+            pygame.draw.rect(superficie, COR_PAREDE, (0, POSICAO_Y_COMIDA - 40, 10, 80))
+            pygame.draw.rect(superficie, COR_PAREDE, (LARGURA_JOGO - 10, POSICAO_Y_COMIDA - 40, 10, 80))
+
+    def desenhar_fundo_jogo():
+        """Copia o fundo da partida para a tela, repintando antes os contadores que mudaram"""
+        if fundo_jogo.superficie is None:
+            fundo_jogo.construir(desenhar_partes_fixas)
+        for indice, posicao in enumerate(obter_layout_atual().acertos_jogador):
+            acertos = cache_texto.renderizar(fonte_pequena, f"Acertos seguidos: {acertos_consecutivos[indice]}", True, COR_TEXTO)
+            fundo_jogo.escrever(f"acertos{indice + 1}", acertos, posicao)
+        fundo_jogo.desenhar(tela)
+
+    def desenhar_tabuleiro(posicao, virado_esquerda, quadro=None):
+        """Desenha a parte visível do tabuleiro: comida, paredes e o Pacman (quadro da boca opcional)"""
+        camera = camera_x(posicao)
         
-        # Desenha a boca do Pacman (triângulo)
-        pontos_boca = [
-            (x, y),  # centro
-            (x + (raio if not virado_esquerda else -raio), y - int(raio * 0.5)),  # ponto superior
-            (x + (raio if not virado_esquerda else -raio), y + int(raio * 0.5))   # ponto inferior
-        ]
-        pygame.draw.polygon(superficie, COR_FUNDO, pontos_boca)
+        # Copia só os blocos de comida dentro da câmera (sem a comida embaixo do Pacman)
+        camada_comida.desenhar(tela, POSICAO_Y_COMIDA, camera, LARGURA_JOGO, esconder=posicao)
+        
+        # Paredes nas pontas de um tabuleiro maior que a tela (fora da câmera o pygame recorta)
+        if LARGURA_MUNDO > LARGURA_JOGO:
+            pygame.draw.rect(tela, COR_PAREDE, (-camera, POSICAO_Y_COMIDA - 40, 10, 80))
+            pygame.draw.rect(tela, COR_PAREDE, (LARGURA_MUNDO - 10 - camera, POSICAO_Y_COMIDA - 40, 10, 80))
+        
+        # Desenha o Pacman na posição indicada
+        pacman_x = posicao * LARGURA_CELULA + LARGURA_CELULA // 2 - camera
+        desenhar_pacman(tela, pacman_x, POSICAO_Y_COMIDA, RAIO_PACMAN, virado_esquerda, quadro)
 
     def desenhar_tela_jogo(mostrar_equacao=True, destacar_errado=False, valor_correto=None):
         """Desenha a tela principal do jogo"""
-        tela.fill(COR_FUNDO)
+        # Fundo, nomes e contadores de acertos vêm prontos do fundo em cache
+        desenhar_fundo_jogo()
+        layout = obter_layout_atual()
         
-        # Desenha os pontinhos de comida
-        for i in POSICOES_COMIDA:
-            if i not in comida_consumida and i != posicao_bola:
-                x = i * LARGURA_CELULA + LARGURA_CELULA // 2
-                pygame.draw.circle(tela, COR_COMIDA, (x, POSICAO_Y_COMIDA), RAIO_COMIDA)
-        
-        # Desenha as paredes laterais
-        pygame.draw.rect(tela, COR_PAREDE, (0, POSICAO_Y_COMIDA - 40, 10, 80))
-        pygame.draw.rect(tela, COR_PAREDE, (LARGURA_JOGO - 10, POSICAO_Y_COMIDA - 40, 10, 80))
-        
-        # Desenha o Pacman na posição atual
-        pacman_x = posicao_bola * LARGURA_CELULA + LARGURA_CELULA // 2
-        virado_esquerda = jogador_atual == 1  # Leticia vira para esquerda
-        desenhar_pacman(tela, pacman_x, POSICAO_Y_COMIDA, RAIO_PACMAN, virado_esquerda)
-        
-        # Desenha os nomes dos jogadores
-        nome1 = fonte_normal.render("Larissa", True, COR_TEXTO)
-        nome2 = fonte_normal.render("Leticia", True, COR_TEXTO)
-        tela.blit(nome1, (20, 20))
-        tela.blit(nome2, (LARGURA_JOGO-220, 20))
-        
-        # Desenha os contadores de acertos
-        acertos1 = fonte_pequena.render(f"Acertos seguidos: {acertos_consecutivos[0]}", True, COR_TEXTO)
-        acertos2 = fonte_pequena.render(f"Acertos seguidos: {acertos_consecutivos[1]}", True, COR_TEXTO)
-        tela.blit(acertos1, (20, 50))
-        tela.blit(acertos2, (LARGURA_JOGO-320, 50))
+        # Desenha a comida e o Pacman na posição atual
+        desenhar_tabuleiro(posicao_bola, jogador_atual == 1)  # o segundo jogador vira para esquerda
         
         # Desenha o botão da tabuada
         desenhar_botao_tabuada()
         
         # NOVA FUNCIONALIDADE: Indica se está na segunda chance
         if segunda_chance:
-            indica_segunda_chance = fonte_pequena.render("SEGUNDA CHANCE", True, COR_SEGUNDA_CHANCE)
-            tela.blit(indica_segunda_chance, (LARGURA_JOGO//2 - indica_segunda_chance.get_width()//2, 80))
+            indica_segunda_chance = cache_texto.renderizar(fonte_pequena, "SEGUNDA CHANCE", True, COR_SEGUNDA_CHANCE)
+            tela.blit(indica_segunda_chance, (LARGURA_JOGO//2 - indica_segunda_chance.get_width()//2, layout.y_segunda_chance))
         
         # Desenha a mensagem atual
         if mensagem:
             cor_msg = COR_SEGUNDA_CHANCE if segunda_chance else COR_MENSAGEM
-            msg = fonte_pequena.render(mensagem, True, cor_msg)
-            tela.blit(msg, (LARGURA_JOGO//2 - msg.get_width()//2, ALTURA_PIXELS-40))
+            msg = cache_texto.renderizar(fonte_pequena, mensagem, True, cor_msg)
+            tela.blit(msg, (LARGURA_JOGO//2 - msg.get_width()//2, layout.y_mensagem))
 
         # Desenha a equação matemática
         if mostrar_equacao:
@@ -279,20 +352,14 @@ def executar_jogo_pacmath():
             if segunda_chance and not destacar_errado:
                 cor_equacao = COR_SEGUNDA_CHANCE  # Cor diferente para segunda chance
             texto_equacao = f"{numero_a} × {numero_b} = ?" if not destacar_errado else f"{numero_a} × {numero_b} = {valor_correto}"
-            superficie_equacao = fonte_grande.render(texto_equacao, True, cor_equacao)
-            tela.blit(superficie_equacao, (LARGURA_JOGO//2 - superficie_equacao.get_width()//2, ALTURA_PIXELS-150))
+            superficie_equacao = cache_texto.renderizar(fonte_grande, texto_equacao, True, cor_equacao)
+            tela.blit(superficie_equacao, (LARGURA_JOGO//2 - superficie_equacao.get_width()//2, layout.y_equacao))
 
         # Desenha os botões de alternativas
-        y_botao = ALTURA_PIXELS - 200
-        largura_botao = 120
-        altura_botao = 40
-        espaco_botao = 20
-        botoes = []
+        botoes = layout.botoes_alternativas
         
         for idx, alternativa in enumerate(alternativas):
-            x_botao = LARGURA_JOGO//2 - (len(alternativas) * largura_botao + (len(alternativas)-1) * espaco_botao) // 2 + idx * (largura_botao + espaco_botao)
-            retangulo = pygame.Rect(x_botao, y_botao, largura_botao, altura_botao)
-            botoes.append(retangulo)
+            retangulo = botoes[idx]
             
             # Escolhe a cor do botão (verde se selecionado, laranja se segunda chance)
             if alternativa_selecionada == idx:
@@ -305,11 +372,8 @@ def executar_jogo_pacmath():
             pygame.draw.rect(tela, COR_BORDA_BOTAO, retangulo, 2)
             
             # Desenha o texto do botão
-            texto = fonte_normal.render(str(alternativa), True, COR_BORDA_BOTAO)
-            tela.blit(texto, (x_botao + largura_botao//2 - texto.get_width()//2, y_botao + altura_botao//2 - texto.get_height()//2))
-        
-        # Desenha a tabuada se expandida
-        desenhar_tabuada()
+            texto = cache_texto.renderizar(fonte_normal, str(alternativa), True, COR_BORDA_BOTAO)
+            tela.blit(texto, (retangulo.centerx - texto.get_width()//2, retangulo.centery - texto.get_height()//2))
         
         return botoes
 
@@ -318,275 +382,470 @@ def executar_jogo_pacmath():
         tela.fill(COR_FUNDO)
         
         # Desenha o título de vitória
-        titulo = fonte_grande.render(f"{vencedor} Venceu!", True, COR_TEXTO)
+        titulo = cache_texto.renderizar(fonte_grande, f"{vencedor} Venceu!", True, COR_TEXTO)
         tela.blit(titulo, (LARGURA_JOGO//2 - titulo.get_width()//2, ALTURA_PIXELS//2 - 100))
         
         # Desenha a mensagem para reiniciar
-        msg_reiniciar = fonte_normal.render("Pressione ESPAÇO para jogar novamente ou ESC para sair", True, COR_TEXTO)
+        msg_reiniciar = cache_texto.renderizar(fonte_normal, "Pressione ESPAÇO para jogar novamente ou ESC para sair", True, COR_TEXTO)
         tela.blit(msg_reiniciar, (LARGURA_JOGO//2 - msg_reiniciar.get_width()//2, ALTURA_PIXELS//2 - 50))
         
         # Desenha o botão da tabuada
         desenhar_botao_tabuada()
-        desenhar_tabuada()
 
-    def nova_pergunta():
-        """Gera uma nova pergunta de multiplicação"""
-        nonlocal numero_a, numero_b, pergunta, resposta_correta, alternativas, alternativa_selecionada, segunda_chance
+    def sincronizar_pergunta():
+        """Mostra a pergunta atual das regras na tela"""
+        nonlocal numero_a, numero_b, pergunta, resposta_correta, alternativas, alternativa_selecionada, segunda_chance, jogador_atual
+        nonlocal inicio_pergunta
+        inicio_pergunta = time.perf_counter()
+        numero_a, numero_b = jogo.numero_a, jogo.numero_b
+        resposta_correta = jogo.resposta_correta
+        pergunta = jogo.pergunta
+        alternativas = list(jogo.alternativas)
+        alternativa_selecionada = None
+        segunda_chance = jogo.segunda_chance
+        jogador_atual = jogo.jogador_atual
+
+    def desenhar_movimento_pacman(posicao_intermediaria, virado_esquerda):
+        """Desenha um quadro da animação de movimento do Pacman"""
+        # Um blit só traz o fundo, os nomes e os contadores
+        desenhar_fundo_jogo()
         
-        # Escolhe dois números aleatórios dos fatores disponíveis
-        numero_a = random.choice(fatores)
-        numero_b = random.choice(fatores)
-        resposta_correta = numero_a * numero_b
-        pergunta = f"{JOGADORES[jogador_atual]}, quanto é {numero_a} × {numero_b}?"
+        # Redesenha a comida e o Pacman na nova posição, mastigando a cada passo
+        quadro = atlas_pacman.quadro_mastigando(abs(posicao_intermediaria - posicao_bola))
+        desenhar_tabuleiro(posicao_intermediaria, virado_esquerda, quadro)
         
-        # Gera alternativas incorretas
-        resposta_errada1 = resposta_correta + random.choice([i for i in range(-10, 11) if i != 0 and resposta_correta + i > 0])
-        resposta_errada2 = resposta_correta + random.choice([i for i in range(-20, 21) if i != 0 and resposta_correta + i > 0 and resposta_correta + i != resposta_errada1])
+        # Redesenha o botão da tabuada
+        desenhar_botao_tabuada()
         
-        # Mistura as alternativas
-        alternativas = [resposta_correta, resposta_errada1, resposta_errada2]
-        random.shuffle(alternativas)
-        alternativa_selecionada = None
-        segunda_chance = False  # Reset da segunda chance para nova pergunta
+        # Redesenha a mensagem
+        if mensagem:
+            msg = cache_texto.renderizar(fonte_pequena, mensagem, True, COR_MENSAGEM)
+            tela.blit(msg, (LARGURA_JOGO//2 - msg.get_width()//2, obter_layout_atual().y_mensagem))
 
-    def animar_movimento_pacman(posicao_inicial, posicao_final, virado_esquerda):
-        """Anima o movimento do Pacman da posição inicial para a final"""
+    def desenhar_transicao_equacao():
+        """Desenha os números aleatórios da transição por cima da linha de mensagem"""
+        _, numero_aleatorio_a, numero_aleatorio_b = equacao_transicao
+        superficie_equacao = cache_texto.renderizar(fonte_grande, f"{numero_aleatorio_a} × {numero_aleatorio_b} = ?", True, (180, 180, 180))
+        
+        # Limpa apenas a área da equação
+        tela.fill(COR_FUNDO, (0, ALTURA_PIXELS-90, LARGURA_JOGO, 90))
+        tela.blit(superficie_equacao, (LARGURA_JOGO//2 - superficie_equacao.get_width()//2, ALTURA_PIXELS-80))
+
+    def animar_movimento_pacman(posicao_inicial, posicao_final, virado_esquerda, ao_terminar):
+        """Agenda a animação do Pacman da posição inicial para a final
+
+        40 ms por passo, até DURACAO_MAXIMA_MOVIMENTO_MS: nos tabuleiros grandes o
+        Pacman anda mais células por quadro em vez de travar a entrada por segundos.
+        """
+        nonlocal posicao_animada, pacman_virado_esquerda
         passos = abs(posicao_final - posicao_inicial)
-        if passos == 0:
-            return
-            
         direcao = 1 if posicao_final > posicao_inicial else -1
+        pacman_virado_esquerda = virado_esquerda
         
-        # Anima passo a passo
-        for passo in range(1, passos + 1):
-            posicao_intermediaria = posicao_inicial + direcao * passo
-            tela.fill(COR_FUNDO)
-            
-            # Redesenha a comida
-            for i in POSICOES_COMIDA:
-                if i not in comida_consumida and i != posicao_intermediaria:
-                    x = i * LARGURA_CELULA + LARGURA_CELULA // 2
-                    pygame.draw.circle(tela, COR_COMIDA, (x, POSICAO_Y_COMIDA), RAIO_COMIDA)
-            
-            # Redesenha as paredes
-            pygame.draw.rect(tela, COR_PAREDE, (0, POSICAO_Y_COMIDA - 40, 10, 80))
-            pygame.draw.rect(tela, COR_PAREDE, (LARGURA_JOGO - 10, POSICAO_Y_COMIDA - 40, 10, 80))
-            
-            # Redesenha o Pacman na nova posição
-            pacman_x = posicao_intermediaria * LARGURA_CELULA + LARGURA_CELULA // 2
-            desenhar_pacman(tela, pacman_x, POSICAO_Y_COMIDA, RAIO_PACMAN, virado_esquerda)
-            
-            # Redesenha os nomes dos jogadores
-            nome1 = fonte_normal.render("Larissa", True, COR_TEXTO)
-            nome2 = fonte_normal.render("Leticia", True, COR_TEXTO)
-            tela.blit(nome1, (20, 20))
-            tela.blit(nome2, (LARGURA_JOGO-220, 20))
-            
-            # Redesenha os contadores
-            acertos1 = fonte_pequena.render(f"Acertos seguidos: {acertos_consecutivos[0]}", True, COR_TEXTO)
-            acertos2 = fonte_pequena.render(f"Acertos seguidos: {acertos_consecutivos[1]}", True, COR_TEXTO)
-            tela.blit(acertos1, (20, 50))
-            tela.blit(acertos2, (LARGURA_JOGO-320, 50))
-            
-            # Redesenha o botão da tabuada
-            desenhar_botao_tabuada()
-            
-            # Redesenha a mensagem
-            if mensagem:
-                msg = fonte_pequena.render(mensagem, True, COR_MENSAGEM)
-                tela.blit(msg, (LARGURA_JOGO//2 - msg.get_width()//2, ALTURA_PIXELS-40))
-            
-            # Redesenha a tabuada se expandida
-            desenhar_tabuada()
-            
-            pygame.display.flip()
-            pygame.time.delay(40)  # pausa entre frames para suavizar a animação
-
-    def animar_transicao_equacao():
-        """Anima a transição mostrando números aleatórios antes da equação real"""
-        for _ in range(12):
-            numero_aleatorio_a = random.randint(1, 9)
-            numero_aleatorio_b = random.randint(1, 9)
-            superficie_equacao = fonte_grande.render(f"{numero_aleatorio_a} × {numero_aleatorio_b} = ?", True, (180, 180, 180))
-            
-            # Limpa apenas a área da equação
-            tela.fill(COR_FUNDO, (0, ALTURA_PIXELS-90, LARGURA_JOGO, 90))
-            tela.blit(superficie_equacao, (LARGURA_JOGO//2 - superficie_equacao.get_width()//2, ALTURA_PIXELS-80))
-            
-            # Redesenha a tabuada se expandida
-            desenhar_tabuada()
-            
-            pygame.display.flip()
-            pygame.time.delay(40)
+        def atualizar(progresso):
+            nonlocal posicao_animada
+            passo = min(passos, 1 + int(progresso * passos))
+            posicao_animada = posicao_inicial + direcao * passo
+        
+        if passos == 0:
+            posicao_animada = posicao_inicial
+            ao_terminar()
+            return
+        agendador.agendar(Tarefa(min(passos * 40, DURACAO_MAXIMA_MOVIMENTO_MS), ao_atualizar=atualizar, ao_terminar=ao_terminar))
 
-    def processar_resposta(resposta):
-        """Processa a resposta do jogador e atualiza o estado do jogo"""
-        nonlocal jogador_atual, vencedor, estado_jogo, mensagem, posicao_bola, alternativa_selecionada, segunda_chance
-        
-        if resposta == resposta_correta:
-            # ===== RESPOSTA CORRETA =====
-            if not segunda_chance:
-                # PRIMEIRA TENTATIVA CORRETA - Pacman se move
-                acertos_consecutivos[jogador_atual] += 1
-                mensagem = f"Correto! ({acertos_consecutivos[jogador_atual]}/4)"
-                
-                # Calcula quantos passos o Pacman deve se mover
-                passos = (LARGURA_TABULEIRO // 2) // 4
-                
-                if jogador_atual == 0:  # Larissa se move para direita
-                    nova_posicao = min(LARGURA_TABULEIRO - 1, posicao_bola + passos)
-                    animar_movimento_pacman(posicao_bola, nova_posicao, virado_esquerda=False)
-                    posicao_bola = nova_posicao
-                else:  # Leticia se move para esquerda
-                    nova_posicao = max(0, posicao_bola - passos)
-                    animar_movimento_pacman(posicao_bola, nova_posicao, virado_esquerda=True)
-                    posicao_bola = nova_posicao
-                
-                # Verifica condição de vitória
-                if acertos_consecutivos[jogador_atual] >= 4 or posicao_bola <= 0 or posicao_bola >= LARGURA_TABULEIRO - 1:
-                    vencedor = JOGADORES[jogador_atual]
-                    estado_jogo = "fim_jogo"
-                    posicao_bola = 0 if jogador_atual == 1 else LARGURA_TABULEIRO - 1
-                else:
-                    # Muda para o próximo jogador
-                    jogador_atual = 1 - jogador_atual
-                    animar_transicao_equacao()
-                    nova_pergunta()
-                    mensagem = pergunta
-            else:
-                # SEGUNDA CHANCE CORRETA - Pacman NÃO se move
-                mensagem = f"Correto na segunda chance! Pacman não se move. ({acertos_consecutivos[jogador_atual]}/4)"
-                # Muda para o próximo jogador
-                jogador_atual = 1 - jogador_atual
-                animar_transicao_equacao()
-                nova_pergunta()
-                mensagem = pergunta
+    def animar_transicao_equacao(ao_terminar):
+        """Agenda a transição mostrando números aleatórios antes da equação real"""
+        def atualizar(progresso):
+            nonlocal equacao_transicao
+            # Troca os números a cada 40 ms, como nos 12 quadros originais
+            quadro = min(11, int(progresso * 12))
+            if equacao_transicao is None or equacao_transicao[0] != quadro:
+                equacao_transicao = (quadro, random.randint(1, 9), random.randint(1, 9))
+        
+        def terminar():
+            nonlocal equacao_transicao
+            equacao_transicao = None
+            ao_terminar()
+        
+        agendador.agendar(Tarefa(12 * 40, ao_atualizar=atualizar, ao_terminar=terminar))
+
+    def mostrar_resposta_errada(ao_terminar):
+        """Agenda o destaque em vermelho da resposta correta (15 quadros de 30 ms)"""
+        def iniciar():
+            nonlocal destacar_resposta_errada, retorno_visivel
+            destacar_resposta_errada = True
+            retorno_visivel = True
+        
+        def terminar():
+            nonlocal destacar_resposta_errada
+            destacar_resposta_errada = False
+            ao_terminar()
+        
+        agendador.agendar(Tarefa(15 * 30, ao_iniciar=iniciar, ao_terminar=terminar))
+
+    def apresentar_nova_pergunta():
+        """Termina a transição e mostra a pergunta do próximo jogador"""
+        nonlocal mensagem, posicao_animada
+        posicao_animada = None
+        sincronizar_pergunta()
+        mensagem = pergunta
+
+    def passar_vez():
+        """Muda para o próximo jogador com a animação de transição"""
+        nonlocal jogador_atual
+        jogador_atual = jogo.jogador_atual
+        animar_transicao_equacao(ao_terminar=apresentar_nova_pergunta)
+
+    def concluir_movimento():
+        """Atualiza a posição ao fim do movimento e mostra a vitória, se houver"""
+        nonlocal posicao_bola, vencedor, estado_jogo, posicao_animada
+        posicao_bola = jogo.posicao
+        
+        if jogo.estado == "fim_jogo":
+            vencedor = jogo.vencedor
+            estado_jogo = "fim_jogo"
+            posicao_animada = None
         else:
-            # ===== RESPOSTA INCORRETA =====
-            if not segunda_chance:
-                # PRIMEIRA TENTATIVA INCORRETA - Dá segunda chance
-                # Mostra a resposta correta destacada em vermelho
-                for _ in range(15):
-                    desenhar_tela_jogo(mostrar_equacao=True, destacar_errado=True, valor_correto=resposta_correta)
-                    pygame.display.flip()
-                    pygame.time.delay(30)
-                
+            # Muda para o próximo jogador (o Pacman fica parado até a nova pergunta)
+            passar_vez()
+
+    def processar_resposta(resposta):
+        """Aplica a resposta às regras e agenda as animações de retorno"""
+        nonlocal mensagem, acertos_consecutivos, retorno_visivel
+        latencia_ms = 1000 * (time.perf_counter() - inicio_pergunta)
+        if gravador is not None:
+            gravador.registrar_resposta(resposta, jogo.segunda_chance, jogo.numero_a, jogo.numero_b)
+        if historico is not None:
+            historico.registrar(jogo.jogadores[jogo.jogador_atual], jogo.numero_a, jogo.numero_b, resposta,
+                                resposta == jogo.resposta_correta, jogo.segunda_chance, latencia_ms)
+        if seletor is not None and not jogo.segunda_chance:
+            seletor.registrar(jogo.jogadores[jogo.jogador_atual], jogo.numero_a, jogo.numero_b,
+                              resposta == jogo.resposta_correta, latencia_ms)
+        resultado = jogo.passo(resposta)
+        
+        if resultado.tipo == ACERTO:
+            # PRIMEIRA TENTATIVA CORRETA - Pacman se move
+            acertos_consecutivos = list(jogo.acertos_consecutivos)
+            mensagem = f"Correto! ({acertos_consecutivos[resultado.jogador]}/4)"
+            retorno_visivel = True
+            animar_movimento_pacman(resultado.posicao_inicial, resultado.posicao_final,
+                                    virado_esquerda=resultado.jogador == 1, ao_terminar=concluir_movimento)
+        
+        elif resultado.tipo == ACERTO_SEGUNDA_CHANCE:
+            # SEGUNDA CHANCE CORRETA - Pacman NÃO se move
+            mensagem = f"Correto na segunda chance! Pacman não se move. ({acertos_consecutivos[resultado.jogador]}/4)"
+            retorno_visivel = True
+            # Muda para o próximo jogador
+            passar_vez()
+        
+        elif resultado.tipo == ERRO:
+            # PRIMEIRA TENTATIVA INCORRETA - Dá segunda chance
+            def dar_segunda_chance():
+                nonlocal segunda_chance, mensagem, inicio_pergunta
                 segunda_chance = True
-                mensagem = f"Errado! A resposta era {resposta_correta}. Segunda chance!"
+                inicio_pergunta = time.perf_counter()  # a segunda tentativa conta a partir daqui
+                mensagem = f"Errado! A resposta era {resultado.resposta_correta}. Segunda chance!"
                 # Não zera acertos consecutivos ainda, não muda jogador
-            else:
-                # SEGUNDA TENTATIVA INCORRETA - Perde a vez
-                # Mostra a resposta correta destacada em vermelho
-                for _ in range(15):
-                    desenhar_tela_jogo(mostrar_equacao=True, destacar_errado=True, valor_correto=resposta_correta)
-                    pygame.display.flip()
-                    pygame.time.delay(30)
-                
-                mensagem = f"Errado novamente! A resposta era {resposta_correta}. Perdeu a vez!"
-                acertos_consecutivos[jogador_atual] = 0  # Zera os acertos consecutivos
+            
+            # Mostra a resposta correta destacada em vermelho
+            mostrar_resposta_errada(ao_terminar=dar_segunda_chance)
+        
+        else:
+            # SEGUNDA TENTATIVA INCORRETA - Perde a vez
+            def perder_vez():
+                nonlocal segunda_chance, mensagem, acertos_consecutivos
+                mensagem = f"Errado novamente! A resposta era {resultado.resposta_correta}. Perdeu a vez!"
+                acertos_consecutivos = list(jogo.acertos_consecutivos)  # acertos zerados
                 segunda_chance = False
                 # Muda para o próximo jogador
-                jogador_atual = 1 - jogador_atual
-                animar_transicao_equacao()
-                nova_pergunta()
-                mensagem = pergunta
+                passar_vez()
+            
+            # Mostra a resposta correta destacada em vermelho
+            mostrar_resposta_errada(ao_terminar=perder_vez)
 
     def reiniciar_jogo():
         """Reinicia o jogo para o estado inicial"""
         nonlocal posicao_bola, jogador_atual, acertos_consecutivos, estado_jogo, vencedor, texto_usuario, alternativa_selecionada, segunda_chance
-        posicao_bola = CENTRO
-        jogador_atual = 0
-        acertos_consecutivos = [0, 0]
-        estado_jogo = "dificuldade"
+        jogo.reiniciar()
+        posicao_bola = jogo.posicao
+        jogador_atual = jogo.jogador_atual
+        acertos_consecutivos = list(jogo.acertos_consecutivos)
+        estado_jogo = jogo.estado
         vencedor = None
         texto_usuario = ""
         alternativa_selecionada = None
         segunda_chance = False
-        comida_consumida.clear()
+        fundo_jogo.invalidar()
+        cancelar_animacoes()
+
+    def cancelar_animacoes():
+        """Interrompe as animações em andamento e volta à tela normal"""
+        nonlocal posicao_animada, equacao_transicao, destacar_resposta_errada
+        agendador.limpar()
+        posicao_animada = None
+        equacao_transicao = None
+        destacar_resposta_errada = False
 
     def alternar_tabuada():
         """Alterna entre expandir e recolher a tabuada"""
         nonlocal tabuada_expandida
         tabuada_expandida = not tabuada_expandida
-        # Redimensiona a tela
-        pygame.display.set_mode((obter_largura_tela(), ALTURA_PIXELS))
+        # Só o botão e o painel mudam; marcar_regioes_alteradas marca os dois
+
+    def marcar_regioes_alteradas():
+        """Compara o estado atual com o do último quadro e marca as regiões que mudaram"""
+        layout = obter_layout_atual()
+        
+        # O painel da tabuada e o botão "?" são independentes do resto da tela
+        destaque = (numero_a, numero_b) if estado_jogo == "jogando" else None
+        renderizador.comparar("tabuada", layout.painel_tabuada, (tabuada_expandida, destaque))
+        renderizador.comparar("botao_tabuada", layout.botao_tabuada, tabuada_expandida)
+        
+        if estado_jogo != "jogando":
+            # Telas de dificuldade e fim de jogo só mudam por completo
+            if renderizador.comparar("tela", tela.get_rect(), (estado_jogo, vencedor)):
+                renderizador.invalidar_tudo()
+            return
+        
+        # O quadro da animação de movimento não tem equação nem alternativas
+        movendo = posicao_animada is not None
+        if renderizador.comparar("tela", tela.get_rect(), (estado_jogo, movendo)):
+            renderizador.invalidar_tudo()
+        renderizador.comparar("topo", layout.regiao_topo, (tuple(acertos_consecutivos), segunda_chance))
+        posicao = posicao_animada if movendo else posicao_bola
+        if movendo:
+            renderizador.comparar("pacman", retangulo_pacman(posicao_animada), pacman_virado_esquerda)
+        else:
+            renderizador.comparar("pacman", retangulo_pacman(posicao_bola), jogador_atual)
+        # Quando a câmera anda, a fileira inteira muda
+        faixa_tabuleiro = pygame.Rect(0, POSICAO_Y_COMIDA - 40, LARGURA_JOGO, 80)
+        renderizador.comparar("tabuleiro", faixa_tabuleiro, camera_x(posicao))
+        renderizador.comparar("equacao", layout.regiao_equacao, (numero_a, numero_b, segunda_chance, destacar_resposta_errada))
+        renderizador.comparar("mensagem", layout.regiao_mensagem, (mensagem, segunda_chance, equacao_transicao))
+        renderizador.comparar("alternativas", layout.regiao_alternativas, (tuple(alternativas), alternativa_selecionada, segunda_chance))
 
-    # Inicialização do jogo
-    fatores = [1, 2, 3, 4, 5, 6]  # Médio por padrão
-    nova_pergunta()
+    # Inicialização do jogo (as regras começam no nível Médio)
+    sincronizar_pergunta()
     mensagem = pergunta
 
+    # Mede as funções de desenho quando há um perfilador
+    if perfilador is not None:
+        tela_escolher_dificuldade = perfilador.envolver("tela_escolher_dificuldade", tela_escolher_dificuldade)
+        desenhar_tela_jogo = perfilador.envolver("desenhar_tela_jogo", desenhar_tela_jogo)
+        desenhar_movimento_pacman = perfilador.envolver("desenhar_movimento_pacman", desenhar_movimento_pacman)
+        desenhar_transicao_equacao = perfilador.envolver("desenhar_transicao_equacao", desenhar_transicao_equacao)
+        desenhar_tela_fim_jogo = perfilador.envolver("desenhar_tela_fim_jogo", desenhar_tela_fim_jogo)
+        desenhar_tabuada = perfilador.envolver("desenhar_tabuada", desenhar_tabuada)
+        desenhar_botao_tabuada = perfilador.envolver("desenhar_botao_tabuada", desenhar_botao_tabuada)
+        desenhar_pacman = perfilador.envolver("desenhar_pacman", desenhar_pacman)
+
+    # O que o controlador pode ver da interface (atualizado a cada quadro)
+    sessao = SimpleNamespace(quadro=0, estado_jogo=estado_jogo, tabuada_expandida=tabuada_expandida,
+                             animando=False, tempo_jogo_ms=0.0, layout=obter_layout_atual(),
+                             redesenhar_tudo=renderizador.invalidar_tudo)
+
+    # Modo ocioso: sem animação e sem mudança na tela, o loop dorme esperando eventos
+    TEMPO_OCIOSO_MS = 1000           # tempo máximo de espera por um evento
+    pygame.event.set_blocked(pygame.MOUSEMOTION)  # o jogo não usa o movimento do mouse
+    ocioso = False
+
     # Loop principal do jogo
     while executando:
-        # Processa eventos
-        for evento in pygame.event.get():
-            if evento.type == pygame.QUIT:
-                executando = False
-            
-            elif evento.type == pygame.KEYDOWN:
-                if evento.key == pygame.K_ESCAPE:
+        # Deixa o controlador (benchmark, bots) agir antes dos eventos
+        if controlador is not None:
+            sessao.quadro += 1
+            sessao.estado_jogo = estado_jogo
+            sessao.tabuada_expandida = tabuada_expandida
+            sessao.animando = agendador.ativo()
+            sessao.tempo_jogo_ms = passo_fixo.tempo_ms
+            sessao.layout = obter_layout_atual()
+            controlador.quadro(jogo, sessao)
+        
+        # Processa eventos (bloqueando enquanto o jogo estiver ocioso)
+        if ocioso:
+            evento = pygame.event.wait(TEMPO_OCIOSO_MS)
+            eventos = [] if evento.type == pygame.NOEVENT else [evento] + pygame.event.get()
+            passo_fixo.esperar(relogio.tick())  # o tempo dormindo não conta para as animações
+        else:
+            eventos = pygame.event.get()
+        
+        inicio_eventos = time.perf_counter()
+        try:
+            for evento in eventos:
+                if evento.type == pygame.QUIT:
                     executando = False
+            
+                elif evento.type == pygame.VIDEORESIZE:
+                    # A janela mudou de tamanho: refaz a camada do jogo e redesenha tudo
+                    janela = pygame.display.get_surface()
+                    criar_camadas()
+                    renderizador.invalidar_tudo()
+
+                elif evento.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED, pygame.WINDOWRESTORED):
+                    # A janela voltou a aparecer (desminimizada ou descoberta): o conteúdo pode ter
+                    # sido perdido, e o loop ocioso só redesenha o que foi marcado
+                    renderizador.invalidar_tudo()
+
+                elif evento.type == pygame.KEYDOWN:
+                    if evento.key == pygame.K_ESCAPE:
+                        executando = False
                 
-                elif estado_jogo == "fim_jogo":
-                    if evento.key == pygame.K_SPACE:
-                        reiniciar_jogo()
+                    elif estado_jogo == "fim_jogo":
+                        if evento.key == pygame.K_SPACE:
+                            reiniciar_jogo()
                 
-                elif estado_jogo == "jogando":
-                    if evento.key == pygame.K_RETURN and texto_usuario:
-                        try:
-                            resposta = int(texto_usuario)
-                            processar_resposta(resposta)
-                            texto_usuario = ""
-                        except ValueError:
-                            mensagem = "Digite um número válido."
-                    elif evento.key == pygame.K_BACKSPACE:
-                        texto_usuario = texto_usuario[:-1]
-                    elif evento.unicode.isdigit() and len(texto_usuario) < 8:
-                        texto_usuario += evento.unicode
+                    elif estado_jogo == "jogando":
+                        if evento.key == pygame.K_RETURN and agendador.ativo():
+                            texto_usuario = ""  # respostas durante a animação são descartadas
+                        elif evento.key == pygame.K_RETURN and texto_usuario:
+                            try:
+                                resposta = int(texto_usuario)
+                                entrada_pendente, retorno_visivel = ("teclado", inicio_eventos), False
+                                processar_resposta(resposta)
+                                texto_usuario = ""
+                            except ValueError:
+                                mensagem = "Digite um número válido."
+                        elif evento.key == pygame.K_BACKSPACE:
+                            texto_usuario = texto_usuario[:-1]
+                        elif evento.unicode.isdigit() and len(texto_usuario) < 8:
+                            texto_usuario += evento.unicode
             
-            elif evento.type == pygame.MOUSEBUTTONDOWN:
-                mouse_x, mouse_y = pygame.mouse.get_pos()
+                elif evento.type == pygame.MOUSEBUTTONDOWN:
+                    # Resolve o clique com os retângulos do layout, sem redesenhar a tela
+                    layout = obter_layout_atual()
                 
-                # Verifica clique no botão da tabuada
-                if obter_botao_tabuada().collidepoint(mouse_x, mouse_y):
-                    alternar_tabuada()
+                    # Verifica clique no botão da tabuada
+                    if layout.clique_botao_tabuada(evento.pos):
+                        alternar_tabuada()
                 
-                elif estado_jogo == "dificuldade":
-                    # Processa clique nos botões de dificuldade
-                    botoes = tela_escolher_dificuldade()
-                    for retangulo, nivel in botoes:
-                        if retangulo.collidepoint(mouse_x, mouse_y):
-                            fatores = NIVEIS_DIFICULDADE[nivel]
-                            estado_jogo = "jogando"
-                            nova_pergunta()
+                    elif estado_jogo == "dificuldade":
+                        # Processa clique nos botões de dificuldade
+                        nivel = layout.clique_dificuldade(evento.pos)
+                        if nivel is not None:
+                            # Semente nova a cada partida, para que ela possa ser refeita
+                            jogo.escolher_dificuldade(nivel, semente=random.getrandbits(64))
+                            if gravador is not None:
+                                gravador.iniciar_partida(jogo)
+                            estado_jogo = jogo.estado
+                            sincronizar_pergunta()
                             mensagem = pergunta
-                            break
                 
-                elif estado_jogo == "jogando":
-                    # Processa clique nos botões de alternativas
-                    botoes = desenhar_tela_jogo()
-                    for idx, retangulo in enumerate(botoes):
-                        if retangulo.collidepoint(mouse_x, mouse_y):
+                    elif estado_jogo == "jogando" and not agendador.ativo():
+                        # Processa clique nos botões de alternativas (ignorados durante animações)
+                        idx = layout.clique_alternativa(evento.pos)
+                        if idx is not None and idx < len(alternativas):
                             alternativa_selecionada = idx
+                            entrada_pendente, retorno_visivel = ("clique", inicio_eventos), False
                             processar_resposta(alternativas[idx])
-                            break
+        except (ConnectionError, ErroServidor) as erro:
+            # Só o JogoRemoto fala com a rede: sem o servidor a partida não tem como continuar
+            print(f"Partida encerrada: {erro}")
+            executando = False
 
-        # Desenha a tela apropriada baseada no estado do jogo
-        if estado_jogo == "dificuldade":
-            tela_escolher_dificuldade()
-        elif estado_jogo == "jogando":
-            desenhar_tela_jogo()
-        elif estado_jogo == "fim_jogo":
-            desenhar_tela_fim_jogo()
-        
-        # Atualiza a tela
-        pygame.display.flip()
-        relogio.tick(60)  # limita a 60 FPS
+        if perfilador is not None and eventos:
+            perfilador.registrar("eventos", time.perf_counter() - inicio_eventos)
+        
+        # Desenha a tela apropriada baseada no estado do jogo, só se algo mudou
+        contador_quadros.iniciar()
+        marcar_regioes_alteradas()
+        if sobreposicao_perfil is not None and sobreposicao_perfil.precisa_atualizar():
+            renderizador.marcar(sobreposicao_perfil.retangulo)
+        if renderizador.precisa_desenhar():
+            area_suja = renderizador.area_suja()
+            tela.set_clip(area_suja)
+            janela.set_clip(area_suja)
+            if estado_jogo == "dificuldade":
+                tela_escolher_dificuldade()
+            elif estado_jogo == "jogando":
+                if posicao_animada is not None:
+                    desenhar_movimento_pacman(posicao_animada, pacman_virado_esquerda)
+                else:
+                    desenhar_tela_jogo(destacar_errado=destacar_resposta_errada, valor_correto=resposta_correta)
+                if equacao_transicao is not None:
+                    desenhar_transicao_equacao()
+            elif estado_jogo == "fim_jogo":
+                desenhar_tela_fim_jogo()
+            if sobreposicao_perfil is not None:
+                sobreposicao_perfil.desenhar(tela)
+            desenhar_tabuada()  # camada do painel, à direita da área do jogo
+            tela.set_clip(None)
+            janela.set_clip(None)
+        
+        # Atualiza apenas as regiões alteradas (flip ou update com a lista de retângulos)
+        desenhou = renderizador.precisa_desenhar()
+        inicio_display = time.perf_counter()
+        renderizador.atualizar()
+        if perfilador is not None and desenhou:
+            perfilador.registrar("display", time.perf_counter() - inicio_display)
+        if entrada_pendente is not None and retorno_visivel and desenhou:
+            # Este quadro é o primeiro com o retorno da resposta ("Correto!" ou o destaque em vermelho)
+            tipo_entrada, instante_entrada = entrada_pendente
+            if latencias is not None:
+                latencias[tipo_entrada].registrar(1000 * (time.perf_counter() - instante_entrada))
+            entrada_pendente = None
+        if desenhou:
+            contador_quadros.finalizar()
+            if perfilador is not None:
+                perfilador.registrar("quadro", contador_quadros.tempos[-1])
+        else:
+            contador_quadros.descartar()  # passadas ociosas não diluem a média
+        if primeiro_quadro_ms is None:
+            primeiro_quadro_ms = 1000 * (time.perf_counter() - inicio_execucao)
+            print(f"Primeiro quadro em {primeiro_quadro_ms:.0f} ms")
+        
+        # Mostra o tempo médio de quadro no título da janela a cada 60 quadros desenhados
+        if MOSTRAR_TEMPO_QUADRO and desenhou and contador_quadros.quadros % 60 == 0:
+            pygame.display.set_caption(f"PacMath - Edição Pacman ({contador_quadros.media_ms():.2f} ms/quadro)")
+        
+        # Só roda a 60 FPS enquanto algo está sendo animado ou acabou de mudar
+        ocioso = not desenhou and not agendador.ativo()
+        if not ocioso:
+            # Avança as animações em passos fixos com o tempo real do quadro (limitado a 60 FPS);
+            # o que acontece entre dois quadros desenhados é simulado, mas não desenhado
+            for _ in range(passo_fixo.avancar(relogio.tick(60))):
+                agendador.atualizar(passo_fixo.passo_ms)
 
+    if MOSTRAR_TEMPO_QUADRO:
+        print(f"Tempo médio de quadro: {contador_quadros.media_total_ms():.2f} ms em {contador_quadros.quadros} quadros")
+    if os.environ.get("PACMATH_CACHE_TEXTO") == "1":
+        print(cache_texto.relatorio())
+    if gravador is not None:
+        gravador.fechar()
+    if historico is not None:
+        historico.fechar()
+    if seletor is not None:
+        seletor.salvar()
+    if ARQUIVO_PERFIL:
+        perfilador.salvar_json(ARQUIVO_PERFIL, python=platform.python_version(), pygame=pygame.version.ver,
+                               sistema=platform.platform(), maquina=platform.node(),
+                               duracao_s=time.perf_counter() - inicio_sessao, primeiro_quadro_ms=primeiro_quadro_ms)
+        print(f"Perfil gravado em {ARQUIVO_PERFIL}")
+    if latencias is not None and any(histograma.amostras for histograma in latencias.values()):
+        with open(ARQUIVO_LATENCIA, "w", encoding="utf-8") as arquivo:
+            json.dump({"sistema": platform.platform(), "maquina": platform.node(), "pygame": pygame.version.ver,
+                       "entradas": {tipo: histograma.resumo() for tipo, histograma in latencias.items()}},
+                      arquivo, ensure_ascii=False, indent=2)
+        for tipo, histograma in latencias.items():
+            if histograma.amostras:
+                print(f"Latência ({tipo}): p50 {histograma.percentil(0.5):.0f} ms, "
+                      f"p99 {histograma.percentil(0.99):.0f} ms em {histograma.amostras} respostas")
     pygame.quit()
 
 if __name__ == "__main__":
     print("PacMath - Edição Pacman")
     print("Certifique-se de ter o pygame instalado: pip install pygame")
     print("Iniciando jogo...")
-    executar_jogo_pacmath()
+    if "--perfil" in sys.argv:
+        os.environ.setdefault("PACMATH_PERFIL", "1")
+    # --servidor host:porta joga com as regras rodando em um servidor.py
+    jogo_remoto = None
+    if "--servidor" in sys.argv:
+        try:
+            jogo_remoto = JogoRemoto(sys.argv[sys.argv.index("--servidor") + 1])
+        except (OSError, ErroServidor) as erro:  # servidor fora do ar ou cheio
+            sys.exit(f"Não foi possível entrar no servidor: {erro}")
+    try:
+        executar_jogo_pacmath(jogo=jogo_remoto)
+    finally:
+        if jogo_remoto is not None:
+            jogo_remoto.fechar()
@@ -0,0 +1,163 @@
+# PacMath - Medição de desempenho
+# Autor: Luiz - Tempos por função de desenho, agrupados por cenário
+"""
+Mede quanto tempo cada seção do jogo leva por quadro.
+
+O Perfilador guarda as durações por (cenário, seção). As seções normalmente
+são as funções de desenho, envolvidas com Perfilador.envolver, e o cenário é a
+tela ou situação do jogo sendo medida. O resumo traz média e percentis em
+milissegundos e pode ser gravado em JSON para comparar commits.
+
+Com limite_amostras, só as últimas durações de cada seção ficam guardadas (para
+sessões longas nos quiosques); contagem, média e máximo continuam cobrindo a
+sessão inteira, e os percentis passam a valer para as amostras recentes.
+
+O HistogramaLatencia conta latências em faixas de largura fixa, com memória
+constante por mais longa que seja a sessão.
+"""
+
+import functools
+import json
+import math
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager
+
+
+def percentil(valores_ordenados, fracao):
+    """Percentil (método do vizinho mais próximo) de uma lista já ordenada"""
+    if not valores_ordenados:
+        return 0.0
+    indice = min(len(valores_ordenados) - 1, max(0, math.ceil(fracao * len(valores_ordenados)) - 1))
+    return valores_ordenados[indice]
+
+
+def estatisticas(duracoes, quantidade=None, soma=None, maximo=None):
+    """Resumo de durações em segundos, com valores em milissegundos
+
+    quantidade, soma e maximo substituem os valores calculados das durações
+    quando só uma parte das amostras foi guardada.
+    """
+    ordenadas = sorted(duracoes)
+    quantidade = len(ordenadas) if quantidade is None else quantidade
+    soma = sum(ordenadas) if soma is None else soma
+    maximo = (ordenadas[-1] if ordenadas else 0.0) if maximo is None else maximo
+    return {
+        "amostras": quantidade,
+        "media_ms": 1000 * soma / quantidade if quantidade else 0.0,
+        "p50_ms": 1000 * percentil(ordenadas, 0.50),
+        "p90_ms": 1000 * percentil(ordenadas, 0.90),
+        "p95_ms": 1000 * percentil(ordenadas, 0.95),
+        "p99_ms": 1000 * percentil(ordenadas, 0.99),
+        "max_ms": 1000 * maximo,
+    }
+
+
+class Perfilador:
+    """Acumula durações por cenário e seção"""
+
+    def __init__(self, limite_amostras=None):
+        self.cenario = ""                    # cenário atual (tela ou situação do jogo)
+        # (cenário, seção) -> durações em segundos (só as últimas, se houver limite)
+        self.amostras = defaultdict(lambda: deque(maxlen=limite_amostras))
+        self.totais = defaultdict(lambda: [0, 0.0, 0.0])  # (cenário, seção) -> [quantidade, soma, máximo]
+
+    def registrar(self, secao, duracao):
+        """Registra uma duração (em segundos) da seção no cenário atual"""
+        chave = (self.cenario, secao)
+        self.amostras[chave].append(duracao)
+        total = self.totais[chave]
+        total[0] += 1
+        total[1] += duracao
+        if duracao > total[2]:
+            total[2] = duracao
+
+    def recentes(self, secao, quantidade):
+        """Últimas durações registradas da seção no cenário atual"""
+        duracoes = self.amostras.get((self.cenario, secao))
+        if not duracoes:
+            return []
+        return list(duracoes)[-quantidade:]
+
+    @contextmanager
+    def medir(self, secao):
+        """Mede o bloco de código dentro do with"""
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.registrar(secao, time.perf_counter() - inicio)
+
+    def envolver(self, secao, funcao):
+        """Retorna a função com cada chamada medida como a seção indicada"""
+        @functools.wraps(funcao)
+        def funcao_medida(*args, **kwargs):
+            inicio = time.perf_counter()
+            try:
+                return funcao(*args, **kwargs)
+            finally:
+                self.registrar(secao, time.perf_counter() - inicio)
+        return funcao_medida
+
+    def resumo(self):
+        """Estatísticas de cada seção, agrupadas por cenário"""
+        resultado = {}
+        for (cenario, secao), duracoes in sorted(self.amostras.items()):
+            resultado.setdefault(cenario, {})[secao] = estatisticas(duracoes, *self.totais[(cenario, secao)])
+        return resultado
+
+    def salvar_json(self, caminho, **extras):
+        """Grava o resumo (e informações extras) em um arquivo JSON"""
+        with open(caminho, "w", encoding="utf-8") as arquivo:
+            json.dump(dict(extras, cenarios=self.resumo()), arquivo, ensure_ascii=False, indent=2)
+
+
+class HistogramaLatencia:
+    """Contagem de latências (em ms) por faixas de largura fixa; a última faixa não tem limite"""
+
+    def __init__(self, largura_faixa_ms=5, maximo_ms=1000):
+        self.largura_faixa_ms = largura_faixa_ms
+        self.maximo_ms = maximo_ms  # latências acima disso caem todas na última faixa
+        self.contagens = [0] * (maximo_ms // largura_faixa_ms + 1)
+        self.amostras = 0
+        self.soma_ms = 0.0
+        self.maior_ms = 0.0
+
+    def registrar(self, ms):
+        """Conta uma latência em milissegundos"""
+        self.contagens[min(len(self.contagens) - 1, int(ms // self.largura_faixa_ms))] += 1
+        self.amostras += 1
+        self.soma_ms += ms
+        if ms > self.maior_ms:
+            self.maior_ms = ms
+
+    def percentil(self, fracao):
+        """Limite superior da faixa onde está o percentil (nunca acima da maior latência)"""
+        limite = math.ceil(fracao * self.amostras)
+        acumulado = 0
+        for indice, quantidade in enumerate(self.contagens):
+            acumulado += quantidade
+            if acumulado >= limite and acumulado:
+                if indice == len(self.contagens) - 1:
+                    return self.maior_ms
+                return min((indice + 1) * self.largura_faixa_ms, self.maior_ms)
+        return 0.0
+
+    def resumo(self):
+        """Amostras, média, percentis, máximo e as faixas não vazias ("10-15": quantidade)"""
+        faixas = {}
+        for indice, quantidade in enumerate(self.contagens):
+            if quantidade:
+                inicio = indice * self.largura_faixa_ms
+                fim = "" if indice == len(self.contagens) - 1 else inicio + self.largura_faixa_ms
+                faixas[f"{inicio}-{fim}"] = quantidade
+        return {
+            "amostras": self.amostras,
+            "media_ms": self.soma_ms / self.amostras if self.amostras else 0.0,
+            "p50_ms": self.percentil(0.50),
+            "p90_ms": self.percentil(0.90),
+            "p99_ms": self.percentil(0.99),
+            "max_ms": self.maior_ms,
+            "largura_faixa_ms": self.largura_faixa_ms,
+            "faixas": faixas,
+        }
@@ -0,0 +1,69 @@
+# PacMath - Geração de perguntas em lote
+# Autor: Luiz - Versão vetorizada (NumPy) da geração de perguntas
+"""
+Gera muitas perguntas de uma vez com NumPy.
+
+Segue as mesmas regras de JogoPacMath.nova_pergunta:
+    - os dois fatores são sorteados dos fatores do nível (com reposição: o lote
+      não usa o baralho de regras.BaralhoPerguntas);
+    - a primeira alternativa errada soma um deslocamento de -10 a 10 (nunca 0);
+    - a segunda soma um deslocamento de -20 a 20 (nunca 0) diferente do primeiro;
+    - as alternativas erradas são sempre positivas;
+    - as três alternativas são embaralhadas.
+
+Cada deslocamento é sorteado com a mesma probabilidade entre os válidos, como
+random.choice sobre a lista filtrada, mas sem laços em Python.
+
+Requer numpy (pip install numpy).
+"""
+
+from collections import namedtuple
+
+import numpy as np
+
+from regras import NIVEIS_DIFICULDADE
+
+# Perguntas geradas: um vetor por campo, uma posição por pergunta
+LotePerguntas = namedtuple("LotePerguntas", [
+    "numero_a",          # (n,) primeiro fator
+    "numero_b",          # (n,) segundo fator
+    "resposta_correta",  # (n,) produto
+    "alternativas",      # (n, 3) alternativas já embaralhadas
+    "indice_correta",    # (n,) coluna de alternativas com a resposta correta
+])
+
+
+def _sortear_deslocamento(rng, minimo, maximo, excluidos):
+    """Sorteia em [minimo, maximo] evitando os valores excluídos (todos dentro do intervalo)"""
+    quantidade_validos = maximo - minimo + 1 - len(excluidos)
+    deslocamento = minimo + (rng.random(minimo.shape) * quantidade_validos).astype(minimo.dtype)
+    # Percorre os excluídos em ordem crescente, pulando cada um deles
+    for excluido in np.sort(np.stack(excluidos), axis=0):
+        deslocamento += deslocamento >= excluido
+    return deslocamento
+
+
+def gerar_perguntas_lote(quantidade, nivel="2", rng=None):
+    """Gera `quantidade` perguntas do nível indicado de NIVEIS_DIFICULDADE"""
+    rng = np.random.default_rng(rng)
+    fatores = np.asarray(NIVEIS_DIFICULDADE[nivel], dtype=np.int32)
+
+    # Escolhe dois números aleatórios dos fatores disponíveis
+    numero_a = rng.choice(fatores, size=quantidade)
+    numero_b = rng.choice(fatores, size=quantidade)
+    correta = numero_a * numero_b
+
+    # Gera alternativas incorretas: o deslocamento não pode ser 0 nem deixar o resultado <= 0
+    zero = np.zeros(quantidade, dtype=np.int32)
+    minimo1 = np.maximum(-10, 1 - correta)
+    deslocamento1 = _sortear_deslocamento(rng, minimo1, 10, [zero])
+    minimo2 = np.maximum(-20, 1 - correta)
+    deslocamento2 = _sortear_deslocamento(rng, minimo2, 20, [zero, deslocamento1])
+
+    # Mistura as alternativas com uma permutação aleatória por linha
+    alternativas = np.stack([correta, correta + deslocamento1, correta + deslocamento2], axis=1)
+    ordem = np.argsort(rng.random((quantidade, 3)), axis=1)
+    alternativas = np.take_along_axis(alternativas, ordem, axis=1)
+    indice_correta = np.argmin(ordem, axis=1)  # onde foi parar a coluna 0
+
+    return LotePerguntas(numero_a, numero_b, correta, alternativas, indice_correta)
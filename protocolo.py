@@ -0,0 +1,54 @@
+# PacMath - Protocolo de rede
+# Autor: Luiz - Mensagens trocadas entre o servidor de partidas e os clientes
+"""
+Mensagens JSON, uma por linha, trocadas por TCP ou por socket Unix.
+
+Cliente -> servidor:
+    {"tipo": "estado"}                       pede o estado da partida
+    {"tipo": "dificuldade", "nivel": "3"}    começa a partida no nível indicado
+                                             ("semente" opcional, inteiro)
+    {"tipo": "resposta", "valor": 42}        responde a pergunta atual
+    {"tipo": "reiniciar"}                    volta à escolha de dificuldade
+
+Servidor -> cliente:
+    {"tipo": "estado", "estado": {...}}
+    {"tipo": "resultado", "resultado": {...}, "estado": {...}}
+    {"tipo": "erro", "mensagem": "..."}
+
+Endereços são "host:porta" ou "unix:/caminho/do/socket".
+"""
+
+import json
+
+# Atributos do regras.JogoPacMath enviados ao cliente
+CAMPOS_ESTADO = [
+    "jogadores", "largura_tabuleiro", "centro", "passos_por_acerto", "semente", "nivel", "fatores",
+    "estado", "posicao", "jogador_atual", "acertos_consecutivos", "segunda_chance", "vencedor",
+    "pergunta", "numero_a", "numero_b", "resposta_correta", "alternativas",
+]
+
+
+def codificar(mensagem):
+    """Converte uma mensagem em uma linha de bytes"""
+    return json.dumps(mensagem, ensure_ascii=False, separators=(",", ":")).encode("utf-8") + b"\n"
+
+
+def decodificar(linha):
+    """Converte uma linha recebida em mensagem (ValueError se inválida)"""
+    mensagem = json.loads(linha)
+    if not isinstance(mensagem, dict):
+        raise ValueError("a mensagem deve ser um objeto JSON")
+    return mensagem
+
+
+def estado_partida(jogo):
+    """Estado de um JogoPacMath em forma de dicionário"""
+    return {campo: getattr(jogo, campo) for campo in CAMPOS_ESTADO}
+
+
+def analisar_endereco(texto):
+    """Retorna ("unix", caminho) ou ("tcp", (host, porta)) a partir do texto do endereço"""
+    if texto.startswith("unix:"):
+        return "unix", texto[len("unix:"):]
+    host, _, porta = texto.rpartition(":")
+    return "tcp", (host or "127.0.0.1", int(porta))
@@ -0,0 +1,216 @@
+# PacMath - Regras do jogo
+# Autor: Luiz - Lógica do jogo separada da interface gráfica
+"""
+Regras do PacMath sem dependência do pygame.
+
+O JogoPacMath guarda o estado da partida (posição do Pacman, jogador da vez,
+acertos consecutivos, pergunta atual e segunda chance) e avança com
+passo(resposta). Cada passo devolve um Resultado que descreve o que aconteceu,
+para que a interface decida quais animações mostrar.
+
+Pode ser usado em servidores, simulações e testes sem inicializar o pygame.
+
+Cada partida tem o seu próprio gerador de números aleatórios. Com uma semente
+em escolher_dificuldade, a mesma semente e as mesmas respostas refazem a
+partida exatamente (veja gravacao.py).
+
+As contas saem de um baralho (BaralhoPerguntas) com todos os pares (a, b) dos
+fatores do nível: nenhuma conta se repete antes de o baralho acabar, e então
+ele é embaralhado de novo. Com um seletor (adaptativo.SeletorAdaptativo), as
+contas de cada pergunta são sorteadas pelo seletor em vez do baralho.
+"""
+
+import random
+from collections import namedtuple
+from functools import lru_cache
+
+# ======= Parâmetros do jogo =======
+LARGURA_TABULEIRO = 61           # largura do tabuleiro em células
+CENTRO = LARGURA_TABULEIRO // 2  # posição central do tabuleiro
+JOGADORES = ["Larissa", "Leticia"]
+ACERTOS_PARA_VENCER = 4          # acertos consecutivos que encerram a partida
+
+# Níveis de dificuldade com diferentes fatores para multiplicação
+NIVEIS_DIFICULDADE = {
+    "1": [1, 2, 3],                    # Fácil - números pequenos
+    "2": [1, 2, 3, 4, 5, 6],          # Médio - números médios
+    "3": [1, 2, 3, 4, 5, 6, 7, 8, 9], # Difícil - todos os números
+    "4": [7, 8, 9]                     # Especial - apenas números altos
+}
+
+# Tipos de resultado de uma resposta
+ACERTO = "acerto"                                # primeira tentativa correta, o Pacman anda
+ACERTO_SEGUNDA_CHANCE = "acerto_segunda_chance"  # correta na segunda chance, o Pacman fica parado
+ERRO = "erro"                                    # primeira tentativa errada, ganha segunda chance
+ERRO_SEGUNDA_CHANCE = "erro_segunda_chance"      # errou de novo, perde a vez e zera os acertos
+
+# O que aconteceu em um passo do jogo
+Resultado = namedtuple("Resultado", [
+    "tipo",             # um dos tipos acima
+    "jogador",          # índice do jogador que respondeu
+    "resposta_correta", # resposta da pergunta respondida
+    "posicao_inicial",  # posição do Pacman antes da resposta
+    "posicao_final",    # posição até onde o Pacman andou
+    "fim",              # True se a resposta encerrou a partida
+])
+
+
+@lru_cache(maxsize=None)
+def deslocamentos_validos(correta):
+    """Deslocamentos das alternativas erradas de uma resposta: (de -10 a 10, de -20 a 20)
+
+    Nunca 0 nem deixando a alternativa <= 0; as tuplas são crescentes.
+    """
+    return (tuple(i for i in range(-10, 11) if i != 0 and correta + i > 0),
+            tuple(i for i in range(-20, 21) if i != 0 and correta + i > 0))
+
+
+class BaralhoPerguntas:
+    """Todas as contas (a, b) de um nível, tiradas sem repetição até o baralho acabar
+
+    Cada carta é (a, b, a × b, deslocamentos da primeira errada, da segunda),
+    com as tabelas de deslocamentos_validos já calculadas. Tirar uma carta é um
+    passo do embaralhamento de Fisher-Yates: sorteia uma das cartas restantes e
+    a troca com a última delas, sem criar listas.
+    """
+
+    def __init__(self, fatores):
+        self.cartas = [(a, b, a * b) + deslocamentos_validos(a * b) for a in fatores for b in fatores]
+        self.restantes = len(self.cartas)  # as cartas ainda no baralho são cartas[:restantes]
+
+    def tirar(self, rng):
+        """Tira uma carta ao acaso; quando o baralho acaba, todas voltam para ele"""
+        if self.restantes == 0:
+            self.restantes = len(self.cartas)
+        self.restantes -= 1
+        cartas = self.cartas
+        indice = rng.randrange(self.restantes + 1)
+        cartas[indice], cartas[self.restantes] = cartas[self.restantes], cartas[indice]
+        return cartas[self.restantes]
+
+
+class JogoPacMath:
+    """Estado e regras de uma partida de PacMath"""
+
+    def __init__(self, fatores=None, jogadores=None, largura_tabuleiro=LARGURA_TABULEIRO, rng=None, passos_por_acerto=None,
+                 seletor=None):
+        self.jogadores = list(jogadores or JOGADORES)
+        self.largura_tabuleiro = largura_tabuleiro
+        self.centro = largura_tabuleiro // 2
+        # Células andadas por acerto (por padrão um quarto da metade do tabuleiro)
+        self.passos_por_acerto = passos_por_acerto or (largura_tabuleiro // 2) // 4
+        self.rng = rng or random.Random()  # gerador usado nas perguntas
+        self.semente = None                # semente da partida atual, se houver
+        self.nivel = None                  # nível escolhido em escolher_dificuldade
+        self.seletor = seletor             # escolhe as contas (None = baralho)
+        self.fatores = list(fatores or NIVEIS_DIFICULDADE["2"])  # Médio por padrão
+        self.baralho = BaralhoPerguntas(self.fatores)
+
+        # Variáveis da pergunta atual
+        self.pergunta = ""
+        self.numero_a, self.numero_b = 0, 0
+        self.resposta_correta = 0
+        self.alternativas = []
+
+        self.reiniciar()
+        self.nova_pergunta()
+
+    def reiniciar(self):
+        """Volta ao estado inicial, na escolha de dificuldade"""
+        self.posicao = self.centro
+        self.estado = "dificuldade"  # estados: dificuldade, jogando, fim_jogo
+        self.jogador_atual = 0
+        self.acertos_consecutivos = [0] * len(self.jogadores)
+        self.segunda_chance = False
+        self.vencedor = None
+
+    def escolher_dificuldade(self, nivel, semente=None):
+        """Começa a partida com os fatores do nível escolhido
+
+        Com semente, o gerador é semeado antes da primeira pergunta. O baralho
+        começa cheio a cada partida.
+        """
+        self.semente = semente
+        if semente is not None:
+            self.rng.seed(semente)
+        self.nivel = nivel
+        self.fatores = list(NIVEIS_DIFICULDADE[nivel])
+        self.baralho = BaralhoPerguntas(self.fatores)
+        self.estado = "jogando"
+        self.nova_pergunta()
+
+    def nova_pergunta(self):
+        """Gera uma nova pergunta de multiplicação"""
+        # Escolhe a conta: pelo seletor ou tirando a próxima carta do baralho
+        rng = self.rng
+        if self.seletor is not None:
+            self.numero_a, self.numero_b = self.seletor.sortear(self.jogadores[self.jogador_atual], self.fatores, rng)
+            correta = self.numero_a * self.numero_b
+            deslocamentos1, deslocamentos2 = deslocamentos_validos(correta)
+        else:
+            self.numero_a, self.numero_b, correta, deslocamentos1, deslocamentos2 = self.baralho.tirar(rng)
+        self.resposta_correta = correta
+        self.pergunta = f"{self.jogadores[self.jogador_atual]}, quanto é {self.numero_a} × {self.numero_b}?"
+
+        # Gera alternativas incorretas. O segundo deslocamento é sorteado entre os
+        # válidos menos o primeiro: pula o primeiro na tupla crescente (mesmo
+        # sorteio que random.choice sobre a lista filtrada)
+        deslocamento1 = deslocamentos1[rng.randrange(len(deslocamentos1))]
+        indice = rng.randrange(len(deslocamentos2) - 1)
+        deslocamento2 = deslocamentos2[indice] if deslocamentos2[indice] < deslocamento1 else deslocamentos2[indice + 1]
+        resposta_errada1 = correta + deslocamento1
+        resposta_errada2 = correta + deslocamento2
+
+        # Mistura as alternativas
+        self.alternativas = [correta, resposta_errada1, resposta_errada2]
+        rng.shuffle(self.alternativas)
+        self.segunda_chance = False  # Reset da segunda chance para nova pergunta
+
+    def _passar_vez(self):
+        """Muda para o próximo jogador com uma nova pergunta"""
+        self.jogador_atual = 1 - self.jogador_atual
+        self.nova_pergunta()
+
+    def passo(self, resposta):
+        """Processa a resposta do jogador da vez e retorna o Resultado"""
+        if self.estado != "jogando":
+            raise RuntimeError(f"Não é possível responder no estado '{self.estado}'")
+
+        jogador = self.jogador_atual
+        correta = self.resposta_correta
+        posicao_inicial = self.posicao
+
+        if resposta == correta:
+            if self.segunda_chance:
+                # SEGUNDA CHANCE CORRETA - Pacman NÃO se move
+                self._passar_vez()
+                return Resultado(ACERTO_SEGUNDA_CHANCE, jogador, correta, posicao_inicial, posicao_inicial, False)
+
+            # PRIMEIRA TENTATIVA CORRETA - Pacman se move
+            self.acertos_consecutivos[jogador] += 1
+            if jogador == 0:  # o primeiro jogador anda para a direita
+                self.posicao = min(self.largura_tabuleiro - 1, self.posicao + self.passos_por_acerto)
+            else:  # o segundo anda para a esquerda
+                self.posicao = max(0, self.posicao - self.passos_por_acerto)
+            posicao_final = self.posicao
+
+            # Verifica condição de vitória
+            if (self.acertos_consecutivos[jogador] >= ACERTOS_PARA_VENCER
+                    or self.posicao <= 0 or self.posicao >= self.largura_tabuleiro - 1):
+                self.vencedor = self.jogadores[jogador]
+                self.estado = "fim_jogo"
+                self.posicao = 0 if jogador == 1 else self.largura_tabuleiro - 1
+                return Resultado(ACERTO, jogador, correta, posicao_inicial, posicao_final, True)
+
+            self._passar_vez()
+            return Resultado(ACERTO, jogador, correta, posicao_inicial, posicao_final, False)
+
+        if not self.segunda_chance:
+            # PRIMEIRA TENTATIVA INCORRETA - Dá segunda chance, sem mudar de jogador
+            self.segunda_chance = True
+            return Resultado(ERRO, jogador, correta, posicao_inicial, posicao_inicial, False)
+
+        # SEGUNDA TENTATIVA INCORRETA - Perde a vez e zera os acertos consecutivos
+        self.acertos_consecutivos[jogador] = 0
+        self._passar_vez()
+        return Resultado(ERRO_SEGUNDA_CHANCE, jogador, correta, posicao_inicial, posicao_inicial, False)
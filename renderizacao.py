@@ -0,0 +1,449 @@
+# PacMath - Renderização por regiões alteradas
+# Autor: Luiz - Utilitários de desenho compartilhados pelas versões do jogo
+"""
+Ferramentas para desenhar somente o que mudou na tela.
+
+O RenderizadorSujo guarda uma "assinatura" (o estado que determina o desenho)
+para cada região da tela. Quando a assinatura muda, a região é marcada como suja
+e apenas ela é enviada ao display com pygame.display.update(retangulos).
+O ContadorTempoQuadro mede quanto tempo cada quadro gasta desenhando.
+O CacheTexto guarda as superfícies de texto já renderizadas (LRU limitado).
+A TabuadaEmCache guarda a tabuada de Pitágoras já desenhada numa superfície e
+só pinta por cima as células da multiplicação atual.
+O FundoEmCache guarda as partes fixas de uma tela numa superfície só, com os
+textos que mudam pouco repintados nela.
+A CamadaComida guarda a fileira de comida em blocos pré-desenhados, para
+tabuleiros maiores que a tela.
+O AtlasPacman guarda os quadros da boca do Pacman, com transparência, para as
+três versões do jogo.
+A SobreposicaoPerfil mostra os tempos medidos por um perfil.Perfilador.
+"""
+
+import time
+from collections import OrderedDict, deque
+
+import pygame
+
+
+class RenderizadorSujo:
+    """Acompanha as regiões alteradas da tela e atualiza apenas elas"""
+
+    def __init__(self):
+        self.assinaturas = {}        # nome da região -> (assinatura, retângulo)
+        self.retangulos_sujos = []   # regiões que precisam ir para o display
+        self.tela_inteira = True     # o primeiro quadro sempre é completo
+
+    def invalidar_tudo(self):
+        """Força o próximo quadro a redesenhar e atualizar a tela inteira"""
+        self.tela_inteira = True
+        self.retangulos_sujos = []
+
+    def marcar(self, retangulo):
+        """Marca um retângulo como alterado"""
+        if not self.tela_inteira:
+            self.retangulos_sujos.append(pygame.Rect(retangulo))
+
+    def comparar(self, nome, retangulo, assinatura):
+        """Marca a região como suja se a assinatura mudou desde o último quadro"""
+        anterior = self.assinaturas.get(nome)
+        if anterior is not None and anterior[0] == assinatura and anterior[1] == retangulo:
+            return False
+
+        # Marca a posição antiga e a nova (o Pacman, por exemplo, muda de lugar)
+        if anterior is not None:
+            self.marcar(anterior[1])
+        self.marcar(retangulo)
+        self.assinaturas[nome] = (assinatura, pygame.Rect(retangulo))
+        return True
+
+    def precisa_desenhar(self):
+        """Indica se há algo para redesenhar neste quadro"""
+        return self.tela_inteira or bool(self.retangulos_sujos)
+
+    def area_suja(self):
+        """Retorna a união das regiões sujas (None quando a tela inteira mudou)"""
+        if self.tela_inteira or not self.retangulos_sujos:
+            return None
+        return self.retangulos_sujos[0].unionall(self.retangulos_sujos[1:])
+
+    def atualizar(self):
+        """Envia ao display apenas as regiões marcadas e limpa a lista"""
+        if self.tela_inteira:
+            pygame.display.flip()
+        elif self.retangulos_sujos:
+            pygame.display.update(self.retangulos_sujos)
+        self.tela_inteira = False
+        self.retangulos_sujos = []
+
+
+class ContadorTempoQuadro:
+    """Mede o tempo de desenho de cada quadro com uma média móvel"""
+
+    def __init__(self, amostras=120):
+        self.tempos = deque(maxlen=amostras)  # últimos tempos em segundos
+        self.quadros = 0                      # total de quadros medidos
+        self.tempo_total = 0.0                # soma de todos os tempos
+        self.inicio = None
+
+    def iniciar(self):
+        """Marca o início do quadro"""
+        self.inicio = time.perf_counter()
+
+    def finalizar(self):
+        """Marca o fim do quadro e registra a duração"""
+        if self.inicio is None:
+            return
+        duracao = time.perf_counter() - self.inicio
+        self.tempos.append(duracao)
+        self.quadros += 1
+        self.tempo_total += duracao
+        self.inicio = None
+
+    def descartar(self):
+        """Esquece o quadro iniciado sem registrar (passadas do loop que não desenharam nada)"""
+        self.inicio = None
+
+    def media_ms(self):
+        """Tempo médio dos últimos quadros em milissegundos"""
+        if not self.tempos:
+            return 0.0
+        return 1000 * sum(self.tempos) / len(self.tempos)
+
+    def media_total_ms(self):
+        """Tempo médio de todos os quadros medidos em milissegundos"""
+        if not self.quadros:
+            return 0.0
+        return 1000 * self.tempo_total / self.quadros
+
+
+class CacheTexto:
+    """Cache LRU limitado de superfícies de texto renderizadas"""
+
+    def __init__(self, capacidade=256):
+        self.capacidade = capacidade    # número máximo de superfícies guardadas
+        self.superficies = OrderedDict()  # (fonte, texto, cor, antialias) -> superfície
+        self.acertos = 0                # renderizações evitadas
+        self.falhas = 0                 # renderizações feitas de fato
+
+    def renderizar(self, fonte, texto, antialias, cor):
+        """Igual a fonte.render(texto, antialias, cor), mas reaproveita o resultado"""
+        chave = (fonte, texto, tuple(cor), antialias)
+        superficie = self.superficies.get(chave)
+        if superficie is not None:
+            self.acertos += 1
+            self.superficies.move_to_end(chave)
+            return superficie
+
+        self.falhas += 1
+        superficie = fonte.render(texto, antialias, cor)
+        self.superficies[chave] = superficie
+        if len(self.superficies) > self.capacidade:
+            self.superficies.popitem(last=False)  # descarta o menos usado
+        return superficie
+
+    def limpar(self):
+        """Descarta todas as superfícies guardadas"""
+        self.superficies.clear()
+
+    def relatorio(self):
+        """Resumo de acertos e falhas para dimensionar a capacidade"""
+        total = self.acertos + self.falhas
+        taxa = 100 * self.acertos / total if total else 0.0
+        return (f"Cache de texto: {self.acertos} acertos, {self.falhas} falhas ({taxa:.1f}% de acerto), "
+                f"{len(self.superficies)}/{self.capacidade} superfícies")
+
+
+class TabuadaEmCache:
+    """Tabuada de Pitágoras pré-renderizada, com as células destacadas por cima"""
+
+    def __init__(self, largura, altura, tamanho_celula=35, celulas=10, margem_x=20, margem_y=50):
+        self.largura = largura                # largura do painel da tabuada
+        self.altura = altura                  # altura do painel da tabuada
+        self.tamanho_celula = tamanho_celula  # lado de cada célula em pixels
+        self.celulas = celulas                # células por lado, incluindo o cabeçalho
+        self.margem_x = margem_x              # distância da tabela à borda esquerda
+        self.margem_y = margem_y              # distância da tabela ao topo
+        self.superficie = None                # tabela completa, sem destaque
+        self.celulas_destaque = {}            # (linha, coluna) -> célula destacada
+        self.chave = None                     # fontes e cores usadas no cache atual
+
+    def retangulo_celula(self, linha, coluna):
+        """Retorna o retângulo de uma célula relativo ao painel"""
+        return pygame.Rect(self.margem_x + coluna * self.tamanho_celula,
+                           self.margem_y + linha * self.tamanho_celula,
+                           self.tamanho_celula, self.tamanho_celula)
+
+    def _desenhar_celula(self, superficie, retangulo, texto, cor_celula, cor_texto, cor_borda, fonte):
+        """Desenha uma célula com o texto centralizado"""
+        pygame.draw.rect(superficie, cor_celula, retangulo)
+        pygame.draw.rect(superficie, cor_borda, retangulo, 1)
+        superficie_texto = fonte.render(texto, True, cor_texto)
+        superficie.blit(superficie_texto, (retangulo.centerx - superficie_texto.get_width()//2,
+                                           retangulo.centery - superficie_texto.get_height()//2))
+
+    def _reconstruir(self, fonte_titulo, fonte_celula, cores):
+        """Renderiza a tabela inteira numa superfície no formato do display"""
+        superficie = pygame.Surface((self.largura, self.altura))
+        superficie.fill(cores["fundo"])
+
+        # Título
+        titulo = fonte_titulo.render("Tabuada de Pitágoras", True, cores["texto"])
+        superficie.blit(titulo, (10, 10))
+
+        # Tabela com cabeçalhos na primeira linha e na primeira coluna
+        for i in range(self.celulas):
+            for j in range(self.celulas):
+                if i == 0 or j == 0:
+                    cor_celula = cores["cabecalho"]
+                    if i == 0 and j == 0:
+                        texto = "×"
+                    elif i == 0:
+                        texto = str(j)
+                    else:
+                        texto = str(i)
+                else:
+                    cor_celula = cores["fundo"]
+                    texto = str(i * j)
+                self._desenhar_celula(superficie, self.retangulo_celula(i, j), texto,
+                                      cor_celula, cores["texto"], cores["borda"], fonte_celula)
+
+        self.superficie = superficie.convert()
+        self.celulas_destaque = {}
+
+    def _celula_destacada(self, linha, coluna, fonte_celula, cores):
+        """Retorna (e guarda) a superfície de uma célula destacada"""
+        celula = self.celulas_destaque.get((linha, coluna))
+        if celula is None:
+            celula = pygame.Surface((self.tamanho_celula, self.tamanho_celula))
+            self._desenhar_celula(celula, celula.get_rect(), str(linha * coluna),
+                                  cores["destaque"], cores["borda"], cores["borda"], fonte_celula)
+            celula = celula.convert()
+            self.celulas_destaque[(linha, coluna)] = celula
+        return celula
+
+    def desenhar(self, tela, x, fonte_titulo, fonte_celula, cores, destaque=None):
+        """Copia a tabela para a tela e destaca as células de destaque=(a, b)"""
+        chave = (fonte_titulo, fonte_celula, tuple(sorted(cores.items())),
+                 self.largura, self.altura, self.tamanho_celula, self.celulas)
+        if self.superficie is None or chave != self.chave:
+            self._reconstruir(fonte_titulo, fonte_celula, cores)
+            self.chave = chave
+
+        tela.blit(self.superficie, (x, 0))
+
+        if destaque is None:
+            return
+        numero_a, numero_b = destaque
+        for linha, coluna in {(numero_a, numero_b), (numero_b, numero_a)}:
+            if 0 < linha < self.celulas and 0 < coluna < self.celulas:
+                retangulo = self.retangulo_celula(linha, coluna)
+                tela.blit(self._celula_destacada(linha, coluna, fonte_celula, cores), (x + retangulo.x, retangulo.y))
+
+
+class FundoEmCache:
+    """Partes fixas de uma tela pré-renderizadas, com textos variáveis pintados por cima"""
+
+    def __init__(self, tamanho, cor_fundo):
+        self.tamanho = tamanho      # tamanho da tela em pixels
+        self.cor_fundo = cor_fundo  # cor de fundo (também apaga os textos trocados)
+        self.superficie = None      # fundo pronto, no formato do display
+        self.textos = {}            # nome -> (superfície do texto, retângulo ocupado)
+
+    def construir(self, desenhar_fixo):
+        """Pinta o fundo e chama desenhar_fixo(superficie) para as partes que não mudam"""
+        superficie = pygame.Surface(self.tamanho)
+        superficie.fill(self.cor_fundo)
+        desenhar_fixo(superficie)
+        self.superficie = superficie.convert()
+        self.textos = {}
+
+    def invalidar(self):
+        """Descarta o fundo; o próximo construir() monta outro"""
+        self.superficie = None
+
+    def escrever(self, nome, texto, posicao):
+        """Pinta a superfície de texto na posição, apagando o texto anterior com o mesmo nome
+
+        Se o texto e a posição são os mesmos da última vez, não faz nada.
+        """
+        anterior = self.textos.get(nome)
+        if anterior is not None:
+            superficie_anterior, retangulo_anterior = anterior
+            if superficie_anterior is texto and retangulo_anterior.topleft == tuple(posicao):
+                return
+            self.superficie.fill(self.cor_fundo, retangulo_anterior)
+        self.superficie.blit(texto, posicao)
+        self.textos[nome] = (texto, texto.get_rect(topleft=posicao))
+
+    def desenhar(self, tela):
+        """Copia o fundo inteiro para a tela"""
+        tela.blit(self.superficie, (0, 0))
+
+
+class CamadaComida:
+    """Fileira de comida pré-desenhada em blocos, copiando só os blocos visíveis"""
+
+    def __init__(self, largura_celula, raio, cor, cor_fundo, posicoes, celulas_por_bloco=64, capacidade=16):
+        self.largura_celula = largura_celula        # largura de cada célula do tabuleiro
+        self.raio = raio                            # raio de cada pontinho
+        self.cor = cor                              # cor da comida
+        self.cor_fundo = cor_fundo                  # cor do fundo (e da comida escondida)
+        self.posicoes = posicoes                    # células com comida (um range)
+        self.celulas_por_bloco = celulas_por_bloco  # células desenhadas em cada bloco
+        self.capacidade = capacidade                # número máximo de blocos guardados
+        self.altura = 2 * raio + 3                  # altura da fileira em pixels
+        self.blocos = OrderedDict()                 # índice do bloco -> superfície
+
+    def _x_centro(self, posicao):
+        """Centro horizontal da célula no tabuleiro inteiro"""
+        return posicao * self.largura_celula + self.largura_celula // 2
+
+    def _apagar(self, superficie, x, y):
+        """Pinta o fundo por cima do pontinho centrado em (x, y)"""
+        superficie.fill(self.cor_fundo, (x - self.raio - 1, y - self.raio - 1, self.altura, self.altura))
+
+    def _bloco(self, indice):
+        """Retorna (e guarda) a superfície de um bloco de células"""
+        bloco = self.blocos.get(indice)
+        if bloco is not None:
+            self.blocos.move_to_end(indice)
+            return bloco
+
+        largura_bloco = self.celulas_por_bloco * self.largura_celula
+        bloco = pygame.Surface((largura_bloco, self.altura))
+        bloco.fill(self.cor_fundo)
+        inicio = indice * self.celulas_por_bloco
+        for posicao in range(inicio, inicio + self.celulas_por_bloco):
+            if posicao in self.posicoes:
+                x = self._x_centro(posicao) - indice * largura_bloco
+                pygame.draw.circle(bloco, self.cor, (x, self.raio + 1), self.raio)
+        bloco = bloco.convert()
+        bloco.set_colorkey(self.cor_fundo)  # o fundo da tela (e as paredes) aparece entre os pontinhos
+        self.blocos[indice] = bloco
+        if len(self.blocos) > self.capacidade:
+            self.blocos.popitem(last=False)  # descarta o menos usado
+        return bloco
+
+    def desenhar(self, tela, y, x_camera, largura_visivel, esconder=None):
+        """Copia os blocos entre x_camera e x_camera + largura_visivel para a fileira y
+
+        esconder: posição cuja comida não aparece neste quadro (embaixo do Pacman).
+        """
+        largura_bloco = self.celulas_por_bloco * self.largura_celula
+        primeiro = max(0, x_camera // largura_bloco)
+        ultimo = (x_camera + largura_visivel - 1) // largura_bloco
+        topo = y - self.raio - 1
+        for indice in range(primeiro, ultimo + 1):
+            tela.blit(self._bloco(indice), (indice * largura_bloco - x_camera, topo))
+        if esconder is not None:
+            self._apagar(tela, self._x_centro(esconder) - x_camera, y)
+
+
+class AtlasPacman:
+    """Quadros do Pacman com a boca abrindo, para os dois lados, numa superfície só
+
+    A boca é transparente (alfa por pixel), então o Pacman pode passar por cima
+    de qualquer coisa. O último quadro tem a boca toda aberta, o desenho de sempre.
+    """
+
+    def __init__(self, raio, cor, quadros=4, abertura=0.5):
+        self.raio = raio          # raio do Pacman
+        self.cor = cor            # cor do corpo
+        self.quadros = quadros    # quadros da boca, de fechada a toda aberta
+        self.abertura = abertura  # meia altura da boca toda aberta, em raios
+        self.lado = 2 * raio + 2  # lado de cada quadro no atlas
+        self.superficie = None    # atlas: uma linha por direção, uma coluna por quadro
+
+    def _construir(self):
+        """Desenha todos os quadros no formato do display (chamado no primeiro uso)"""
+        atlas = pygame.Surface((self.lado * self.quadros, 2 * self.lado), pygame.SRCALPHA)
+        for linha, virado_esquerda in enumerate((False, True)):
+            for quadro in range(self.quadros):
+                x = quadro * self.lado + self.raio + 1
+                y = linha * self.lado + self.raio + 1
+                pygame.draw.circle(atlas, self.cor, (x, y), self.raio)
+                meia_boca = int(self.raio * self.abertura * quadro / max(1, self.quadros - 1))
+                if meia_boca:
+                    ponta = x - self.raio if virado_esquerda else x + self.raio
+                    # Desenhar com alfa 0 apaga os pixels da boca
+                    pygame.draw.polygon(atlas, (0, 0, 0, 0), [(x, y), (ponta, y - meia_boca), (ponta, y + meia_boca)])
+        self.superficie = atlas.convert_alpha()
+
+    def quadro_mastigando(self, passo):
+        """Quadro da boca no passo de uma animação (abre e fecha, vai e volta)"""
+        ciclo = max(1, 2 * (self.quadros - 1))
+        fase = passo % ciclo
+        return fase if fase < self.quadros else ciclo - fase
+
+    def desenhar(self, tela, x, y, virado_esquerda, quadro=None):
+        """Copia o Pacman centrado em (x, y); sem quadro, com a boca toda aberta"""
+        if self.superficie is None:
+            self._construir()
+        if quadro is None:
+            quadro = self.quadros - 1
+        area = (quadro * self.lado, self.lado if virado_esquerda else 0, self.lado, self.lado)
+        tela.blit(self.superficie, (x - self.raio - 1, y - self.raio - 1), area)
+
+
+class SobreposicaoPerfil:
+    """Gráfico dos tempos de quadro e tempo médio por seção, desenhado por cima do jogo"""
+
+    def __init__(self, perfilador, fonte, retangulo, secoes, intervalo=0.25, quadros=120, escala_ms=33.3):
+        self.perfilador = perfilador  # de onde vêm as durações (perfil.Perfilador)
+        self.fonte = fonte            # fonte dos textos da sobreposição
+        self.retangulo = pygame.Rect(retangulo)
+        self.secoes = secoes          # seções mostradas abaixo do gráfico
+        self.intervalo = intervalo    # segundos entre atualizações do conteúdo
+        self.quadros = quadros        # quadros mostrados no gráfico
+        self.escala_ms = escala_ms    # tempo que ocupa a altura toda do gráfico
+        self.superficie = None
+        self.ultima_atualizacao = 0.0
+
+    def precisa_atualizar(self):
+        """Indica se já passou o intervalo desde a última atualização"""
+        return time.perf_counter() - self.ultima_atualizacao >= self.intervalo
+
+    def _cor_tempo(self, ms):
+        """Verde até 60 FPS, amarelo até 30 FPS, vermelho acima disso"""
+        if ms <= 1000 / 60:
+            return (80, 220, 80)
+        if ms <= 1000 / 30:
+            return (240, 200, 40)
+        return (240, 70, 70)
+
+    def _reconstruir(self):
+        """Desenha o gráfico e a tabela de seções em uma superfície com alfa"""
+        largura, altura = self.retangulo.size
+        superficie = pygame.Surface((largura, altura), pygame.SRCALPHA)
+        superficie.fill((0, 0, 0, 180))
+
+        # Gráfico de barras com os últimos tempos de quadro e a linha de 60 FPS
+        altura_grafico = 45
+        largura_barra = max(1, (largura - 10) // self.quadros)
+        tempos = self.perfilador.recentes("quadro", self.quadros)
+        for i, duracao in enumerate(tempos):
+            ms = 1000 * duracao
+            altura_barra = max(1, int(min(1.0, ms / self.escala_ms) * altura_grafico))
+            pygame.draw.rect(superficie, self._cor_tempo(ms),
+                             (5 + i * largura_barra, 5 + altura_grafico - altura_barra, largura_barra, altura_barra))
+        y_60fps = 5 + altura_grafico - int((1000 / 60) / self.escala_ms * altura_grafico)
+        pygame.draw.line(superficie, (200, 200, 200), (5, y_60fps), (largura - 5, y_60fps))
+
+        # Média recente de cada seção, em duas colunas
+        y = altura_grafico + 10
+        for i, secao in enumerate(self.secoes):
+            duracoes = self.perfilador.recentes(secao, self.quadros)
+            media = 1000 * sum(duracoes) / len(duracoes) if duracoes else 0.0
+            nome = secao.replace("desenhar_", "")  # nomes curtos para caber em duas colunas
+            texto = self.fonte.render(f"{nome}: {media:.2f} ms", True, (255, 255, 255))
+            x = 5 + (i % 2) * (largura // 2)
+            superficie.blit(texto, (x, y + (i // 2) * (self.fonte.get_linesize() + 1)))
+
+        self.superficie = superficie
+        self.ultima_atualizacao = time.perf_counter()
+
+    def desenhar(self, tela):
+        """Desenha a sobreposição, atualizando o conteúdo se o intervalo passou"""
+        if self.superficie is None or self.precisa_atualizar():
+            self._reconstruir()
+        tela.blit(self.superficie, self.retangulo)
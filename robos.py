@@ -0,0 +1,277 @@
+# PacMath - Jogadores robôs
+# Autor: Luiz - Robôs que jogam sozinhos, para testes longos e balanceamento
+"""
+Robôs que respondem às perguntas do PacMath com precisão configurável, taxa
+de erro própria para algumas contas e tempo de resposta sorteado.
+
+O JogadorRobo só decide a resposta e quanto tempo leva para dá-la. Quem joga é:
+    - jogar_sem_tela(jogo, robos): partidas direto no regras.JogoPacMath (o
+      caminho do torneio.py e do balanceamento.py);
+    - ControladorRobos: controlador do pacmathv3 que posta cliques
+      (MOUSEBUTTONDOWN) ou teclas (KEYDOWN com os dígitos e o ENTER), pelo
+      mesmo caminho da entrada de uma criança no loop principal.
+Cada lado da partida pode ser um robô ou uma pessoa (None).
+
+Teste longo sem janela, mostrando memória e tempo de quadro a cada intervalo:
+    python robos.py --partidas 500 --entrada teclado --escala 20
+    python robos.py --tela --precisao 0.9 0.6 --erros 7x8=0.7 6x9=0.5
+"""
+
+import argparse
+import gc
+import math
+import os
+import random
+import time
+from collections import namedtuple
+
+from ambiente import preparar_execucao_automatica
+from regras import NIVEIS_DIFICULDADE
+
+TEMPO_MEDIANO_MS = 2500  # tempo de resposta típico de um aluno
+DISPERSAO_TEMPO = 0.4    # desvio do logaritmo do tempo (0 = sempre o tempo mediano)
+TEMPO_MINIMO_MS = 300    # ninguém responde mais rápido que isso
+
+# Resultado do jogar_sem_tela; ultimo_resultado é o regras.Resultado da última resposta
+PartidaSimulada = namedtuple("PartidaSimulada", "vencedor respostas tempo_total_ms acertos tentativas ultimo_resultado")
+
+
+class JogadorRobo:
+    """Decide a resposta e o tempo de resposta de um jogador simulado"""
+
+    def __init__(self, precisao=0.8, erros_por_conta=None, tempo_mediano_ms=TEMPO_MEDIANO_MS,
+                 dispersao_tempo=DISPERSAO_TEMPO, tempo_minimo_ms=TEMPO_MINIMO_MS, rng=None):
+        self.precisao = precisao                            # probabilidade de acertar cada tentativa
+        self.erros_por_conta = dict(erros_por_conta or {})  # (a, b) -> taxa de erro própria da conta
+        self.tempo_mediano_ms = tempo_mediano_ms
+        self.dispersao_tempo = dispersao_tempo
+        self.tempo_minimo_ms = tempo_minimo_ms
+        self.rng = rng or random.Random()
+
+    def taxa_erro(self, numero_a, numero_b):
+        """Taxa de erro da conta (a ordem dos fatores não importa)"""
+        if not self.erros_por_conta:
+            return 1.0 - self.precisao
+        for conta in ((numero_a, numero_b), (numero_b, numero_a)):
+            if conta in self.erros_por_conta:
+                return self.erros_por_conta[conta]
+        return 1.0 - self.precisao
+
+    def responder(self, numero_a, numero_b, resposta_correta, alternativas):
+        """Retorna (resposta, tempo em ms); o tempo segue uma distribuição log-normal"""
+        tempo_ms = self.tempo_mediano_ms
+        if self.dispersao_tempo:  # sem dispersão não gasta um sorteio (simulações longas)
+            tempo_ms *= math.exp(self.rng.gauss(0.0, self.dispersao_tempo))
+        tempo_ms = max(self.tempo_minimo_ms, tempo_ms)
+        if self.rng.random() >= self.taxa_erro(numero_a, numero_b):
+            return resposta_correta, tempo_ms
+        erradas = [alternativa for alternativa in alternativas if alternativa != resposta_correta]
+        return self.rng.choice(erradas), tempo_ms
+
+
+def jogar_sem_tela(jogo, robos, max_respostas=10000):
+    """Joga a partida já começada até o fim, com um robô em cada lado
+
+    Retorna uma PartidaSimulada; vencedor é None se a partida passou de max_respostas.
+    """
+    respostas = 0
+    tempo_total_ms = 0.0
+    acertos = [0, 0]
+    tentativas = [0, 0]
+    resultado = None
+    while jogo.estado == "jogando" and respostas < max_respostas:
+        jogador = jogo.jogador_atual
+        resposta, tempo_ms = robos[jogador].responder(jogo.numero_a, jogo.numero_b,
+                                                      jogo.resposta_correta, jogo.alternativas)
+        if resposta == jogo.resposta_correta:
+            acertos[jogador] += 1
+        tentativas[jogador] += 1
+        resultado = jogo.passo(resposta)
+        respostas += 1
+        tempo_total_ms += tempo_ms
+    return PartidaSimulada(jogo.vencedor, respostas, tempo_total_ms, acertos, tentativas, resultado)
+
+
+class ControladorRobos:
+    """Controlador do pacmathv3 em que robôs jogam postando eventos de mouse ou teclado"""
+
+    def __init__(self, robos, entrada="mouse", nivel="2", partidas=None, pausa_fim=1.0):
+        self.robos = list(robos)        # robô de cada lado (None = pessoa)
+        self.entrada = entrada          # "mouse" clica nas alternativas, "teclado" digita a resposta
+        self.nivel = nivel              # nível escolhido no começo de cada partida
+        self.partidas = partidas        # partidas até fechar o jogo (None = sem limite)
+        self.pausa_fim = pausa_fim      # segundos na tela de fim antes da próxima partida
+        self.partidas_jogadas = 0
+        self.respostas = 0
+        self.pergunta_respondida = None  # estado da última pergunta respondida
+        self.resposta_pendente = None    # (instante em tempo de jogo, resposta) da pergunta atual
+        self.fim_visto = None            # instante (em tempo de jogo) em que a tela de fim apareceu
+        self.iniciado = False
+
+    def _postar_resposta(self, resposta, jogo, sessao):
+        """Posta os eventos da resposta: um clique na alternativa ou os dígitos e o ENTER"""
+        import pygame
+
+        if self.entrada == "mouse":
+            indice = jogo.alternativas.index(resposta)
+            posicao = sessao.layout.botoes_alternativas[indice].center
+            pygame.event.post(pygame.event.Event(pygame.MOUSEBUTTONDOWN, pos=posicao, button=1))
+            return
+        for digito in str(resposta):
+            pygame.event.post(pygame.event.Event(pygame.KEYDOWN, key=ord(digito), unicode=digito, mod=0))
+        pygame.event.post(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_RETURN, unicode="\r", mod=0))
+
+    def quadro(self, jogo, sessao):
+        """Chamado pelo jogo a cada volta do loop
+
+        Os tempos são medidos no tempo de jogo (sessao.tempo_jogo_ms), que segue a
+        escala PACMATH_ESCALA_TEMPO junto com as animações.
+        """
+        import pygame
+
+        agora = sessao.tempo_jogo_ms
+        if not self.iniciado:
+            # Um temporizador acorda o loop no modo ocioso enquanto o robô "pensa"
+            pygame.time.set_timer(pygame.USEREVENT, 20)
+            self.iniciado = True
+
+        if sessao.estado_jogo == "dificuldade":
+            self.fim_visto = None
+            retangulo = next(r for r, nivel, _ in sessao.layout.botoes_dificuldade if nivel == self.nivel)
+            pygame.event.post(pygame.event.Event(pygame.MOUSEBUTTONDOWN, pos=retangulo.center, button=1))
+            return
+
+        if sessao.estado_jogo == "fim_jogo":
+            if self.fim_visto is None:
+                self.fim_visto = agora
+                self.partidas_jogadas += 1
+            elif agora - self.fim_visto >= 1000 * self.pausa_fim:
+                if self.partidas is not None and self.partidas_jogadas >= self.partidas:
+                    pygame.event.post(pygame.event.Event(pygame.QUIT))
+                else:
+                    pygame.event.post(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_SPACE, unicode=" ", mod=0))
+            return
+
+        # Durante as animações a tela ainda não mostra a pergunta nova
+        robo = self.robos[jogo.jogador_atual]
+        if sessao.animando or robo is None:
+            return
+        pergunta = (jogo.jogador_atual, jogo.segunda_chance, jogo.numero_a, jogo.numero_b, tuple(jogo.alternativas))
+        if pergunta == self.pergunta_respondida:
+            return
+        if self.resposta_pendente is None:
+            resposta, tempo_ms = robo.responder(jogo.numero_a, jogo.numero_b, jogo.resposta_correta, jogo.alternativas)
+            self.resposta_pendente = (agora + tempo_ms, resposta)
+        instante, resposta = self.resposta_pendente
+        if agora >= instante:
+            self._postar_resposta(resposta, jogo, sessao)
+            self.pergunta_respondida = pergunta
+            self.resposta_pendente = None
+            self.respostas += 1
+
+
+def memoria_residente_mb():
+    """Memória residente do processo em MB (o pico, fora do Linux; None se indisponível)"""
+    try:
+        with open("/proc/self/statm") as arquivo:
+            paginas = int(arquivo.read().split()[1])
+        return paginas * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import resource
+    except ImportError:
+        return None
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+class TesteLongo(ControladorRobos):
+    """ControladorRobos que mostra memória e tempo de quadro a cada intervalo"""
+
+    def __init__(self, robos, perfilador, intervalo=10.0, **opcoes):
+        super().__init__(robos, **opcoes)
+        self.perfilador = perfilador
+        self.intervalo = intervalo         # segundos entre um relatório e outro
+        self.proximo_relatorio = None
+        self.quadros_relatados = 0
+        self.inicio = None
+
+    def relatar(self):
+        """Mostra uma linha com partidas, respostas, memória e tempos de quadro desde o último relatório"""
+        from perfil import estatisticas
+
+        quantidade = self.perfilador.totais[(self.perfilador.cenario, "quadro")][0]
+        novos = quantidade - self.quadros_relatados
+        self.quadros_relatados = quantidade
+        tempos = estatisticas(self.perfilador.recentes("quadro", novos)) if novos else None
+        memoria = memoria_residente_mb()
+        linha = (f"{time.perf_counter() - self.inicio:7.0f} s  {self.partidas_jogadas:5d} partidas  "
+                 f"{self.respostas:6d} respostas  {len(gc.get_objects()):7d} objetos")
+        if memoria is not None:
+            linha += f"  {memoria:6.1f} MB"
+        if tempos is not None:
+            linha += (f"  quadro p50 {tempos['p50_ms']:.2f} ms, p99 {tempos['p99_ms']:.2f} ms, "
+                      f"máx {tempos['max_ms']:.2f} ms ({novos} quadros)")
+        print(linha, flush=True)
+
+    def quadro(self, jogo, sessao):
+        """Joga como o ControladorRobos e relata a cada intervalo"""
+        agora = time.perf_counter()
+        if self.inicio is None:
+            self.inicio = agora
+            self.proximo_relatorio = agora + self.intervalo
+        elif agora >= self.proximo_relatorio:
+            self.relatar()
+            self.proximo_relatorio = agora + self.intervalo
+        super().quadro(jogo, sessao)
+
+
+def ler_erros(textos):
+    """Converte ["7x8=0.6", ...] em {(7, 8): 0.6, ...}"""
+    erros = {}
+    for texto in textos:
+        conta, _, taxa = texto.partition("=")
+        numero_a, _, numero_b = conta.partition("x")
+        erros[(int(numero_a), int(numero_b))] = float(taxa)
+    return erros
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Robôs jogando o PacMath (teste longo de memória e tempo de quadro)")
+    parser.add_argument("--partidas", type=int, default=100, help="partidas até encerrar")
+    parser.add_argument("--nivel", default="3", choices=sorted(NIVEIS_DIFICULDADE), help="nível escolhido pelos robôs")
+    parser.add_argument("--entrada", choices=["mouse", "teclado"], default="mouse", help="eventos postados pelos robôs")
+    parser.add_argument("--precisao", type=float, nargs=2, default=[0.8, 0.8], metavar=("J1", "J2"),
+                        help="probabilidade de acerto de cada robô")
+    parser.add_argument("--erros", nargs="*", default=[], metavar="AxB=TAXA",
+                        help="taxa de erro própria de algumas contas, para os dois robôs")
+    parser.add_argument("--tempo", type=float, default=TEMPO_MEDIANO_MS, help="tempo mediano de resposta em ms")
+    parser.add_argument("--humano", type=int, choices=[1, 2], help="o jogador 1 ou 2 é uma pessoa (com --tela)")
+    parser.add_argument("--escala", type=float, default=1.0,
+                        help="acelera as respostas e as animações (PACMATH_ESCALA_TEMPO)")
+    parser.add_argument("--intervalo", type=float, default=10.0, help="segundos entre os relatórios")
+    parser.add_argument("--semente", type=int, help="semente dos robôs")
+    parser.add_argument("--tela", action="store_true", help="abre a janela em vez de usar o driver dummy")
+    args = parser.parse_args()
+
+    # O driver e a escala precisam ser escolhidos antes de importar o pygame e o jogo
+    preparar_execucao_automatica(sem_tela=not args.tela, escala_tempo=args.escala)
+    import pacmathv3
+    from perfil import Perfilador
+
+    rng = random.Random(args.semente)
+    erros = ler_erros(args.erros)
+    robos = [JogadorRobo(precisao, erros, tempo_mediano_ms=args.tempo, rng=random.Random(rng.random()))
+             for precisao in args.precisao]
+    if args.humano:
+        robos[args.humano - 1] = None
+
+    perfilador = Perfilador(limite_amostras=10000)
+    controlador = TesteLongo(robos, perfilador, intervalo=args.intervalo, entrada=args.entrada,
+                             nivel=args.nivel, partidas=args.partidas)
+    pacmathv3.executar_jogo_pacmath(controlador=controlador, perfilador=perfilador)
+    controlador.relatar()
+
+
+if __name__ == "__main__":
+    main()
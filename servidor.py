@@ -0,0 +1,135 @@
+# PacMath - Servidor de partidas
+# Autor: Luiz - Muitas partidas simultâneas em um único processo asyncio
+"""
+Servidor que hospeda várias partidas de PacMath em um só processo.
+
+Cada conexão é uma partida com o seu próprio regras.JogoPacMath; os clientes
+(pacmathv3.py --servidor, carga_servidor.py ou qualquer outro) só mostram o
+estado e enviam as respostas. O protocolo está descrito em protocolo.py.
+
+Execução:
+    python servidor.py --endereco 127.0.0.1:8765
+    python servidor.py --endereco unix:/tmp/pacmath.sock --relatorio 5
+"""
+
+import argparse
+import asyncio
+import contextlib
+import random
+import time
+
+from protocolo import analisar_endereco, codificar, decodificar, estado_partida
+from regras import NIVEIS_DIFICULDADE, JogoPacMath
+
+
+def processar_mensagem(jogo, mensagem):
+    """Aplica uma mensagem do cliente à partida e retorna a resposta
+
+    Mensagens inválidas levantam ValueError; jogadas fora de hora, RuntimeError.
+    """
+    tipo = mensagem.get("tipo")
+    if tipo == "resposta":
+        valor = mensagem.get("valor")
+        if not isinstance(valor, int) or isinstance(valor, bool):
+            raise ValueError("O valor da resposta deve ser um número inteiro")
+        resultado = jogo.passo(valor)
+        return {"tipo": "resultado", "resultado": resultado._asdict(), "estado": estado_partida(jogo)}
+    if tipo == "dificuldade":
+        nivel = str(mensagem.get("nivel"))
+        if nivel not in NIVEIS_DIFICULDADE:
+            raise ValueError(f"Nível de dificuldade desconhecido: {nivel}")
+        semente = mensagem.get("semente")
+        if semente is not None and (not isinstance(semente, int) or isinstance(semente, bool)):
+            raise ValueError("A semente deve ser um número inteiro")
+        jogo.escolher_dificuldade(nivel, semente)
+    elif tipo == "reiniciar":
+        jogo.reiniciar()
+    elif tipo != "estado":
+        raise ValueError(f"Tipo de mensagem desconhecido: {tipo}")
+    return {"tipo": "estado", "estado": estado_partida(jogo)}
+
+
+class ServidorPacMath:
+    """Atende as conexões, uma partida por conexão"""
+
+    def __init__(self, max_sessoes=10000):
+        self.max_sessoes = max_sessoes
+        self.sessoes = {}          # número da sessão -> JogoPacMath
+        self.proxima_sessao = 0
+        self.mensagens = 0         # mensagens atendidas desde o início
+
+    async def atender(self, leitor, escritor):
+        """Conversa com um cliente até a conexão fechar"""
+        if len(self.sessoes) >= self.max_sessoes:
+            escritor.write(codificar({"tipo": "erro", "mensagem": "Servidor cheio"}))
+            escritor.close()
+            return
+
+        sessao = self.proxima_sessao
+        self.proxima_sessao += 1
+        jogo = JogoPacMath(rng=random.Random())  # gerador próprio para cada partida
+        self.sessoes[sessao] = jogo
+        try:
+            while True:
+                linha = await leitor.readline()
+                if not linha:
+                    break
+                try:
+                    resposta = processar_mensagem(jogo, decodificar(linha))
+                except (ValueError, RuntimeError) as erro:
+                    resposta = {"tipo": "erro", "mensagem": str(erro)}
+                self.mensagens += 1
+                escritor.write(codificar(resposta))
+                await escritor.drain()
+        except (ConnectionError, ValueError):
+            pass  # cliente caiu ou mandou uma linha grande demais
+        finally:
+            del self.sessoes[sessao]
+            escritor.close()
+
+    async def relatar(self, intervalo):
+        """Mostra periodicamente as sessões abertas e as mensagens por segundo"""
+        mensagens_antes, instante_antes = self.mensagens, time.perf_counter()
+        while True:
+            await asyncio.sleep(intervalo)
+            agora = time.perf_counter()
+            taxa = (self.mensagens - mensagens_antes) / (agora - instante_antes)
+            print(f"{len(self.sessoes)} sessões, {taxa:.0f} mensagens/s")
+            mensagens_antes, instante_antes = self.mensagens, agora
+
+
+async def servir(endereco, max_sessoes=10000, relatorio=0):
+    """Abre o servidor no endereço indicado e atende até ser interrompido"""
+    servidor = ServidorPacMath(max_sessoes)
+    familia, destino = analisar_endereco(endereco)
+    if familia == "unix":
+        soquete = await asyncio.start_unix_server(servidor.atender, path=destino, backlog=1024)
+    else:
+        soquete = await asyncio.start_server(servidor.atender, *destino, backlog=1024)
+    print(f"Servidor PacMath em {endereco}")
+    # A referência à tarefa evita que ela seja coletada enquanto o servidor roda
+    tarefa_relatorio = asyncio.create_task(servidor.relatar(relatorio)) if relatorio else None
+    try:
+        async with soquete:
+            await soquete.serve_forever()
+    finally:
+        if tarefa_relatorio is not None:
+            tarefa_relatorio.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await tarefa_relatorio
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Servidor de partidas do PacMath")
+    parser.add_argument("--endereco", default="127.0.0.1:8765", help="host:porta ou unix:/caminho")
+    parser.add_argument("--max-sessoes", type=int, default=10000, help="partidas simultâneas aceitas")
+    parser.add_argument("--relatorio", type=float, default=0, help="segundos entre relatórios (0 desliga)")
+    args = parser.parse_args()
+    try:
+        asyncio.run(servir(args.endereco, args.max_sessoes, args.relatorio))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+# PacMath - Testes das perguntas adaptativas
+# Autor: Luiz - Árvore de pesos, seletor e reprodução das partidas adaptativas
+"""
+Testes do adaptativo.py: somas de prefixo da ArvoreFenwick, pesos do
+SeletorAdaptativo e reprodução das partidas adaptativas gravadas.
+
+Rodam sem pygame e sem tela:
+    python -m pytest -q
+"""
+
+import random
+from itertools import accumulate
+
+import pytest
+
+from adaptativo import ArvoreFenwick, SeletorAdaptativo
+from gravacao import GravadorPartidas, ler_gravacao, refazer_partida
+from regras import JogoPacMath
+
+
+def busca_linear(pesos, alvo):
+    """Primeiro índice cuja soma de prefixo passa de alvo"""
+    return next(i for i, soma in enumerate(accumulate(pesos)) if soma > alvo)
+
+
+@pytest.mark.parametrize("quantidade", [1, 2, 7, 9, 64, 81])
+def test_fenwick_igual_a_busca_linear(quantidade):
+    rng = random.Random(quantidade)
+    pesos = [rng.uniform(0.1, 3.0) for _ in range(quantidade)]
+    arvore = ArvoreFenwick(pesos)
+    for _ in range(200):
+        if rng.random() < 0.3:
+            indice = rng.randrange(quantidade)
+            pesos[indice] = rng.uniform(0.1, 3.0)
+            arvore.definir(indice, pesos[indice])
+        assert arvore.total() == pytest.approx(sum(pesos))
+        alvo = rng.random() * sum(pesos)
+        assert arvore.buscar(alvo) == busca_linear(pesos, alvo)
+
+
+def test_fenwick_pesos_zerados_nunca_sorteados():
+    arvore = ArvoreFenwick([1.0, 0.0, 2.0, 0.0])
+    for alvo in (0.0, 0.5, 0.999, 1.0, 2.5, 2.999):
+        assert arvore.buscar(alvo) in (0, 2)
+
+
+def test_seletor_prefere_contas_erradas():
+    seletor = SeletorAdaptativo()
+    fatores = [1, 2, 3]
+    for _ in range(10):
+        seletor.registrar("Ana", 3, 2, False, 6000)
+    rng = random.Random(1)
+    sorteios = [seletor.sortear("Ana", fatores, rng) for _ in range(2000)]
+    assert sorteios.count((3, 2)) > 1.25 * sorteios.count((1, 1))  # pesos 1.63 e 1.05
+    # O outro jogador continua com os pesos iniciais
+    outros = [seletor.sortear("Bruno", fatores, rng) for _ in range(2000)]
+    assert outros.count((3, 2)) < 1.25 * outros.count((1, 1))
+
+
+def test_gravacao_adaptativa(tmp_path):
+    caminho = tmp_path / "adaptativa.pmr"
+    seletor = SeletorAdaptativo()
+    jogo = JogoPacMath(seletor=seletor)
+    gravador = GravadorPartidas(caminho)
+    jogo.escolher_dificuldade("3", 12)
+    gravador.iniciar_partida(jogo)
+    rng = random.Random(12)
+    while jogo.estado == "jogando":
+        resposta = rng.choice(jogo.alternativas)
+        gravador.registrar_resposta(resposta, jogo.segunda_chance, jogo.numero_a, jogo.numero_b)
+        if not jogo.segunda_chance:
+            seletor.registrar(jogo.jogadores[jogo.jogador_atual], jogo.numero_a, jogo.numero_b,
+                              resposta == jogo.resposta_correta, rng.uniform(500, 5000))
+        jogo.passo(resposta)
+    gravador.fechar()
+
+    partida, = ler_gravacao(caminho)
+    assert partida.adaptativa
+    refeito = refazer_partida(partida)  # as contas vêm da gravação, não dos pesos
+    assert (refeito.vencedor, refeito.posicao) == (jogo.vencedor, jogo.posicao)
@@ -0,0 +1,88 @@
+# PacMath - Testes das animações
+# Autor: Luiz - Agendador e passo fixo sem pygame
+"""
+Testes do animacao.py.
+
+    python -m pytest -q
+"""
+
+from animacao import Agendador, PassoFixo, Tarefa
+
+
+def test_fila_roda_em_sequencia():
+    eventos = []
+    agendador = Agendador()
+    agendador.agendar(
+        Tarefa(100, ao_iniciar=lambda: eventos.append("a"), ao_terminar=lambda: eventos.append("/a")),
+        Tarefa(50, ao_iniciar=lambda: eventos.append("b"), ao_terminar=lambda: eventos.append("/b")),
+    )
+    agendador.atualizar(60)
+    assert eventos == ["a"]
+    agendador.atualizar(60)  # sobram 20 ms para a segunda tarefa
+    assert eventos == ["a", "/a", "b"]
+    agendador.atualizar(30)
+    assert eventos == ["a", "/a", "b", "/b"]
+    assert not agendador.ativo()
+
+
+def test_filas_em_paralelo():
+    progresso = {}
+    agendador = Agendador()
+    agendador.agendar(Tarefa(100, ao_atualizar=lambda p: progresso.__setitem__("a", p)))
+    agendador.agendar(Tarefa(200, ao_atualizar=lambda p: progresso.__setitem__("b", p)))
+    agendador.atualizar(50)
+    assert progresso == {"a": 0.5, "b": 0.25}
+    agendador.atualizar(100)
+    assert progresso == {"a": 1.0, "b": 0.75}
+    assert agendador.ativo()
+
+
+def test_tarefa_sem_duracao_termina_na_hora():
+    terminou = []
+    agendador = Agendador()
+    agendador.agendar(Tarefa(0, ao_terminar=lambda: terminou.append(True)))
+    agendador.atualizar(0)
+    assert terminou and not agendador.ativo()
+
+
+def test_limpar_nao_chama_ao_terminar():
+    terminou = []
+    agendador = Agendador()
+    agendador.agendar(Tarefa(100, ao_terminar=lambda: terminou.append(True)))
+    agendador.atualizar(10)
+    agendador.limpar()
+    agendador.atualizar(500)
+    assert not terminou and not agendador.ativo()
+
+
+def test_limpar_dentro_de_ao_terminar():
+    eventos = []
+    agendador = Agendador()
+    agendador.agendar(
+        Tarefa(10, ao_terminar=agendador.limpar),
+        Tarefa(10, ao_iniciar=lambda: eventos.append("seguinte")),
+    )
+    agendador.atualizar(50)
+    assert not eventos and not agendador.ativo()
+
+
+def test_passo_fixo_guarda_o_resto():
+    passo = PassoFixo(passo_ms=5)
+    assert passo.avancar(12) == 2
+    assert passo.avancar(3) == 1  # 2 ms que sobraram + 3 ms
+    assert passo.acumulado == 0
+    assert passo.tempo_ms == 15
+
+
+def test_passo_fixo_com_escala():
+    passo = PassoFixo(passo_ms=5, escala_tempo=100.0)
+    assert passo.avancar(16) == 320
+    passo.esperar(10)
+    assert passo.tempo_ms == 1600 + 1000
+
+
+def test_passo_fixo_descarta_travada_longa():
+    passo = PassoFixo(passo_ms=5, max_passos=10)
+    assert passo.avancar(5000) == 10
+    assert passo.acumulado == 0
+    assert passo.avancar(5) == 1
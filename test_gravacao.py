@@ -0,0 +1,71 @@
+# PacMath - Testes da gravação
+# Autor: Luiz - Partidas gravadas e refeitas sem interface gráfica
+"""
+Testes do formato de gravação e da reprodução das partidas (gravacao.py).
+
+Rodam sem pygame e sem tela:
+    python -m pytest -q
+"""
+
+import random
+
+import pytest
+
+from gravacao import LARGURA_MAXIMA, GravadorPartidas, ler_gravacao, refazer_partida
+from regras import JogoPacMath
+
+
+def jogar_gravando(jogo, caminho, semente, nivel="3"):
+    """Joga uma partida aleatória gravando as respostas; retorna o estado final"""
+    gravador = GravadorPartidas(caminho)
+    jogo.escolher_dificuldade(nivel, semente)
+    gravador.iniciar_partida(jogo)
+    rng = random.Random(semente)
+    while jogo.estado == "jogando":
+        resposta = rng.choice(jogo.alternativas)
+        gravador.registrar_resposta(resposta, jogo.segunda_chance, jogo.numero_a, jogo.numero_b)
+        jogo.passo(resposta)
+    gravador.fechar()
+    return jogo.vencedor, jogo.posicao, jogo.acertos_consecutivos
+
+
+def refazer(caminho):
+    """Refaz a única partida gravada no arquivo; retorna o estado final"""
+    partida, = ler_gravacao(caminho)
+    jogo = refazer_partida(partida)
+    return jogo.vencedor, jogo.posicao, jogo.acertos_consecutivos
+
+
+def test_gravacao_local(tmp_path):
+    caminho = tmp_path / "local.pmr"
+    final = jogar_gravando(JogoPacMath(), caminho, semente=11)
+    partida, = ler_gravacao(caminho)
+    assert (partida.semente, partida.nivel, partida.largura) == (11, "3", 61)
+    assert final == refazer(caminho)
+
+
+def test_gravacao_divergente(tmp_path):
+    caminho = tmp_path / "local.pmr"
+    jogar_gravando(JogoPacMath(), caminho, semente=11)
+    partida, = ler_gravacao(caminho)
+    partida = partida._replace(semente=12)  # outra semente, outras contas
+    with pytest.raises(RuntimeError):
+        refazer_partida(partida)
+
+
+def test_arquivo_que_nao_e_gravacao(tmp_path):
+    caminho = tmp_path / "outro.pmr"
+    caminho.write_bytes(b"PNG\x00\x00\x00")
+    with pytest.raises(ValueError):
+        ler_gravacao(caminho)
+
+
+@pytest.mark.parametrize("largura", [5000, LARGURA_MAXIMA])
+def test_gravacao_tabuleiro_grande(tmp_path, largura):
+    caminho = tmp_path / "grande.pmr"
+    jogo = JogoPacMath(largura_tabuleiro=largura)
+    assert jogo.passos_por_acerto > 255
+    final = jogar_gravando(jogo, caminho, semente=21)
+    partida, = ler_gravacao(caminho)
+    assert (partida.largura, partida.passos) == (largura, jogo.passos_por_acerto)
+    assert final == refazer(caminho)
@@ -0,0 +1,48 @@
+# PacMath - Testes do perfil
+# Autor: Luiz - Histograma das latências de entrada
+"""
+Testes do perfil.HistogramaLatencia.
+
+    python -m pytest -q
+"""
+
+import random
+
+import pytest
+
+from perfil import HistogramaLatencia
+
+
+def test_histograma_vazio():
+    histograma = HistogramaLatencia()
+    assert histograma.percentil(0.5) == 0.0
+    assert histograma.resumo()["amostras"] == 0
+
+
+def test_percentil_pelo_limite_da_faixa():
+    histograma = HistogramaLatencia(largura_faixa_ms=5)
+    for ms in [1, 2, 3, 12, 14, 40]:
+        histograma.registrar(ms)
+    assert histograma.percentil(0.5) == 5     # 3 de 6 amostras na faixa 0-5
+    assert histograma.percentil(0.6) == 15
+    assert histograma.percentil(0.99) == 40   # nunca acima da maior latência
+    assert histograma.resumo()["faixas"] == {"0-5": 3, "10-15": 2, "40-45": 1}
+
+
+def test_ultima_faixa_sem_limite():
+    histograma = HistogramaLatencia(largura_faixa_ms=10, maximo_ms=100)
+    histograma.registrar(50)
+    histograma.registrar(2500)
+    assert histograma.percentil(1.0) == 2500
+    assert histograma.resumo()["faixas"] == {"50-60": 1, "100-": 1}
+
+
+@pytest.mark.parametrize("fracao", [0.1, 0.5, 0.9, 0.99])
+def test_percentil_perto_do_exato(fracao):
+    rng = random.Random(1)
+    amostras = [rng.lognormvariate(3, 0.5) for _ in range(5000)]
+    histograma = HistogramaLatencia(largura_faixa_ms=1)
+    for ms in amostras:
+        histograma.registrar(ms)
+    exato = sorted(amostras)[int(fracao * len(amostras)) - 1]
+    assert exato <= histograma.percentil(fracao) <= exato + 1
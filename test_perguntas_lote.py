@@ -0,0 +1,55 @@
+# PacMath - Testes da geração de perguntas em lote
+# Autor: Luiz - Regras das alternativas na versão vetorizada
+"""
+Testes do perguntas_lote.gerar_perguntas_lote (requer numpy).
+
+    python -m pytest -q
+"""
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from perguntas_lote import gerar_perguntas_lote  # noqa: E402
+from regras import NIVEIS_DIFICULDADE, deslocamentos_validos  # noqa: E402
+
+QUANTIDADE = 20000
+
+
+@pytest.mark.parametrize("nivel", sorted(NIVEIS_DIFICULDADE))
+def test_regras_das_alternativas(nivel):
+    lote = gerar_perguntas_lote(QUANTIDADE, nivel, rng=1)
+    fatores = NIVEIS_DIFICULDADE[nivel]
+    assert np.isin(lote.numero_a, fatores).all() and np.isin(lote.numero_b, fatores).all()
+    assert (lote.resposta_correta == lote.numero_a * lote.numero_b).all()
+
+    linhas = np.arange(QUANTIDADE)
+    assert (lote.alternativas[linhas, lote.indice_correta] == lote.resposta_correta).all()
+    assert (lote.alternativas > 0).all()
+    ordenadas = np.sort(lote.alternativas, axis=1)
+    assert (ordenadas[:, 1:] != ordenadas[:, :-1]).all()  # três alternativas diferentes
+
+    deslocamentos = lote.alternativas - lote.resposta_correta[:, None]
+    distancias = np.abs(deslocamentos)
+    assert (distancias <= 20).all()
+    assert ((distancias > 0) & (distancias <= 10)).sum(axis=1).min() >= 1  # a primeira errada
+
+
+def test_deslocamentos_cobrem_os_validos():
+    lote = gerar_perguntas_lote(QUANTIDADE, "1", rng=2)
+    for correta in (1, 4, 9):
+        linhas = lote.resposta_correta == correta
+        vistos = set((lote.alternativas[linhas] - correta).ravel()) - {0}
+        assert vistos == set(deslocamentos_validos(correta)[1])
+
+
+def test_posicao_da_correta_uniforme():
+    lote = gerar_perguntas_lote(QUANTIDADE, "3", rng=3)
+    contagens = np.bincount(lote.indice_correta, minlength=3) / QUANTIDADE
+    assert np.allclose(contagens, 1 / 3, atol=0.02)
+
+
+def test_mesma_semente_mesmo_lote():
+    a = gerar_perguntas_lote(100, "2", rng=4)
+    b = gerar_perguntas_lote(100, "2", rng=4)
+    assert all((x == y).all() for x, y in zip(a, b))
@@ -0,0 +1,128 @@
+# PacMath - Testes das regras
+# Autor: Luiz - Regras da partida sem interface gráfica
+"""
+Testes das regras do regras.JogoPacMath.
+
+Rodam sem pygame e sem tela:
+    python -m pytest -q
+"""
+
+import random
+
+import pytest
+
+from regras import (NIVEIS_DIFICULDADE, ACERTO, ACERTO_SEGUNDA_CHANCE, ERRO, ERRO_SEGUNDA_CHANCE,
+                    BaralhoPerguntas, JogoPacMath, deslocamentos_validos)
+
+
+def resposta_errada(jogo):
+    """Uma alternativa errada da pergunta atual"""
+    return next(a for a in jogo.alternativas if a != jogo.resposta_correta)
+
+
+def novo_jogo(nivel="2", semente=1):
+    jogo = JogoPacMath()
+    jogo.escolher_dificuldade(nivel, semente)
+    return jogo
+
+
+def test_acerto_anda_e_passa_a_vez():
+    jogo = novo_jogo()
+    resultado = jogo.passo(jogo.resposta_correta)
+    assert resultado.tipo == ACERTO
+    assert resultado.jogador == 0
+    assert resultado.posicao_final == jogo.centro + jogo.passos_por_acerto
+    assert jogo.posicao == resultado.posicao_final
+    assert jogo.acertos_consecutivos == [1, 0]
+    assert jogo.jogador_atual == 1
+
+
+def test_erro_da_segunda_chance_sem_passar_a_vez():
+    jogo = novo_jogo()
+    pergunta = jogo.pergunta
+    resultado = jogo.passo(resposta_errada(jogo))
+    assert resultado.tipo == ERRO
+    assert jogo.segunda_chance
+    assert jogo.jogador_atual == 0
+    assert jogo.pergunta == pergunta
+    assert jogo.posicao == jogo.centro
+
+
+def test_acerto_na_segunda_chance_nao_anda():
+    jogo = novo_jogo()
+    jogo.passo(resposta_errada(jogo))
+    resultado = jogo.passo(jogo.resposta_correta)
+    assert resultado.tipo == ACERTO_SEGUNDA_CHANCE
+    assert resultado.posicao_final == resultado.posicao_inicial == jogo.centro
+    assert jogo.acertos_consecutivos == [0, 0]
+    assert jogo.jogador_atual == 1
+    assert not jogo.segunda_chance
+
+
+def test_erro_na_segunda_chance_zera_os_acertos():
+    jogo = novo_jogo()
+    jogo.passo(jogo.resposta_correta)  # jogador 0 acerta
+    jogo.passo(jogo.resposta_correta)  # jogador 1 acerta
+    jogo.passo(resposta_errada(jogo))
+    resultado = jogo.passo(resposta_errada(jogo))
+    assert resultado.tipo == ERRO_SEGUNDA_CHANCE
+    assert jogo.acertos_consecutivos == [0, 1]
+    assert jogo.jogador_atual == 1
+
+
+def test_quatro_acertos_seguidos_vencem():
+    jogo = novo_jogo()
+    for _ in range(4):
+        resultado = jogo.passo(jogo.resposta_correta)  # jogador 0 acerta
+        if not resultado.fim:
+            jogo.passo(resposta_errada(jogo))          # jogador 1 erra duas vezes
+            jogo.passo(resposta_errada(jogo))
+    assert resultado.fim
+    assert jogo.estado == "fim_jogo"
+    assert jogo.vencedor == jogo.jogadores[0]
+    with pytest.raises(RuntimeError):
+        jogo.passo(jogo.resposta_correta)
+
+
+@pytest.mark.parametrize("nivel", sorted(NIVEIS_DIFICULDADE))
+def test_alternativas_validas(nivel):
+    jogo = novo_jogo(nivel, semente=3)
+    for _ in range(500):
+        correta = jogo.numero_a * jogo.numero_b
+        assert jogo.resposta_correta == correta
+        assert sorted(jogo.alternativas) == sorted(set(jogo.alternativas))
+        assert correta in jogo.alternativas
+        erradas = [a for a in jogo.alternativas if a != correta]
+        assert all(a > 0 for a in erradas)
+        assert any(0 < abs(a - correta) <= 10 for a in erradas)
+        assert all(0 < abs(a - correta) <= 20 for a in erradas)
+        jogo.nova_pergunta()
+
+
+@pytest.mark.parametrize("nivel", sorted(NIVEIS_DIFICULDADE))
+def test_baralho_cobre_todas_as_contas_sem_repetir(nivel):
+    fatores = NIVEIS_DIFICULDADE[nivel]
+    todas = {(a, b) for a in fatores for b in fatores}
+    baralho = BaralhoPerguntas(fatores)
+    rng = random.Random(7)
+    for _ in range(3):  # o baralho volta a encher quando acaba
+        tiradas = [baralho.tirar(rng)[:2] for _ in range(len(todas))]
+        assert set(tiradas) == todas
+
+
+def test_partida_segue_o_baralho():
+    jogo = novo_jogo("1")
+    contas = set()
+    for _ in range(9):
+        contas.add((jogo.numero_a, jogo.numero_b))
+        jogo.nova_pergunta()
+    assert len(contas) == 9
+
+
+def test_alternativas_erradas_cobrem_todos_os_deslocamentos():
+    jogo = JogoPacMath(fatores=[2], rng=random.Random(4))  # sempre 2 × 2
+    vistos = set()
+    for _ in range(3000):
+        vistos.update(a - 4 for a in jogo.alternativas if a != 4)
+        jogo.nova_pergunta()
+    assert vistos == set(deslocamentos_validos(4)[1]) == {i for i in range(-3, 21) if i != 0}
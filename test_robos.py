@@ -0,0 +1,36 @@
+# PacMath - Testes dos robôs
+# Autor: Luiz - Jogadores simulados sem tela
+"""
+Testes do robos.JogadorRobo e do robos.jogar_sem_tela.
+
+    python -m pytest -q
+"""
+
+import random
+
+from regras import JogoPacMath
+from robos import JogadorRobo, jogar_sem_tela
+
+
+def test_taxa_de_erro_por_conta():
+    robo = JogadorRobo(precisao=1.0, erros_por_conta={(7, 8): 1.0}, rng=random.Random(1))
+    assert robo.responder(2, 3, 6, [6, 7, 8])[0] == 6
+    assert robo.responder(8, 7, 56, [54, 56, 58])[0] != 56  # a ordem dos fatores não importa
+
+
+def test_tempo_sem_dispersao():
+    robo = JogadorRobo(tempo_mediano_ms=1000, dispersao_tempo=0, rng=random.Random(2))
+    assert {robo.responder(2, 3, 6, [6, 7, 8])[1] for _ in range(10)} == {1000}
+
+
+def test_jogar_sem_tela():
+    rng = random.Random(3)
+    jogo = JogoPacMath(rng=rng)
+    jogo.escolher_dificuldade("3")
+    partida = jogar_sem_tela(jogo, [JogadorRobo(0.9, rng=rng), JogadorRobo(0.5, rng=rng)])
+    assert jogo.estado == "fim_jogo"
+    assert partida.vencedor == jogo.vencedor
+    assert sum(partida.tentativas) == partida.respostas
+    assert all(a <= t for a, t in zip(partida.acertos, partida.tentativas))
+    assert partida.ultimo_resultado.fim
+    assert jogo.jogadores[partida.ultimo_resultado.jogador] == jogo.vencedor
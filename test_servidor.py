@@ -0,0 +1,84 @@
+# PacMath - Testes do servidor
+# Autor: Luiz - Partidas remotas contra um servidor rodando numa thread
+"""
+Testes do servidor.py e do jogo_remoto.JogoRemoto.
+
+Rodam sem pygame e sem tela:
+    python -m pytest -q
+"""
+
+import asyncio
+import random
+import threading
+
+import pytest
+
+from gravacao import GravadorPartidas, ler_gravacao, refazer_partida
+from jogo_remoto import ErroServidor, JogoRemoto
+from servidor import ServidorPacMath
+
+
+def iniciar_servidor(max_sessoes=10000):
+    """Roda um ServidorPacMath numa thread deste processo e retorna o endereço"""
+    pronto = threading.Event()
+    enderecos = []
+
+    async def servir():
+        servidor = ServidorPacMath(max_sessoes)
+        soquete = await asyncio.start_server(servidor.atender, "127.0.0.1", 0)
+        enderecos.append(f"127.0.0.1:{soquete.sockets[0].getsockname()[1]}")
+        pronto.set()
+        await soquete.serve_forever()
+
+    threading.Thread(target=asyncio.run, args=(servir(),), daemon=True).start()
+    pronto.wait(5)
+    return enderecos[0]
+
+
+@pytest.fixture
+def jogo_remoto():
+    jogo = JogoRemoto(iniciar_servidor())
+    yield jogo
+    jogo.fechar()
+
+
+def test_partida_remota(jogo_remoto):
+    jogo_remoto.escolher_dificuldade("2", 5)
+    assert jogo_remoto.estado == "jogando"
+    assert jogo_remoto.resposta_correta == jogo_remoto.numero_a * jogo_remoto.numero_b
+    resultado = jogo_remoto.passo(jogo_remoto.resposta_correta)
+    assert resultado.tipo == "acerto"
+    assert jogo_remoto.jogador_atual == 1
+
+
+def test_gravacao_remota(tmp_path, jogo_remoto):
+    caminho = tmp_path / "remota.pmr"
+    gravador = GravadorPartidas(caminho)
+    jogo_remoto.escolher_dificuldade("3", 13)
+    gravador.iniciar_partida(jogo_remoto)
+    rng = random.Random(13)
+    while jogo_remoto.estado == "jogando":
+        resposta = rng.choice(jogo_remoto.alternativas)
+        gravador.registrar_resposta(resposta, jogo_remoto.segunda_chance, jogo_remoto.numero_a, jogo_remoto.numero_b)
+        jogo_remoto.passo(resposta)
+    gravador.fechar()
+
+    partida, = ler_gravacao(caminho)
+    refeito = refazer_partida(partida)
+    assert (refeito.vencedor, refeito.posicao) == (jogo_remoto.vencedor, jogo_remoto.posicao)
+
+
+def test_jogada_fora_de_hora(jogo_remoto):
+    with pytest.raises(ErroServidor):
+        jogo_remoto.passo(1)  # ainda na escolha de dificuldade
+    assert jogo_remoto.estado == "dificuldade"
+
+
+def test_servidor_cheio():
+    endereco = iniciar_servidor(max_sessoes=1)
+    primeiro = JogoRemoto(endereco)
+    try:
+        with pytest.raises(ErroServidor, match="cheio"):
+            JogoRemoto(endereco)
+    finally:
+        primeiro.fechar()
@@ -0,0 +1,64 @@
+# PacMath - Testes do torneio
+# Autor: Luiz - Tabelas do todos contra todos e do mata-mata
+"""
+Testes do torneio.py, sem processos e sem tela.
+
+    python -m pytest -q
+"""
+
+from collections import Counter
+from itertools import combinations
+
+import pytest
+
+from torneio import classificar, jogar_partida, rodada_mata_mata, rodadas_todos_contra_todos
+
+
+@pytest.mark.parametrize("quantidade", [2, 3, 4, 7, 10])
+def test_todos_contra_todos(quantidade):
+    nomes = [f"Aluno{i}" for i in range(quantidade)]
+    rodadas = rodadas_todos_contra_todos(nomes)
+    assert len(rodadas) == quantidade - 1 + quantidade % 2
+    confrontos = Counter()
+    comecou = Counter()
+    for rodada in rodadas:
+        na_rodada = [nome for confronto in rodada for nome in confronto]
+        assert len(na_rodada) == len(set(na_rodada))  # ninguém joga duas vezes na rodada
+        assert len(rodada) == quantidade // 2
+        for a, b in rodada:
+            confrontos[frozenset((a, b))] += 1
+            comecou[a] += 1
+    assert confrontos == Counter(frozenset(par) for par in combinations(nomes, 2))
+    assert max(comecou.values()) - min(comecou[nome] for nome in nomes) <= 2
+
+
+@pytest.mark.parametrize("quantidade", [2, 3, 5, 6, 8, 13])
+def test_mata_mata(quantidade):
+    vivos = [f"Aluno{i}" for i in range(quantidade)]
+    while len(vivos) > 1:
+        passam, confrontos = rodada_mata_mata(vivos)
+        jogam = [nome for confronto in confrontos for nome in confronto]
+        assert sorted(passam + jogam) == sorted(vivos)
+        restantes = len(passam) + len(confrontos)
+        assert restantes & (restantes - 1) == 0  # a próxima rodada é uma potência de 2
+        vivos = passam + [a for a, _ in confrontos]
+
+
+def test_partida_reproduzivel():
+    argumentos = (1, ("Ana", "Bruno"), [0.8, 0.6], "2", None, "semente-1", 1000)
+    assert jogar_partida(*argumentos) == jogar_partida(*argumentos)
+    partida = jogar_partida(*argumentos)
+    assert sum(partida["tentativas"]) == partida["respostas"]
+    assert partida["vencedor"] in ("Ana", "Bruno", None)
+
+
+def test_classificacao():
+    partidas = [
+        {"jogadores": ["Ana", "Bruno"], "vencedor": "Ana", "acertos": [4, 2], "tentativas": [5, 5]},
+        {"jogadores": ["Bruno", "Caio"], "vencedor": None, "acertos": [3, 3], "tentativas": [6, 6]},
+        {"jogadores": ["Caio", "Ana"], "vencedor": "Caio", "acertos": [4, 1], "tentativas": [4, 4]},
+    ]
+    tabela = classificar(["Ana", "Bruno", "Caio"], partidas)
+    assert [linha["nome"] for linha in tabela] == ["Caio", "Ana", "Bruno"]
+    assert [linha["pontos"] for linha in tabela] == [4, 3, 1]
+    assert tabela[0]["taxa_acerto"] == pytest.approx(7 / 10)
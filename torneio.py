@@ -0,0 +1,261 @@
+# PacMath - Torneio da turma
+# Autor: Luiz - Campeonato entre os alunos, com as partidas jogadas em paralelo
+"""
+Monta um torneio a partir da lista de alunos da turma e joga as partidas com
+as regras do regras.JogoPacMath, sem interface gráfica.
+
+Formatos:
+    todos  todos contra todos (método do círculo: cada aluno joga uma vez
+           por rodada; com número ímpar de alunos um deles folga)
+    mata   mata-mata na ordem da lista; os primeiros passam direto quando o
+           número de alunos não é potência de 2
+
+A lista da turma tem um aluno por linha, opcionalmente com a precisão
+(probabilidade de acertar cada tentativa) usada pelo jogador simulado
+(robos.JogadorRobo):
+    Ana;0.85
+    Bruno
+Linhas vazias e começadas por # são ignoradas. Com --erros algumas contas têm
+uma taxa de erro própria para todos os alunos (--erros 7x8=0.6 6x9=0.5).
+
+As partidas são distribuídas entre processos: no todos contra todos, o torneio
+inteiro de uma vez; no mata-mata, uma rodada por vez. Cada partida tem uma
+semente derivada da semente do torneio, então a classificação é a mesma com
+qualquer número de processos.
+
+Uma partida também pode ser arbitrada na tela, com os nomes dos alunos:
+    PACMATH_JOGADORES=Ana,Bruno python pacmathv3.py
+
+Execução:
+    python torneio.py turma.txt
+    python torneio.py turma.txt --formato mata --partidas 3 --nivel 3 --saida torneio.json
+"""
+
+import argparse
+import json
+import os
+import random
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+from regras import NIVEIS_DIFICULDADE, JogoPacMath
+from robos import JogadorRobo, jogar_sem_tela, ler_erros
+
+PRECISAO_PADRAO = 0.75  # precisão dos alunos sem precisão na lista
+PONTOS_VITORIA = 3      # pontos no todos contra todos
+PONTOS_EMPATE = 1       # partida sem vencedor até o limite de respostas
+
+
+def ler_turma(caminho, precisao_padrao=PRECISAO_PADRAO):
+    """Lê a lista da turma e retorna [(nome, precisão)] na ordem do arquivo"""
+    alunos = []
+    nomes = set()
+    with open(caminho, encoding="utf-8") as arquivo:
+        for numero, linha in enumerate(arquivo, 1):
+            linha = linha.strip()
+            if not linha or linha.startswith("#"):
+                continue
+            nome, _, precisao = linha.partition(";")
+            nome = nome.strip()
+            if nome in nomes:
+                raise ValueError(f"{caminho}:{numero}: aluno repetido '{nome}'")
+            nomes.add(nome)
+            alunos.append((nome, float(precisao) if precisao.strip() else precisao_padrao))
+    return alunos
+
+
+def rodadas_todos_contra_todos(nomes):
+    """Rodadas do todos contra todos pelo método do círculo: [[(a, b), ...], ...]"""
+    circulo = list(nomes)
+    if len(circulo) % 2:
+        circulo.append(None)  # quem enfrenta None folga na rodada
+    rodadas = []
+    for rodada in range(len(circulo) - 1):
+        metade = len(circulo) // 2
+        confrontos = []
+        for i in range(metade):
+            a, b = circulo[i], circulo[-1 - i]
+            if a is None or b is None:
+                continue
+            # Alterna quem começa para o aluno fixo do círculo não começar sempre
+            if i == 0 and rodada % 2:
+                a, b = b, a
+            confrontos.append((a, b))
+        rodadas.append(confrontos)
+        circulo.insert(1, circulo.pop())  # gira todos menos o primeiro
+    return rodadas
+
+
+def rodada_mata_mata(vivos):
+    """Retorna (quem passa direto, confrontos) da próxima rodada do mata-mata"""
+    tamanho = 1 << (len(vivos) - 1).bit_length()  # próxima potência de 2
+    folgas = tamanho - len(vivos)
+    restantes = vivos[folgas:]
+    confrontos = [(restantes[i], restantes[-1 - i]) for i in range(len(restantes) // 2)]
+    return vivos[:folgas], confrontos
+
+
+def jogar_partida(rodada, jogadores, precisoes, nivel, passos, semente, max_respostas, erros=None):
+    """Joga uma partida simulada e retorna o resultado em um dicionário
+
+    jogadores: os dois nomes, o primeiro começa; precisoes na mesma ordem.
+    erros: taxas de erro próprias de algumas contas ({(a, b): taxa}), para os dois.
+    """
+    rng = random.Random(semente)
+    jogo = JogoPacMath(jogadores=jogadores, rng=rng, passos_por_acerto=passos)
+    jogo.escolher_dificuldade(nivel)
+    robos = [JogadorRobo(precisao, erros, dispersao_tempo=0, rng=rng) for precisao in precisoes]
+    partida = jogar_sem_tela(jogo, robos, max_respostas)
+    return {
+        "rodada": rodada,
+        "jogadores": list(jogadores),
+        "vencedor": partida.vencedor,
+        "respostas": partida.respostas,
+        "acertos": partida.acertos,
+        "tentativas": partida.tentativas,
+    }
+
+
+def tarefas_confronto(rodada, a, b, precisao, erros, args):
+    """Argumentos de jogar_partida para as partidas de um confronto (quem começa alterna)"""
+    tarefas = []
+    for partida in range(args.partidas):
+        jogadores = (a, b) if partida % 2 == 0 else (b, a)
+        semente = f"{args.semente}-{rodada}-{a}-{b}-{partida}"
+        tarefas.append((rodada, jogadores, [precisao[nome] for nome in jogadores],
+                        args.nivel, args.passos, semente, args.max_respostas, erros))
+    return tarefas
+
+
+def jogar_todas(executor, tarefas, processos):
+    """Joga as partidas no pool, em blocos para diminuir as idas e voltas entre processos"""
+    bloco = max(1, len(tarefas) // (4 * processos))
+    return list(executor.map(jogar_partida, *zip(*tarefas), chunksize=bloco))
+
+
+def vencedor_confronto(a, b, partidas):
+    """Vencedor de um confronto do mata-mata: mais vitórias, depois mais acertos, depois a ordem da lista"""
+    vitorias = Counter(partida["vencedor"] for partida in partidas)
+    acertos = Counter()
+    for partida in partidas:
+        for nome, quantidade in zip(partida["jogadores"], partida["acertos"]):
+            acertos[nome] += quantidade
+    if (vitorias[b], acertos[b]) > (vitorias[a], acertos[a]):
+        return b
+    return a
+
+
+def classificar(nomes, partidas):
+    """Tabela de classificação: pontos, vitórias, empates, derrotas e acertos de cada aluno"""
+    tabela = {nome: Counter() for nome in nomes}
+    for partida in partidas:
+        for nome, acertos, tentativas in zip(partida["jogadores"], partida["acertos"], partida["tentativas"]):
+            linha = tabela[nome]
+            linha["partidas"] += 1
+            linha["acertos"] += acertos
+            linha["tentativas"] += tentativas
+            if partida["vencedor"] is None:
+                linha["empates"] += 1
+                linha["pontos"] += PONTOS_EMPATE
+            elif partida["vencedor"] == nome:
+                linha["vitorias"] += 1
+                linha["pontos"] += PONTOS_VITORIA
+            else:
+                linha["derrotas"] += 1
+
+    classificacao = []
+    for ordem, nome in enumerate(nomes):
+        linha = tabela[nome]
+        taxa = linha["acertos"] / linha["tentativas"] if linha["tentativas"] else 0.0
+        classificacao.append({
+            "nome": nome, "pontos": linha["pontos"], "partidas": linha["partidas"],
+            "vitorias": linha["vitorias"], "empates": linha["empates"], "derrotas": linha["derrotas"],
+            "taxa_acerto": taxa, "ordem": ordem,
+        })
+    classificacao.sort(key=lambda linha: (-linha["pontos"], -linha["vitorias"], -linha["taxa_acerto"], linha["ordem"]))
+    for linha in classificacao:
+        del linha["ordem"]
+    return classificacao
+
+
+def imprimir_classificacao(classificacao):
+    """Mostra a tabela de classificação no terminal"""
+    largura = max(len(linha["nome"]) for linha in classificacao)
+    print(f"\n{'#':>3}  {'Aluno':<{largura}}  Pts   J   V   E   D  Acertos")
+    for posicao, linha in enumerate(classificacao, 1):
+        print(f"{posicao:>3}  {linha['nome']:<{largura}}  {linha['pontos']:>3} {linha['partidas']:>3} "
+              f"{linha['vitorias']:>3} {linha['empates']:>3} {linha['derrotas']:>3}  {100 * linha['taxa_acerto']:6.1f}%")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Torneio do PacMath entre os alunos de uma turma")
+    parser.add_argument("turma", help="arquivo com um aluno por linha (nome;precisão opcional)")
+    parser.add_argument("--formato", choices=["todos", "mata"], default="todos",
+                        help="todos contra todos ou mata-mata")
+    parser.add_argument("--partidas", type=int, default=1, help="partidas por confronto (quem começa alterna)")
+    parser.add_argument("--nivel", default="2", choices=sorted(NIVEIS_DIFICULDADE))
+    parser.add_argument("--passos", type=int, default=None, help="células andadas por acerto (padrão das regras)")
+    parser.add_argument("--precisao", type=float, default=PRECISAO_PADRAO,
+                        help="precisão dos alunos sem precisão na lista")
+    parser.add_argument("--erros", nargs="*", default=[], metavar="AxB=TAXA",
+                        help="taxa de erro própria de algumas contas, para todos os alunos")
+    parser.add_argument("--semente", type=int, default=0, help="semente do torneio (resultados reproduzíveis)")
+    parser.add_argument("--processos", type=int, default=os.cpu_count(), help="processos do pool")
+    parser.add_argument("--max-respostas", type=int, default=1000, help="limite de respostas por partida (depois, empate)")
+    parser.add_argument("--saida", help="arquivo JSON para gravar partidas e classificação")
+    args = parser.parse_args()
+
+    alunos = ler_turma(args.turma, args.precisao)
+    if len(alunos) < 2:
+        parser.error("a turma precisa de pelo menos dois alunos")
+    nomes = [nome for nome, _ in alunos]
+    precisao = dict(alunos)
+    erros = ler_erros(args.erros)
+
+    inicio = time.perf_counter()
+    partidas = []
+    campeao = None
+    with ProcessPoolExecutor(max_workers=args.processos) as executor:
+        if args.formato == "todos":
+            # Os confrontos não dependem uns dos outros: o torneio inteiro vai para o pool
+            tarefas = []
+            for rodada, confrontos in enumerate(rodadas_todos_contra_todos(nomes), 1):
+                for a, b in confrontos:
+                    tarefas.extend(tarefas_confronto(rodada, a, b, precisao, erros, args))
+            partidas = jogar_todas(executor, tarefas, args.processos)
+        else:
+            # Cada rodada do mata-mata depende dos vencedores da anterior
+            vivos = nomes
+            rodada = 0
+            while len(vivos) > 1:
+                rodada += 1
+                passam, confrontos = rodada_mata_mata(vivos)
+                tarefas = [tarefa for a, b in confrontos for tarefa in tarefas_confronto(rodada, a, b, precisao, erros, args)]
+                resultados = jogar_todas(executor, tarefas, args.processos)
+                partidas.extend(resultados)
+                vencedores = []
+                print(f"\nRodada {rodada}" + (f" ({', '.join(passam)} passam direto)" if passam else ""))
+                for indice, (a, b) in enumerate(confrontos):
+                    serie = resultados[indice * args.partidas:(indice + 1) * args.partidas]
+                    vencedor = vencedor_confronto(a, b, serie)
+                    vencedores.append(vencedor)
+                    print(f"  {a} × {b}: {vencedor}")
+                vivos = passam + vencedores
+            campeao = vivos[0]
+    duracao = time.perf_counter() - inicio
+
+    classificacao = classificar(nomes, partidas)
+    imprimir_classificacao(classificacao)
+    if campeao is not None:
+        print(f"\nCampeão: {campeao}")
+    print(f"\n{len(partidas)} partidas em {duracao:.2f} s com {args.processos} processos")
+
+    if args.saida:
+        with open(args.saida, "w", encoding="utf-8") as arquivo:
+            json.dump({"parametros": vars(args), "classificacao": classificacao, "campeao": campeao,
+                       "partidas": partidas}, arquivo, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()